@@ -0,0 +1,57 @@
+"""Microbenchmark for parsing conventional commit messages.
+
+Usage: python -m benchmarks.bench_commit_parse [--commits N]
+"""
+
+import argparse
+import hashlib
+import sys
+import time
+from typing import Callable, List, Tuple
+
+from poetflow.types.versioning import PARSE_CACHE_SIZE, CommitInfo
+
+MESSAGES = [
+    "feat(core): add dependency graph snapshot",
+    "fix(api)!: reject invalid versions\n\nBREAKING CHANGE: versions are validated",
+    "refactor: split executor\n\nMove output handling to its own class.\n\nRefs #42",
+    'Revert "feat: add experimental flag"\n\nThis reverts commit 0123abcd.',
+    "docs: update README",
+    "Merge branch 'main' into feature",
+]
+
+
+def make_history(count: int) -> List[Tuple[str, str]]:
+    """Create a synthetic history of (hash, message) pairs."""
+    return [
+        (hashlib.sha1(str(i).encode()).hexdigest(), f"{MESSAGES[i % len(MESSAGES)]} #{i}")
+        for i in range(count)
+    ]
+
+
+def measure(name: str, history: List[Tuple[str, str]], parse: Callable[[str, str], object]) -> None:
+    """Parse a history and print the throughput."""
+    start = time.perf_counter()
+    for commit_hash, message in history:
+        parse(commit_hash, message)
+    elapsed = time.perf_counter() - start
+    print(f"{name:<24} {elapsed:8.3f}s {len(history) / elapsed:12,.0f} commits/s")
+
+
+def main() -> int:
+    """Run the benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--commits", type=int, default=1_000_000)
+    args = parser.parse_args()
+
+    history = make_history(args.commits)
+    measure("parse", history, lambda _, message: CommitInfo.parse(message))
+    # Re-reading the most recent commits, e.g. on consecutive releases, hits the memo
+    recent = history[-PARSE_CACHE_SIZE:]
+    measure("parse by hash (cold)", recent, lambda h, message: CommitInfo.parse(message, h))
+    measure("parse by hash (warm)", recent, lambda h, message: CommitInfo.parse(message, h))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,75 @@
+"""Startup benchmark based on `python -X importtime`.
+
+Measures the import cost that PoetFlow adds to every Poetry invocation, i.e. importing the
+package and creating its plugins, and fails if it exceeds a budget.
+
+Usage: python -m benchmarks.bench_import [--runs N] [--budget-ms MS]
+"""
+
+import argparse
+import re
+import statistics
+import subprocess
+import sys
+from typing import Dict, List, Optional
+
+# Importing the package and creating every plugin, as Poetry does when loading plugins
+STARTUP = (
+    "import poetflow; from pathlib import Path; "
+    "config = poetflow.MonorangerConfig(enabled=True, monorepo_root=Path('..')); "
+    "[plugin(config) for plugin in (poetflow.LockModifier, poetflow.VenvModifier, "
+    "poetflow.PathRewriter, poetflow.MonorepoAdderRemover)]"
+)
+
+IMPORTTIME_PATTERN = re.compile(r"^import time:\s+(\d+) \|\s+(\d+) \|(\s*)(\S+)$")
+
+
+def import_times(code: str) -> Dict[str, int]:
+    """Run code in a fresh interpreter and get the cumulative import time of top-level modules
+
+    Args:
+        code: Python code to run
+
+    Returns:
+        Cumulative import time in microseconds by top-level module name
+    """
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    times: Dict[str, int] = {}
+    for line in result.stderr.splitlines():
+        match = IMPORTTIME_PATTERN.match(line)
+        if match and len(match.group(3)) == 1:
+            times[match.group(4)] = int(match.group(2))
+    return times
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Run the benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--budget-ms", type=float, default=50.0)
+    args = parser.parse_args(argv)
+
+    # Modules imported anyway by Poetry itself are not PoetFlow's cost
+    baseline = import_times("import cleo, tomlkit, packaging")
+    runs = []
+    for _ in range(args.runs):
+        times = import_times(STARTUP)
+        runs.append(sum(us for module, us in times.items() if module not in baseline))
+    startup_ms = statistics.median(runs) / 1000
+
+    own = {module: us for module, us in times.items() if module not in baseline}
+    slowest = sorted(own.items(), key=lambda item: item[1], reverse=True)[:5]
+    for module, us in slowest:
+        print(f"{module:<40} {us / 1000:8.1f} ms")
+    print(f"\nPoetFlow startup: {startup_ms:.1f} ms (median of {args.runs} runs)")
+    print(f"Budget: {args.budget_ms:.1f} ms")
+    return 0 if startup_ms <= args.budget_ms else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
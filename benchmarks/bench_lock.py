@@ -0,0 +1,82 @@
+"""Microbenchmark for lock file queries.
+
+Usage: python -m benchmarks.bench_lock [--entries N] [--projects N]
+"""
+
+import argparse
+import random
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Callable, Dict, List, TypeVar
+
+from poetflow.core.lock import LockReader, clear_index_cache
+from poetflow.types.tomlkit import parse
+
+T = TypeVar("T")
+
+
+def make_lock(entries: int, fan_out: int = 4, seed: int = 0) -> str:
+    """Create a synthetic poetry.lock whose entries depend on earlier entries."""
+    rng = random.Random(seed)
+    lines = []
+    for i in range(entries):
+        lines.append(f'[[package]]\nname = "dist-{i:05d}"\nversion = "1.{i % 7}.0"')
+        lines.append(
+            "files = [\n"
+            f'    {{file = "dist_{i:05d}-1.0.0-py3-none-any.whl", hash = "sha256:{i:064x}"}},\n'
+            "]\n"
+        )
+        if i:
+            lines.append("[package.dependencies]")
+            for dep in sorted(set(rng.randrange(i) for _ in range(rng.randint(0, fan_out)))):
+                lines.append(f'dist-{dep:05d} = ">=1.0"')
+        lines.append("")
+    return "\n".join(lines)
+
+
+def measure(name: str, func: Callable[[], T]) -> T:
+    """Run a function once and print its duration."""
+    start = time.perf_counter()
+    result = func()
+    print(f"{name:<28} {(time.perf_counter() - start) * 1000:9.2f} ms")
+    return result
+
+
+def main() -> int:
+    """Run the benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--entries", type=int, default=2000)
+    parser.add_argument("--projects", type=int, default=300)
+    args = parser.parse_args()
+
+    rng = random.Random(1)
+    requirements: Dict[str, List[str]] = {
+        f"pkg-{i:05d}": [f"dist-{rng.randrange(args.entries):05d}" for _ in range(5)]
+        for i in range(args.projects)
+    }
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / "poetry.lock"
+        path.write_text(make_lock(args.entries))
+
+        measure("tomlkit parse", lambda: parse(path.read_text()))
+        clear_index_cache()
+        reader = LockReader(path)
+        measure("index (cold)", lambda: reader.index)
+        measure("index (cached by content)", lambda: LockReader(path).index)
+        target = f"dist-{args.entries // 40:05d}"
+        requirers = measure(
+            "requirers of one entry", lambda: reader.requirers([target], requirements)
+        )
+        measure(
+            "closure of every project",
+            lambda: [reader.closure(names) for names in requirements.values()],
+        )
+    print(f"{len(requirers)} of {args.projects} projects pull in {target}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
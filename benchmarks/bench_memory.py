@@ -0,0 +1,151 @@
+"""Memory benchmark for the in-memory package and commit model.
+
+Compares the slotted, frozen, interned records with the plain dataclasses they replaced, using
+10k packages and 100k commits by default.
+
+Usage: python -m benchmarks.bench_memory [--packages N] [--commits N]
+"""
+
+import argparse
+import gc
+import json
+import sys
+import tracemalloc
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Callable, List, Optional, Set
+
+from poetflow.types.discovery import PackageInfo, PackageInfoView
+from poetflow.types.versioning import CommitInfo
+
+COMMIT_TYPES = ("feat", "fix", "docs", "refactor", "perf", "chore")
+SCOPES = ("core", "api", "cli", "docs", None)
+
+
+@dataclass
+class LegacyPackageInfo:
+    """The package record before it was slotted."""
+
+    name: str
+    version: str
+    path: Path
+    dependencies: Set[str]
+
+
+@dataclass
+class LegacyCommitInfo:
+    """The commit record before it was slotted."""
+
+    type: str
+    scope: Optional[str]
+    message: str
+    breaking: bool = False
+
+
+def measure(build: Callable[[], object]) -> int:
+    """Get the memory retained by the result of a builder, in bytes."""
+    gc.collect()
+    tracemalloc.start()
+    try:
+        result = build()
+        gc.collect()
+        size = tracemalloc.get_traced_memory()[0]
+    finally:
+        tracemalloc.stop()
+    del result
+    return size
+
+
+def raw_packages(count: int) -> str:
+    """Create package fields as stored in the discovery index."""
+    return json.dumps(
+        [
+            {
+                "name": f"pkg-{i:05d}",
+                "version": "0.1.0",
+                "path": f"packages/pkg-{i:05d}",
+                "dependencies": [f"pkg-{(i * 7 + k) % count:05d}" for k in range(5)]
+                + ["requests", "pytest"],
+            }
+            for i in range(count)
+        ]
+    )
+
+
+def raw_commits(count: int) -> str:
+    """Create commit fields as parsed from a commit history."""
+    return json.dumps(
+        [
+            {
+                "type": COMMIT_TYPES[i % len(COMMIT_TYPES)],
+                "scope": SCOPES[i % len(SCOPES)],
+                "message": f"change number {i}",
+            }
+            for i in range(count)
+        ]
+    )
+
+
+def load_packages(data: str, cls: Any, dependencies: Callable[[List[str]], Any]) -> List[Any]:
+    """Build package records from the discovery index, dropping the parsed JSON."""
+    return [
+        cls(
+            name=fields["name"],
+            version=fields["version"],
+            path=Path(fields["path"]),
+            dependencies=dependencies(fields["dependencies"]),
+        )
+        for fields in json.loads(data)
+    ]
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Run the benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--packages", type=int, default=10_000)
+    parser.add_argument("--commits", type=int, default=100_000)
+    args = parser.parse_args(argv)
+
+    packages = raw_packages(args.packages)
+    commits = raw_commits(args.commits)
+
+    def legacy_packages() -> List[Any]:
+        return load_packages(packages, LegacyPackageInfo, set)
+
+    def slotted_packages() -> List[Any]:
+        return load_packages(packages, PackageInfo, frozenset)
+
+    def legacy_info_calls() -> object:
+        # get_package_info used to build a dict and a list on every call
+        infos = legacy_packages()
+        return infos, [
+            {
+                "name": info.name,
+                "version": info.version,
+                "path": str(info.path),
+                "dependencies": list(info.dependencies),
+            }
+            for info in infos
+        ]
+
+    def info_calls() -> object:
+        infos = slotted_packages()
+        views = {info.name: PackageInfoView(info) for info in infos}
+        return infos, [views[info.name] for info in infos]
+
+    rows = [
+        ("packages", legacy_packages, slotted_packages),
+        ("packages + get_package_info", legacy_info_calls, info_calls),
+        ("commits", lambda: [LegacyCommitInfo(**fields) for fields in json.loads(commits)],
+         lambda: [CommitInfo(**fields) for fields in json.loads(commits)]),
+    ]  # fmt: skip
+
+    print(f"{'model':<28} {'before (MiB)':>13} {'after (MiB)':>12} {'saved':>7}")
+    for name, before, after in rows:
+        old, new = measure(before), measure(after)
+        print(f"{name:<28} {old / 2**20:>13.1f} {new / 2**20:>12.1f} {1 - new / old:>7.0%}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
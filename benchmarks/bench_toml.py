@@ -0,0 +1,48 @@
+"""Microbenchmark for reading pyproject.toml files.
+
+Usage: python -m benchmarks.bench_toml [--packages N]
+"""
+
+import argparse
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Callable, List
+
+from benchmarks.synthetic import generate_monorepo
+from poetflow.types.tomlkit import parse
+from poetflow.utils import toml
+
+
+def measure(name: str, paths: List[Path], read: Callable[[Path], object]) -> float:
+    """Read every file and print the duration."""
+    start = time.perf_counter()
+    for path in paths:
+        read(path)
+    elapsed = time.perf_counter() - start
+    print(f"{name:<24} {elapsed * 1000:9.1f} ms {len(paths) / elapsed:10,.0f} files/s")
+    return elapsed
+
+
+def main() -> int:
+    """Run the benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--packages", type=int, default=1000)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        root = Path(tmp)
+        generate_monorepo(root, args.packages)
+        paths = sorted(root.glob("packages/*/pyproject.toml"))
+
+        slow = measure("tomlkit", paths, lambda path: parse(path.read_text(encoding="utf-8")))
+        toml.clear_cache()
+        fast = measure("fast parser (cold)", paths, toml.load)
+        cached = measure("fast parser (cached)", paths, toml.load)
+    print(f"speedup: {slow / fast:.1f}x cold, {slow / cached:.1f}x cached")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
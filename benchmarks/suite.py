@@ -0,0 +1,173 @@
+"""Benchmarks for the core graph, versioning and discovery paths.
+
+Usage: python -m benchmarks.suite [--sizes 10,100,1000,10000] [--output FILE] [--compare FILE]
+"""
+
+import argparse
+import json
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional
+
+from benchmarks.synthetic import generate_monorepo
+from poetflow.core.changelog import ChangelogGenerator
+from poetflow.core.config import Config
+from poetflow.core.dependencies import DependencyManager
+from poetflow.core.discovery import PackageDiscovery
+from poetflow.core.monorepo import MonoRepo
+from poetflow.types.versioning import CommitInfo
+
+DEFAULT_SIZES = [10, 100, 1000, 10000]
+RESULTS_DIR = Path(".poetflow") / "benchmarks"
+
+# Commits rendered per package in the changelog benchmark
+COMMITS_PER_PACKAGE = 10
+
+
+def measure(
+    run: Callable[[Any], object], setup: Callable[[], Any] = lambda: None, repeat: int = 3
+) -> float:
+    """Get the best wall time of a benchmark over several runs
+
+    Args:
+        run: Benchmarked function, called with the result of setup
+        setup: Untimed preparation run before every measurement
+        repeat: Number of measurements
+
+    Returns:
+        Best time in seconds
+    """
+    best = float("inf")
+    for _ in range(repeat):
+        state = setup()
+        start = time.perf_counter()
+        run(state)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def run_size(root: Path, size: int, fan_out: int, depth: int, repeat: int) -> Dict[str, float]:
+    """Run every benchmark on a synthetic monorepo
+
+    Args:
+        root: Empty directory to create the monorepo in
+        size: Number of packages
+        fan_out: Maximum number of direct dependencies per package
+        depth: Number of layers in the dependency graph
+        repeat: Number of measurements per benchmark
+
+    Returns:
+        Best time in seconds by benchmark name
+    """
+    generate_monorepo(root, size, fan_out=fan_out, depth=depth)
+    packages_dir = root / "packages"
+    index_path = root / "discovery.json"
+    results: Dict[str, float] = {}
+
+    results["discovery_cold"] = measure(
+        lambda _: PackageDiscovery(packages_dir).discover(), repeat=repeat
+    )
+    PackageDiscovery(packages_dir, index_path=index_path).discover()
+    results["discovery_warm"] = measure(
+        lambda _: PackageDiscovery(packages_dir, index_path=index_path).discover(), repeat=repeat
+    )
+
+    monorepo = MonoRepo(Config(root_dir=root))
+    packages = monorepo.packages
+    results["dependency_manager"] = measure(lambda _: DependencyManager(monorepo), repeat=repeat)
+    snapshot_path = root / "graph.bin"
+    DependencyManager(monorepo, snapshot_path=snapshot_path)
+    results["dependency_manager_snapshot"] = measure(
+        lambda _: DependencyManager(monorepo, snapshot_path=snapshot_path), repeat=repeat
+    )
+    manager = DependencyManager(monorepo)
+    results["build_order"] = measure(lambda _: manager.get_build_order(), repeat=repeat)
+    results["all_dependents"] = measure(
+        lambda dm: [dm.get_all_dependents(package) for package in packages],
+        setup=lambda: DependencyManager(monorepo),
+        repeat=repeat,
+    )
+
+    # Bump the bottom tenth of the graph, whose dependents are spread over the whole monorepo
+    bumped = {package: "1.0.0" for package in sorted(packages)[: max(1, size // 10)]}
+    results["version_bump"] = measure(
+        lambda _: monorepo.version_manager.update_versions(bumped), repeat=repeat
+    )
+
+    commits = [
+        CommitInfo.parse(message)
+        for message in ("feat(core): add feature", "fix: fix bug", "perf!: speed up", "docs: x")
+    ] * (size * COMMITS_PER_PACKAGE // 4)
+    generator = ChangelogGenerator(root)
+    results["changelog_render"] = measure(
+        lambda _: generator.generate_markdown("1.0.0", commits), repeat=repeat
+    )
+    return results
+
+
+def current_commit() -> Optional[str]:
+    """Get the commit of the benchmarked tree, if it is a git checkout."""
+    try:
+        result = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True
+        )
+    except (OSError, subprocess.CalledProcessError):
+        return None
+    return result.stdout.strip()
+
+
+def compare(results: Dict[str, Dict[str, float]], baseline: Dict[str, Dict[str, float]]) -> None:
+    """Print the ratio of every result to its baseline."""
+    print(f"\n{'size':>6} {'benchmark':<20} {'baseline':>10} {'current':>10} {'ratio':>7}")
+    for size, timings in results.items():
+        for name, seconds in timings.items():
+            before = baseline.get(size, {}).get(name)
+            if before:
+                print(
+                    f"{size:>6} {name:<20} {before:10.4f} {seconds:10.4f} {seconds / before:7.2f}"
+                )
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Run the benchmark suite and save the results as JSON."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", default=",".join(map(str, DEFAULT_SIZES)))
+    parser.add_argument("--fan-out", type=int, default=3)
+    parser.add_argument("--depth", type=int, default=8)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--output", type=Path, help="results file, by commit by default")
+    parser.add_argument("--compare", type=Path, help="results file to compare against")
+    args = parser.parse_args(argv)
+
+    commit = current_commit()
+    results: Dict[str, Dict[str, float]] = {}
+    for size in (int(size) for size in args.sizes.split(",")):
+        with tempfile.TemporaryDirectory(prefix="poetflow-bench-") as tmp:
+            results[str(size)] = timings = run_size(
+                Path(tmp), size, args.fan_out, args.depth, args.repeat
+            )
+        for name, seconds in timings.items():
+            print(f"{size:>6} {name:<20} {seconds:10.4f}s")
+
+    output = args.output or RESULTS_DIR / f"{commit or 'results'}.json"
+    output.parent.mkdir(parents=True, exist_ok=True)
+    report = {
+        "commit": commit,
+        "python": platform.python_version(),
+        "parameters": {"fan_out": args.fan_out, "depth": args.depth, "repeat": args.repeat},
+        "results": results,
+    }
+    output.write_text(json.dumps(report, indent=2))
+    print(f"\nResults saved to {output}")
+
+    if args.compare:
+        compare(results, json.loads(args.compare.read_text())["results"])
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
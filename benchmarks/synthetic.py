@@ -0,0 +1,69 @@
+"""Synthetic monorepo generator for benchmarks."""
+
+import random
+from pathlib import Path
+from typing import Dict, List
+
+
+def package_name(index: int) -> str:
+    """Get the name of the synthetic package with an index."""
+    return f"pkg-{index:05d}"
+
+
+def generate_monorepo(
+    root: Path, packages: int, fan_out: int = 3, depth: int = 8, seed: int = 0
+) -> Dict[str, List[str]]:
+    """Write a monorepo whose packages form a layered dependency graph
+
+    Packages are spread evenly over `depth` layers, and each package depends on up to
+    `fan_out` packages of lower layers. Half of the dependencies are path dependencies and
+    half are version constraints, like in monorepos migrating to published packages.
+
+    Args:
+        root: Directory to create the monorepo in
+        packages: Number of packages
+        fan_out: Maximum number of direct dependencies per package
+        depth: Number of layers in the dependency graph
+        seed: Random seed, so that runs are comparable
+
+    Returns:
+        Direct dependencies by package name
+    """
+    rng = random.Random(seed)
+    packages_dir = root / "packages"
+    layers = max(1, min(depth, packages))
+    graph: Dict[str, List[str]] = {}
+    lower: List[str] = []
+    layer_of = [index * layers // packages for index in range(packages)]
+
+    for index in range(packages):
+        if index and layer_of[index] != layer_of[index - 1]:
+            lower = [package_name(i) for i in range(index)]
+        name = package_name(index)
+        deps = rng.sample(lower, min(fan_out, len(lower)))
+        graph[name] = deps
+
+        dep_lines = "".join(
+            f'{dep} = {{path = "../{dep}", develop = true}}\n' if i % 2 else f'{dep} = "^0.1.0"\n'
+            for i, dep in enumerate(deps)
+        )
+        package_dir = packages_dir / name
+        (package_dir / name.replace("-", "_")).mkdir(parents=True)
+        (package_dir / name.replace("-", "_") / "__init__.py").write_text("")
+        (package_dir / "pyproject.toml").write_text(
+            "[tool.poetry]\n"
+            f'name = "{name}"\n'
+            'version = "0.1.0"\n'
+            f'description = "Synthetic package {index}"\n\n'
+            "[tool.poetry.dependencies]\n"
+            'python = "^3.10"\n'
+            'requests = "^2.31"\n'
+            f"{dep_lines}"
+            "\n[tool.poetry.group.dev.dependencies]\n"
+            'pytest = "^8.0"\n'
+        )
+    (root / "pyproject.toml").write_text(
+        '[tool.poetry]\nname = "synthetic"\nversion = "0.1.0"\n\n'
+        '[tool.poetry.dependencies]\npython = "^3.10"\n'
+    )
+    return graph
@@ -1,10 +1,18 @@
-"""PoetFlow package."""
+"""PoetFlow package.
 
-from .plugins.dependency import MonorepoAdderRemover
-from .plugins.lock import LockModifier
-from .plugins.path import PathRewriter
-from .plugins.venv import VenvModifier
-from .types.config import MonorangerConfig
+The plugins are imported on first access, so that Poetry commands which never use them do not
+pay for importing them and the parts of Poetry they depend on.
+"""
+
+from importlib import import_module
+from typing import TYPE_CHECKING, Any, List
+
+if TYPE_CHECKING:
+    from .plugins.dependency import MonorepoAdderRemover
+    from .plugins.lock import LockModifier
+    from .plugins.path import PathRewriter
+    from .plugins.venv import VenvModifier
+    from .types.config import MonorangerConfig
 
 __all__ = [
     "MonorangerConfig",
@@ -13,3 +21,26 @@ __all__ = [
     "PathRewriter",
     "VenvModifier",
 ]
+
+_LAZY_IMPORTS = {
+    "MonorangerConfig": ".types.config",
+    "MonorepoAdderRemover": ".plugins.dependency",
+    "LockModifier": ".plugins.lock",
+    "PathRewriter": ".plugins.path",
+    "VenvModifier": ".plugins.venv",
+}
+
+
+def __getattr__(name: str) -> Any:
+    """Import public names on first access."""
+    module = _LAZY_IMPORTS.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(import_module(module, __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__() -> List[str]:
+    """List the public names, including the ones not imported yet."""
+    return sorted({*globals(), *__all__})
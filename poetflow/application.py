@@ -1,21 +1,60 @@
 """Application module."""
 
+from importlib import import_module
+from typing import Callable
+
+from cleo.commands.command import Command
 from cleo.events.console_command_event import ConsoleCommandEvent
+from cleo.events.console_events import COMMAND
+from cleo.events.event import Event
+from cleo.events.event_dispatcher import EventDispatcher
 from poetry.console.application import Application as PoetryApplication
 
-from poetflow.core.monorepo import MonoRepo
+from poetflow.core.config import Config
+
+# Monorepo commands by name, with the module and class implementing them
+COMMANDS = {
+    "monorepo-build": ("poetflow.commands.build", "BuildCommand"),
+    "monorepo-discover": ("poetflow.commands.discover", "DiscoverCommand"),
+    "monorepo-export": ("poetflow.commands.export", "ExportCommand"),
+    "monorepo-test": ("poetflow.commands.test", "TestCommand"),
+    "monorepo-watch": ("poetflow.commands.watch", "WatchCommand"),
+}
+
+
+def load_command(module: str, name: str) -> Callable[[], Command]:
+    """Create a factory importing a command only when it is run."""
+
+    def _load() -> Command:
+        command: Command = getattr(import_module(module), name)()
+        return command
+
+    return _load
 
 
 class Application(PoetryApplication):
-    """Application class."""
+    """Application class.
 
-    def __init__(self, monorepo: MonoRepo) -> None:
+    The monorepo commands share one manager, which answers from the watch service when it runs
+    and otherwise builds the monorepo model in-process on first use.
+    """
+
+    def __init__(self, config: Config) -> None:
         super().__init__()
-        self.monorepo = monorepo
+        from poetflow.core.watch import WatchedMonoRepo
+
+        self.monorepo = WatchedMonoRepo.connect(config)
+        for command_name, (module, name) in COMMANDS.items():
+            self.command_loader.register_factory(command_name, load_command(module, name))
+        assert self.event_dispatcher is not None
+        self.event_dispatcher.add_listener(COMMAND, self.handle_command_event)
 
-    def handle_command_event(self, event: ConsoleCommandEvent) -> None:
+    def handle_command_event(
+        self, event: Event, event_name: str, dispatcher: EventDispatcher
+    ) -> None:
         """Handle command event."""
         # Instead of calling execute_command directly
+        assert isinstance(event, ConsoleCommandEvent)
         command = event.command
         if hasattr(command, "set_manager"):
             command.set_manager(self.monorepo)
@@ -9,6 +9,8 @@ from typing import TYPE_CHECKING, Optional, Set
 from poetflow.types import Command as PoetryCommand
 
 if TYPE_CHECKING:
+    from poetflow.core.config import Config
+    from poetflow.core.monorepo import MonoRepo
     from poetflow.types import MonorepoManager
 
 
@@ -22,6 +24,9 @@ class MonorepoCommand(PoetryCommand, ABC):
     def set_manager(self, manager: "MonorepoManager") -> None:
         """Set monorepo manager
 
+        A WatchedMonoRepo answers queries from the running watch service, and only builds the
+        in-process model when a command needs more than the service answers.
+
         Args:
             manager: The monorepo manager
         """
@@ -36,9 +41,12 @@ class MonorepoCommand(PoetryCommand, ABC):
         """
         pass
 
-    def get_affected_packages(self) -> Set[str]:
+    def get_affected_packages(self, base_ref: Optional[str] = None) -> Set[str]:
         """Get packages affected by changes
 
+        Args:
+            base_ref: Git ref to compare against. Defaults to the manager's configured ref.
+
         Returns:
             Set of package names
 
@@ -46,4 +54,28 @@ class MonorepoCommand(PoetryCommand, ABC):
             AssertionError: If manager is not set
         """
         assert self.manager is not None, "Manager must be set before calling get_affected_packages"
-        return self.manager.get_affected_packages()
+        return self.manager.get_affected_packages(base_ref)
+
+    def get_config(self) -> "Config":
+        """Get the monorepo configuration without building the monorepo model
+
+        Raises:
+            AssertionError: If manager is not set
+        """
+        assert self.manager is not None, "Manager must be set before calling get_config"
+        return self.manager.config
+
+    def get_monorepo(self) -> "MonoRepo":
+        """Get the in-process monorepo model, building it if the manager did not need it yet
+
+        Raises:
+            AssertionError: If manager is not set
+        """
+        # The watch service pulls in ctypes, select and socketserver; only load it when used
+        from poetflow.core.monorepo import MonoRepo
+        from poetflow.core.watch import WatchedMonoRepo
+
+        if isinstance(self.manager, WatchedMonoRepo):
+            return self.manager.local
+        assert isinstance(self.manager, MonoRepo), "Manager must be set before calling get_monorepo"
+        return self.manager
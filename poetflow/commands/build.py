@@ -0,0 +1,87 @@
+"""Copyright (C) 2024 Felipe Pimentel <fpimentel88@gmail.com>
+
+This module provides the build command for PoetFlow.
+"""
+
+import asyncio
+import os
+from typing import List
+
+from cleo.commands.command import Command
+from cleo.formatters.formatter import Formatter
+from cleo.helpers import option
+
+from poetflow.commands.base import MonorepoCommand
+from poetflow.utils.executor import ParallelExecutor
+
+
+class BuildCommand(Command, MonorepoCommand):
+    """Builds packages in the monorepo in dependency order."""
+
+    name = "monorepo-build"
+    description = "Build packages in the monorepo"
+
+    options = [
+        option("all", description="Build all packages"),
+        option("package", description="Build specific package(s)", flag=False, multiple=True),
+        option(
+            "max-workers",
+            description="Maximum number of concurrent builds (defaults to the CPU count)",
+            flag=False,
+        ),
+        option("continue-on-error", description="Keep building unrelated packages after a failure"),
+        option(
+            "base-ref",
+            description="Git ref to detect affected packages against",
+            flag=False,
+        ),
+    ]
+
+    def handle(self) -> int:
+        """Handle command execution."""
+        packages = self._get_target_packages()
+        max_workers = int(self.option("max-workers") or os.cpu_count() or 1)
+        assert self.manager is not None
+        executor = ParallelExecutor(
+            self.manager, max_workers=max_workers, on_output=self._write_output
+        )
+
+        report = asyncio.run(
+            executor.run_in_dependency_order(
+                ["poetry", "build"],
+                packages,
+                fail_fast=not self.option("continue-on-error"),
+            )
+        )
+
+        for package, result in report.results.items():
+            if not result.success:
+                self.line_error(f"<error>Failed to build {package}</error>")
+                if result.log_file:
+                    self.line_error(f"Full output in {result.log_file}")
+        for package in report.skipped:
+            self.line_error(f"<comment>Skipped {package}</comment>")
+
+        if report.critical_path:
+            self.line(
+                f"Critical path ({report.critical_path_duration:.1f}s of "
+                f"{report.wall_time:.1f}s): {' -> '.join(report.critical_path)}"
+            )
+        return 0 if report.success else 1
+
+    def _write_output(self, package: str, stream: str, line: str) -> None:
+        """Write a line of build output prefixed with its package."""
+        self.line(f"<comment>[{package}]</comment> {Formatter.escape(line)}")
+
+    def _get_target_packages(self) -> List[str]:
+        """Get target packages in build order."""
+        assert self.manager is not None
+        order = self.manager.get_build_order()
+        if self.option("all"):
+            return order
+
+        if packages := self.option("package"):
+            selected = set(packages)
+        else:
+            selected = self.get_affected_packages(self.option("base-ref"))
+        return [package for package in order if package in selected]
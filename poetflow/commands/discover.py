@@ -0,0 +1,26 @@
+"""Copyright (C) 2024 Felipe Pimentel <fpimentel88@gmail.com>
+
+This module provides the discover command for PoetFlow.
+"""
+
+from cleo.commands.command import Command
+
+from poetflow.commands.base import MonorepoCommand
+
+
+class DiscoverCommand(Command, MonorepoCommand):
+    """Lists the packages discovered in the monorepo."""
+
+    name = "monorepo-discover"
+    description = "List packages in the monorepo"
+
+    def handle(self) -> int:
+        """Handle command execution."""
+        assert self.manager is not None
+        for package in sorted(self.manager.get_all_packages()):
+            info = self.manager.get_package_info(package) or {}
+            self.line(
+                f"<info>{package}</info> <comment>{info.get('version', '')}</comment> "
+                f"{info.get('path', '')}"
+            )
+        return 0
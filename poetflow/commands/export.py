@@ -0,0 +1,69 @@
+"""Copyright (C) 2024 Felipe Pimentel <fpimentel88@gmail.com>
+
+This module provides the export command for PoetFlow.
+"""
+
+from pathlib import Path
+
+from cleo.commands.command import Command
+from cleo.helpers import argument, option
+
+from poetflow.commands.base import MonorepoCommand
+from poetflow.core.exceptions import PackageError
+from poetflow.core.export import RequirementsExporter
+
+
+class ExportCommand(Command, MonorepoCommand):
+    """Exports pinned requirements of packages from the shared lock file."""
+
+    name = "monorepo-export"
+    description = "Export locked requirements of packages from the root poetry.lock"
+
+    arguments = [
+        argument("package", description="Package(s) to export", optional=True, multiple=True)
+    ]
+    options = [
+        option("all", description="Export all packages"),
+        option(
+            "output",
+            "o",
+            description="Requirements file, or directory when exporting several packages",
+            flag=False,
+        ),
+        option("without-hashes", description="Do not pin the hashes of the locked files"),
+    ]
+
+    def handle(self) -> int:
+        """Handle command execution."""
+        assert self.manager is not None
+        exporter = RequirementsExporter(
+            self.manager, self.manager, with_hashes=not self.option("without-hashes")
+        )
+        packages = (
+            self.manager.get_all_packages() if self.option("all") else self.argument("package")
+        )
+        if not packages:
+            self.line_error("<error>Specify packages to export or use --all</error>")
+            return 1
+
+        output = self.option("output")
+        try:
+            if len(packages) == 1 and not self.option("all"):
+                if output is None:
+                    for line in exporter.requirements(packages[0]):
+                        self.line(line)
+                else:
+                    exporter.export(packages[0], Path(output))
+                return 0
+
+            if output is None:
+                self.line_error(
+                    "<error>--output is required when exporting several packages</error>"
+                )
+                return 1
+            for package, path in exporter.export_all(Path(output), packages).items():
+                self.line(f"<info>{package}</info> {path}")
+        except PackageError as e:
+            self.line_error(f"<error>{e}</error>")
+            return 1
+        return 0
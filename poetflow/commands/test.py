@@ -4,13 +4,30 @@ This module provides the test command for PoetFlow.
 """
 
 import asyncio
+import json
+import logging
+import math
+import os
+import time
 from dataclasses import dataclass
-from typing import List, Optional, Set
+from pathlib import Path
+from typing import Dict, List, Optional, Set, Tuple
 
 from cleo.commands.command import Command
-from cleo.helpers import argument, option
+from cleo.formatters.formatter import Formatter
+from cleo.helpers import option
 
 from poetflow.commands.base import MonorepoCommand
+from poetflow.core.cache import TEST_RESULTS, CacheManager
+from poetflow.core.fingerprint import PackageFingerprinter
+from poetflow.types.monorepo import MonorepoManager
+from poetflow.utils.executor import CommandResult, OutputCallback, ParallelExecutor
+from poetflow.utils.fs import atomic_write_text
+
+logger = logging.getLogger(__name__)
+
+# pytest exits with 5 when a package has no tests
+PYTEST_NO_TESTS_COLLECTED = 5
 
 
 @dataclass
@@ -21,21 +38,169 @@ class TestResult:
     success: bool
     output: str
     error: Optional[str] = None
+    duration: float = 0.0
+    log_file: Optional[Path] = None
+    cached: bool = False
 
 
 class TestExecutor:
-    """Test executor."""
+    """Runs the tests of several packages in parallel.
+
+    Packages are started longest first (LPT scheduling), based on the durations recorded by
+    previous runs, which keeps a few slow packages from dominating the wall time. Packages
+    without a recorded duration are assumed to take as long as the average one.
+
+    With ``xdist`` enabled, packages expected to take longer than an even share of the total
+    time are additionally split over several pytest-xdist workers. Every xdist worker counts
+    against ``max_workers``.
+
+    When a cache and a fingerprinter are given, passing results are cached under the package
+    fingerprint, and packages whose fingerprint has a cached pass are not run again.
+    """
+
+    # Keep pytest from collecting this class when tests import it
+    __test__ = False
+
+    def __init__(
+        self,
+        manager: MonorepoManager,
+        max_workers: int = 4,
+        durations_path: Optional[Path] = None,
+        xdist: bool = False,
+        on_output: Optional[OutputCallback] = None,
+        cache: Optional[CacheManager] = None,
+        fingerprinter: Optional[PackageFingerprinter] = None,
+    ) -> None:
+        """Initialize the test executor.
+
+        Args:
+            manager: Monorepo manager
+            max_workers: Maximum number of concurrent test processes
+            durations_path: File recording per-package test durations
+            xdist: Whether to shard slow packages with pytest-xdist
+            on_output: Callback receiving every line of test output
+            cache: Cache for passing test results
+            fingerprinter: Fingerprinter providing the cache keys
+        """
+        self.max_workers = max(1, max_workers)
+        self.durations_path = durations_path or manager.config.cache_dir / "test-durations.json"
+        self.xdist = xdist
+        self.cache = cache
+        self.fingerprinter = fingerprinter
+        self.executor = ParallelExecutor(manager, max_workers=self.max_workers, on_output=on_output)
 
     async def run_command(self, cmd: List[str], packages: List[str]) -> List[TestResult]:
         """Run command for packages."""
-        return [
-            TestResult(
-                package=pkg,
-                success=True,
-                output="Test passed",
-            )
-            for pkg in packages
-        ]
+        durations = self.load_durations()
+        results: List[TestResult] = []
+        keys: Dict[str, str] = {}
+        if self.cache is not None and self.fingerprinter is not None:
+            pending: List[str] = []
+            for package in packages:
+                keys[package] = CacheManager.key(
+                    "test", cmd, self.fingerprinter.fingerprint(package)
+                )
+                cached = self.cache.get(TEST_RESULTS, keys[package])
+                if cached is None:
+                    pending.append(package)
+                    continue
+                results.append(
+                    TestResult(
+                        package=package,
+                        success=True,
+                        output=cached["output"],
+                        duration=cached["duration"],
+                        cached=True,
+                    )
+                )
+            packages = pending
+
+        free = self.max_workers
+        slots = asyncio.Condition()
+
+        async def run(package: str, shards: int) -> None:
+            nonlocal free
+            extra = ["-n", str(shards)] if shards > 1 else []
+            start = time.perf_counter()
+            try:
+                result = await self.executor.run_package([*cmd, *extra], package)
+                results.append(self._to_test_result(result, time.perf_counter() - start))
+            finally:
+                async with slots:
+                    free += shards
+                    slots.notify_all()
+
+        tasks: List[asyncio.Task[None]] = []
+        for package, shards in self.plan(packages, durations):
+            async with slots:
+                await slots.wait_for(lambda: free >= shards)
+                free -= shards
+            tasks.append(asyncio.create_task(run(package, shards)))
+        await asyncio.gather(*tasks)
+
+        for result in results:
+            if not result.success or result.cached:
+                continue
+            durations[result.package] = result.duration
+            if self.cache is not None and result.package in keys:
+                self.cache.set(
+                    TEST_RESULTS,
+                    keys[result.package],
+                    {"output": result.output, "duration": result.duration},
+                )
+        self.save_durations(durations)
+        return results
+
+    def plan(self, packages: List[str], durations: Dict[str, float]) -> List[Tuple[str, int]]:
+        """Order packages longest first and decide how many xdist workers each one gets
+
+        Args:
+            packages: Packages to test
+            durations: Recorded durations by package
+
+        Returns:
+            List of (package, worker count) tuples in start order
+        """
+        known = [durations[pkg] for pkg in packages if pkg in durations]
+        default = sum(known) / len(known) if known else 0.0
+        expected = {pkg: durations.get(pkg, default) for pkg in packages}
+        ordered = sorted(packages, key=lambda pkg: (-expected[pkg], pkg))
+
+        share = sum(expected.values()) / self.max_workers
+        plan: List[Tuple[str, int]] = []
+        for package in ordered:
+            shards = 1
+            if self.xdist and share > 0 and expected[package] > share:
+                shards = min(self.max_workers, math.ceil(expected[package] / share))
+            plan.append((package, shards))
+        return plan
+
+    def load_durations(self) -> Dict[str, float]:
+        """Load the durations recorded by previous runs."""
+        try:
+            durations: Dict[str, float] = json.loads(self.durations_path.read_text())
+        except (OSError, ValueError):
+            return {}
+        return durations
+
+    def save_durations(self, durations: Dict[str, float]) -> None:
+        """Record test durations for the next runs."""
+        try:
+            atomic_write_text(self.durations_path, json.dumps(durations, sort_keys=True))
+        except OSError as e:
+            logger.debug("Cannot write test durations %s: %s", self.durations_path, e)
+
+    @staticmethod
+    def _to_test_result(result: CommandResult, duration: float) -> TestResult:
+        """Convert a command result into a test result."""
+        return TestResult(
+            package=result.package,
+            success=result.success or result.returncode == PYTEST_NO_TESTS_COLLECTED,
+            output=result.output,
+            error=result.error,
+            duration=duration,
+            log_file=result.log_file,
+        )
 
 
 class TestCommand(Command, MonorepoCommand):
@@ -44,28 +209,61 @@ class TestCommand(Command, MonorepoCommand):
     name = "monorepo-test"
     description = "Run tests for packages in the monorepo"
 
-    arguments = [
-        argument("all", "Test all packages"),
-        argument("package", "Test specific package(s)", multiple=True),
-    ]
-
     options = [
+        option("all", description="Test all packages"),
+        option("package", description="Test specific package(s)", flag=False, multiple=True),
         option("--no-coverage", description="Disable coverage reporting"),
-        option("--markers", description="Only run tests matching given markers", multiple=True),
+        option(
+            "--markers",
+            description="Only run tests matching given markers",
+            flag=False,
+            multiple=True,
+        ),
+        option(
+            "--base-ref",
+            description="Git ref to detect affected packages against",
+            flag=False,
+        ),
+        option(
+            "--max-workers",
+            description="Maximum number of concurrent test processes (defaults to the CPU count)",
+            flag=False,
+        ),
+        option("--xdist", description="Split slow packages over pytest-xdist workers"),
+        option("--no-cache", description="Run tests even if a cached result is available"),
     ]
 
     def __init__(self) -> None:
         super().__init__()
-        self.executor = TestExecutor()
+        self.executor: Optional[TestExecutor] = None
 
     async def run_tests(self, packages: Set[str]) -> bool:
         """Run tests for packages."""
-        results = await self.executor.run_command(["poetry", "run", "pytest"], list(packages))
+        assert self.executor is not None
+        results = await self.executor.run_command(self._pytest_command(), sorted(packages))
+        for result in results:
+            if result.cached:
+                self.line(f"<comment>{result.package}: unchanged, using cached result</comment>")
+            elif not result.success:
+                self.line_error(f"<error>Tests failed for {result.package}</error>")
+                if result.log_file:
+                    self.line_error(f"Full output in {result.log_file}")
         return all(result.success for result in results)
 
     def handle(self) -> int:
         """Handle command execution."""
+        assert self.manager is not None
         packages = self._get_target_packages()
+        if self.executor is None:
+            self.executor = TestExecutor(
+                self.manager,
+                max_workers=int(self.option("max-workers") or os.cpu_count() or 1),
+                xdist=self.option("xdist"),
+                on_output=self._write_output,
+                cache=None if self.option("no-cache") else self.manager.cache,
+                fingerprinter=PackageFingerprinter(self.manager, self.manager),
+            )
+
         success = asyncio.run(self.run_tests(packages))
 
         if not success:
@@ -73,6 +271,22 @@ class TestCommand(Command, MonorepoCommand):
             return 1
         return 0
 
+    def _pytest_command(self) -> List[str]:
+        """Build the pytest command line from the command options."""
+        cmd = ["poetry", "run", "pytest"]
+        if markers := self.option("markers"):
+            cmd.extend(["-m", " or ".join(f"({marker})" for marker in markers)])
+        if self.option("no-coverage"):
+            cmd.extend(["-p", "no:pytest_cov"])
+        else:
+            cmd.extend(["--cov", "--cov-report=term-missing"])
+        return cmd
+
+    def _write_output(self, package: str, stream: str, line: str) -> None:
+        """Write a line of test output prefixed with its package."""
+        if self.io.is_verbose():
+            self.line(f"<comment>[{package}]</comment> {Formatter.escape(line)}")
+
     def _get_target_packages(self) -> Set[str]:
         """Get target packages."""
         if self.option("all"):
@@ -82,4 +296,4 @@ class TestCommand(Command, MonorepoCommand):
         if packages := self.option("package"):
             return set(packages)
 
-        return self.get_affected_packages()
+        return self.get_affected_packages(self.option("base-ref"))
@@ -3,14 +3,15 @@
 This module handles semantic versioning and changelog generation for packages in the monorepo.
 """
 
-import re
-from dataclasses import dataclass
 from enum import Enum
 from pathlib import Path
-from typing import List, Optional
+from typing import Dict, Iterator, List, Optional, Tuple
 
 from packaging.version import Version
 
+from poetflow.core import history
+from poetflow.types.versioning import CommitInfo
+
 
 class VersionBumpType(Enum):
     MAJOR = "major"
@@ -18,31 +19,63 @@ class VersionBumpType(Enum):
     PATCH = "patch"
 
 
-@dataclass
-class CommitInfo:
-    """Information about a commit for changelog generation"""
-
-    hash: str
-    type: str
-    scope: Optional[str]
-    message: str
-    breaking: bool
-
-
 class SemanticVersionManager:
     """Manages semantic versioning for packages"""
 
-    CONVENTIONAL_COMMIT_PATTERN = re.compile(
-        r"^(?P<type>\w+)(?:\((?P<scope>[^)]+)\))?: (?P<message>.+)$"
-    )
-
     def __init__(self, project_root: Path):
         self.project_root = project_root
 
     def parse_commits(self, since_tag: Optional[str] = None) -> List[CommitInfo]:
-        """Parses git commits to extract conventional commit information"""
-        # TODO: Implement git log parsing
-        return []  # Return empty list instead of None
+        """Parses git commits to extract conventional commit information
+
+        Args:
+            since_tag: Tag of the last release; only commits after it are parsed
+
+        Returns:
+            Conventional commits, newest first
+
+        Raises:
+            MonoRepoError: If git fails, e.g. because the tag does not exist
+        """
+        return [commit for commit, _ in self.iter_commits(since_tag)]
+
+    def parse_commits_by_package(
+        self, package_paths: Dict[str, Path], since_tag: Optional[str] = None
+    ) -> Dict[str, List[CommitInfo]]:
+        """Attributes conventional commits to the packages whose files they touched
+
+        History is read once for all packages, so the cost does not grow with the number of
+        packages. A commit touching several packages is attributed to each of them.
+
+        Args:
+            package_paths: Package directories by package name
+            since_tag: Tag of the last release; only commits after it are parsed
+
+        Returns:
+            Commits by package name, newest first
+
+        Raises:
+            MonoRepoError: If git fails, e.g. because the tag does not exist
+        """
+        return history.commits_by_package(self.project_root, package_paths, since_tag)
+
+    def iter_commits(
+        self, since_tag: Optional[str] = None
+    ) -> Iterator[Tuple[CommitInfo, List[str]]]:
+        """Streams conventional commits from git log together with the paths they touched
+
+        Commits that do not follow the conventional format are skipped.
+
+        Args:
+            since_tag: Tag of the last release; history stops there
+
+        Yields:
+            Each commit and the paths it touched, relative to the project root
+
+        Raises:
+            MonoRepoError: If git fails, e.g. because the tag does not exist
+        """
+        return history.iter_commits(self.project_root, since_tag)
 
     def determine_bump_type(self, commits: List[CommitInfo]) -> VersionBumpType:
         """Determines what type of version bump is needed based on commits
@@ -0,0 +1,79 @@
+"""Copyright (C) 2024 Felipe Pimentel <fpimentel88@gmail.com>
+
+This module provides the watch command for PoetFlow.
+"""
+
+import json
+
+from cleo.commands.command import Command
+from cleo.helpers import option
+
+from poetflow.commands.base import MonorepoCommand
+from poetflow.core.exceptions import MonoRepoError
+from poetflow.core.watch import (
+    DEFAULT_POLL_INTERVAL,
+    SOCKET_NAME,
+    WatchService,
+    create_watcher,
+    running_service,
+)
+
+
+class WatchCommand(Command, MonorepoCommand):
+    """Keeps the monorepo model in memory and answers queries about it."""
+
+    name = "monorepo-watch"
+    description = "Serve monorepo queries from memory, refreshing on file changes"
+
+    options = [
+        option("polling", description="Poll for changes instead of using inotify"),
+        option(
+            "interval",
+            description="Seconds between checks for changes",
+            flag=False,
+            default=str(DEFAULT_POLL_INTERVAL),
+        ),
+        option(
+            "query",
+            description="Send a query (e.g. build-order) to the running service and print it",
+            flag=False,
+        ),
+        option("package", description="Package argument of the query", flag=False),
+        option("stop", description="Stop the running service"),
+    ]
+
+    def handle(self) -> int:
+        """Handle command execution."""
+        config = self.get_config()
+        socket_path = config.cache_dir / SOCKET_NAME
+
+        if self.option("query") or self.option("stop"):
+            client = running_service(socket_path)
+            if client is None:
+                self.line_error(f"<error>No watch service running on {socket_path}</error>")
+                return 1
+            command = "shutdown" if self.option("stop") else self.option("query")
+            args = {"package": self.option("package")} if self.option("package") else {}
+            try:
+                result = client.request(command, **args)
+            except MonoRepoError as e:
+                self.line_error(f"<error>{e}</error>")
+                return 1
+            self.line(json.dumps(result, indent=2))
+            return 0
+
+        watcher = create_watcher(
+            config.root_dir, config.packages_dir, polling=self.option("polling")
+        )
+        service = WatchService(
+            self.get_monorepo(),
+            watcher=watcher,
+            socket_path=socket_path,
+            poll_interval=float(self.option("interval")),
+        )
+        self.line(f"Watching {config.packages_dir} ({type(watcher).__name__}) on {socket_path}")
+        try:
+            service.serve_forever()
+        except KeyboardInterrupt:
+            pass
+        return 0
@@ -1,9 +1,252 @@
 """Cache management for PoetFlow"""
 
+import hashlib
+import json
+import logging
+import os
+import shutil
+import threading
 from pathlib import Path
-from typing import Optional
+from typing import Any, Callable, List, Optional, Tuple, TypeVar
+
+from poetflow.utils.fs import atomic_write_bytes
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+# Well-known namespaces
+PYPROJECT = "pyproject"
+GRAPH = "graph"
+LOCK = "lock"
+ARTIFACT = "artifact"
+TEST_RESULTS = "test"
+
+DEFAULT_MAX_SIZE = 512 * 1024 * 1024
 
 
 class CacheManager:
-    def __init__(self, cache_dir: Optional[Path]):
+    """Content-addressed cache shared by PoetFlow components.
+
+    Entries live in ``<cache_dir>/<namespace>/<key[:2]>/<key>`` where the key is a hash of the
+    inputs that produced the entry. Writes are atomic, so several processes (e.g. concurrent CI
+    jobs on one runner) can share a cache directory. Reads refresh an entry's mtime and the least
+    recently used entries are evicted once the cache grows past ``max_size`` bytes.
+
+    A manager created without a cache directory is disabled: every lookup misses and writes are
+    ignored.
+    """
+
+    def __init__(self, cache_dir: Optional[Path], max_size: int = DEFAULT_MAX_SIZE):
         self.cache_dir = cache_dir
+        self.max_size = max_size
+        self._size: Optional[int] = None
+        self._lock = threading.Lock()
+
+    @property
+    def enabled(self) -> bool:
+        """Whether the cache is backed by a directory."""
+        return self.cache_dir is not None
+
+    @staticmethod
+    def key(*parts: Any) -> str:
+        """Compute a cache key from the inputs of a cached step
+
+        Args:
+            parts: Inputs of the step. Bytes are hashed as is, anything else as canonical JSON.
+
+        Returns:
+            Hex digest identifying the inputs
+        """
+        digest = hashlib.sha256()
+        for part in parts:
+            data = part if isinstance(part, bytes) else json.dumps(part, sort_keys=True).encode()
+            digest.update(len(data).to_bytes(8, "big"))
+            digest.update(data)
+        return digest.hexdigest()
+
+    def get_bytes(self, namespace: str, key: str) -> Optional[bytes]:
+        """Read a raw entry
+
+        Args:
+            namespace: Entry namespace
+            key: Entry key
+
+        Returns:
+            The entry content, or None on a miss
+        """
+        path = self.get_file(namespace, key)
+        if path is None:
+            return None
+        try:
+            return path.read_bytes()
+        except FileNotFoundError:
+            return None
+
+    def set_bytes(self, namespace: str, key: str, data: bytes) -> None:
+        """Write a raw entry
+
+        Args:
+            namespace: Entry namespace
+            key: Entry key
+            data: Entry content
+        """
+        path = self._path(namespace, key)
+        if path is None:
+            return
+        try:
+            atomic_write_bytes(path, data)
+        except OSError as e:
+            logger.debug("Cannot write cache entry %s: %s", path, e)
+            return
+        self._grow(len(data))
+
+    def get(self, namespace: str, key: str) -> Optional[Any]:
+        """Read a JSON entry
+
+        Args:
+            namespace: Entry namespace
+            key: Entry key
+
+        Returns:
+            The decoded entry, or None on a miss
+        """
+        data = self.get_bytes(namespace, key)
+        if data is None:
+            return None
+        try:
+            return json.loads(data)
+        except ValueError:
+            return None
+
+    def set(self, namespace: str, key: str, value: Any) -> None:
+        """Write a JSON entry
+
+        Args:
+            namespace: Entry namespace
+            key: Entry key
+            value: JSON serializable value
+        """
+        self.set_bytes(namespace, key, json.dumps(value, separators=(",", ":")).encode())
+
+    def get_or_compute(self, namespace: str, key: str, compute: Callable[[], T]) -> T:
+        """Read a JSON entry, computing and storing it on a miss
+
+        Args:
+            namespace: Entry namespace
+            key: Entry key
+            compute: Function producing the value
+
+        Returns:
+            The cached or freshly computed value
+        """
+        cached = self.get(namespace, key)
+        if cached is not None:
+            return cached  # type: ignore[no-any-return]
+        value = compute()
+        self.set(namespace, key, value)
+        return value
+
+    def get_file(self, namespace: str, key: str) -> Optional[Path]:
+        """Get the path of an entry, e.g. a build artifact
+
+        Args:
+            namespace: Entry namespace
+            key: Entry key
+
+        Returns:
+            Path of the entry, or None on a miss
+        """
+        path = self._path(namespace, key)
+        if path is None:
+            return None
+        try:
+            os.utime(path)
+        except OSError:
+            return None
+        return path
+
+    def put_file(self, namespace: str, key: str, source: Path) -> Optional[Path]:
+        """Copy a file into the cache
+
+        Args:
+            namespace: Entry namespace
+            key: Entry key
+            source: File to store
+
+        Returns:
+            Path of the stored entry, or None if the cache is disabled
+        """
+        path = self._path(namespace, key)
+        if path is None:
+            return None
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_name(f".{path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+        try:
+            shutil.copyfile(source, tmp)
+            os.replace(tmp, path)
+        finally:
+            tmp.unlink(missing_ok=True)
+        self._grow(path.stat().st_size)
+        return path
+
+    def clear(self) -> None:
+        """Remove every entry from the cache."""
+        if self.cache_dir is None:
+            return
+        shutil.rmtree(self.cache_dir, ignore_errors=True)
+        with self._lock:
+            self._size = 0
+
+    def evict(self) -> None:
+        """Evict least recently used entries until the cache fits in its size cap."""
+        if self.cache_dir is None:
+            return
+
+        entries = self._entries()
+        total = sum(size for _, size, _ in entries)
+        if total > self.max_size:
+            # Evict down to 90% of the cap so every write does not trigger another scan
+            target = self.max_size * 9 // 10
+            for _, size, path in sorted(entries):
+                if total <= target:
+                    break
+                try:
+                    path.unlink()
+                except FileNotFoundError:
+                    pass
+                total -= size
+
+        with self._lock:
+            self._size = total
+
+    def _path(self, namespace: str, key: str) -> Optional[Path]:
+        """Get the location of an entry."""
+        if self.cache_dir is None:
+            return None
+        return self.cache_dir / namespace / key[:2] / key
+
+    def _entries(self) -> List[Tuple[float, int, Path]]:
+        """List (mtime, size, path) for every entry in the cache."""
+        assert self.cache_dir is not None
+        entries: List[Tuple[float, int, Path]] = []
+        for dirpath, _, filenames in os.walk(self.cache_dir):
+            for filename in filenames:
+                if filename.startswith("."):
+                    continue
+                path = Path(dirpath) / filename
+                try:
+                    stat = path.stat()
+                except FileNotFoundError:
+                    continue
+                entries.append((stat.st_mtime, stat.st_size, path))
+        return entries
+
+    def _grow(self, size: int) -> None:
+        """Account for a new entry and evict if the size cap is exceeded."""
+        with self._lock:
+            if self._size is not None:
+                self._size += size
+            over = self._size is None or self._size > self.max_size
+        if over:
+            self.evict()
@@ -1,21 +1,44 @@
 """Changelog generation functionality."""
 
+import hashlib
+import json
+import logging
+import os
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import List, Optional
+from typing import Dict, List, Optional, Sequence, Set
 
+from ..core.commits import DEFAULT_SECTIONS, Section, classify_commits
+from ..core.history import commits_by_package
 from ..types.versioning import CommitInfo
+from ..utils.fs import atomic_prepend_bytes, atomic_write_text
+
+logger = logging.getLogger(__name__)
+
+CHANGELOG = "CHANGELOG.md"
+INDEX_VERSION = 1
 
 
 class ChangelogGenerator:
     """Generates changelog from commits."""
 
-    def __init__(self, project_root: Path):
+    def __init__(
+        self,
+        project_root: Path,
+        sections: Sequence[Section] = DEFAULT_SECTIONS,
+        cache_dir: Optional[Path] = None,
+    ):
         """Initialize changelog generator.
 
         Args:
             project_root: Root directory of the project
+            sections: Sections listed in changelog entries, after breaking changes
+            cache_dir: Directory for PoetFlow's on-disk caches, where the index of released
+                versions is kept. Defaults to .poetflow in the project root.
         """
         self.project_root = project_root
+        self.sections = sections
+        self.index_dir = (cache_dir or project_root / ".poetflow") / "changelogs"
 
     def generate_markdown(self, version: str, commits: List[CommitInfo]) -> str:
         """Generates a markdown changelog entry for a version.
@@ -28,32 +51,9 @@ class ChangelogGenerator:
             Markdown formatted changelog
         """
         lines = [f"## {version}", ""]
-
-        # Group commits by type
-        breaking_changes = [c for c in commits if c.breaking]
-        features = [c for c in commits if c.type in ["feat", "feature"]]
-        fixes = [c for c in commits if c.type == "fix"]
-
-        # Add breaking changes
-        if breaking_changes:
-            lines.extend(["### Breaking Changes", ""])
-            for commit in breaking_changes:
-                scope = f"**{commit.scope}:** " if commit.scope else ""
-                lines.append(f"- {scope}{commit.message}")
-            lines.append("")
-
-        # Add features
-        if features:
-            lines.extend(["### Features", ""])
-            for commit in features:
-                scope = f"**{commit.scope}:** " if commit.scope else ""
-                lines.append(f"- {scope}{commit.message}")
-            lines.append("")
-
-        # Add fixes
-        if fixes:
-            lines.extend(["### Bug Fixes", ""])
-            for commit in fixes:
+        for title, section in classify_commits(commits, self.sections):
+            lines.extend([f"### {title}", ""])
+            for commit in section:
                 scope = f"**{commit.scope}:** " if commit.scope else ""
                 lines.append(f"- {scope}{commit.message}")
             lines.append("")
@@ -65,14 +65,108 @@ class ChangelogGenerator:
         version: str,
         commits: List[CommitInfo],
         output_file: Optional[Path] = None,
-    ) -> None:
-        """Write changelog to a file."""
-        content = self.generate_markdown(version, commits)
-        changelog_path = output_file or (self.project_root / "CHANGELOG.md")
+    ) -> bool:
+        """Prepend the entry of a release to a changelog file.
 
-        # Prepend new content to existing changelog
+        The existing changelog is streamed after the new entry instead of being read into
+        memory. Released versions are recorded in an index in the cache directory, so a release
+        is written only once.
+
+        Args:
+            version: Version number
+            commits: List of commits to include
+            output_file: Changelog file, CHANGELOG.md in the project root by default
+
+        Returns:
+            True if the entry was written, False if the version was already released
+        """
+        changelog_path = output_file or (self.project_root / CHANGELOG)
+        released = self._released_versions(changelog_path)
+        if version in released:
+            logger.info("%s already has an entry for %s, skipping", changelog_path, version)
+            return False
+
+        content = self.generate_markdown(version, commits)
         if changelog_path.exists():
-            existing_content = changelog_path.read_text()
-            content = f"{content}\n{existing_content}"
+            content = f"{content}\n"
+        atomic_prepend_bytes(changelog_path, content.encode("utf-8"))
+
+        released.add(version)
+        index = {"version": INDEX_VERSION, "released": sorted(released)}
+        atomic_write_text(self._index_path(changelog_path), json.dumps(index, indent=2))
+        return True
+
+    def write_changelogs(
+        self,
+        versions: Dict[str, str],
+        package_paths: Dict[str, Path],
+        since_tag: Optional[str] = None,
+        max_workers: Optional[int] = None,
+    ) -> Dict[str, bool]:
+        """Write the changelog entries of several package releases.
+
+        Git history is scanned once for all packages, and commits are attributed to packages by
+        the files they touched. Each package gets its entry in its own CHANGELOG.md.
 
-        changelog_path.write_text(content)
+        Args:
+            versions: Released version by package name
+            package_paths: Package directories by package name
+            since_tag: Tag of the previous release; only later commits are included
+            max_workers: Maximum number of changelogs written concurrently
+
+        Returns:
+            Whether an entry was written, by package name
+        """
+        written = {package: False for package in versions}
+        pending = [
+            package
+            for package, version in versions.items()
+            if version not in self._released_versions(package_paths[package] / CHANGELOG)
+        ]
+        if not pending:
+            return written
+
+        scanned = commits_by_package(
+            self.project_root, {package: package_paths[package] for package in pending}, since_tag
+        )
+
+        def write(package: str) -> bool:
+            return self.write_changelog(
+                versions[package], scanned[package], package_paths[package] / CHANGELOG
+            )
+
+        with ThreadPoolExecutor(max_workers=max_workers) as pool:
+            written.update(zip(pending, pool.map(write, pending)))
+        return written
+
+    def _index_path(self, changelog_path: Path) -> Path:
+        """Get the index recording the versions released in a changelog
+
+        The index lives in the cache directory rather than next to the changelog, so that
+        writing it does not mark the package as changed.
+        """
+        relative = os.path.relpath(changelog_path.resolve(), self.project_root.resolve())
+        key = hashlib.sha256(relative.encode("utf-8")).hexdigest()[:16]
+        return self.index_dir / f"{key}.json"
+
+    def _released_versions(self, changelog_path: Path) -> Set[str]:
+        """Get the versions already released in a changelog
+
+        Changelogs written before the index existed are scanned once for their version headings.
+        """
+        try:
+            index = json.loads(self._index_path(changelog_path).read_text(encoding="utf-8"))
+            if index.get("version") == INDEX_VERSION:
+                return set(index["released"])
+        except (OSError, ValueError, KeyError):
+            pass
+
+        released: Set[str] = set()
+        try:
+            with changelog_path.open(encoding="utf-8") as f:
+                for line in f:
+                    if line.startswith("## "):
+                        released.add(line[3:].strip())
+        except FileNotFoundError:
+            pass
+        return released
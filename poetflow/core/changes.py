@@ -0,0 +1,285 @@
+"""Copyright (C) 2024 Felipe Pimentel <fpimentel88@gmail.com>
+
+This module detects which packages of the monorepo are affected by the changes since a git ref.
+"""
+
+import logging
+import os
+import subprocess
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Dict, Iterable, List, Optional, Set, Tuple
+
+from packaging.utils import canonicalize_name
+
+from poetflow.core.config import DEFAULT_BASE_REF
+from poetflow.core.exceptions import MonoRepoError
+from poetflow.core.lock import LockReader
+from poetflow.types.monorepo import MonoRepo
+
+if TYPE_CHECKING:
+    from poetflow.core.dependencies import DependencyManager
+
+logger = logging.getLogger(__name__)
+
+# Root files whose changes affect every package
+GLOBAL_FILES = frozenset({"pyproject.toml"})
+
+# Shared lock file, whose changes affect the packages requiring the changed entries
+LOCK_FILE = "poetry.lock"
+
+
+class PathTrie:
+    """Prefix index mapping paths to the package that owns them.
+
+    Lookups cost one step per path component, regardless of how many packages are indexed.
+    Nested packages are supported: a path belongs to the deepest package containing it.
+    """
+
+    _OWNER = "\0owner"
+
+    def __init__(self) -> None:
+        self._root: Dict[str, Any] = {}
+
+    def insert(self, path: str, owner: str) -> None:
+        """Register the owner of a directory
+
+        Args:
+            path: Directory path, relative to the monorepo root
+            owner: Package owning the directory
+        """
+        node = self._root
+        for part in _split(path):
+            node = node.setdefault(part, {})
+        node[self._OWNER] = owner
+
+    def find(self, path: str) -> Optional[str]:
+        """Find the package owning a path
+
+        Args:
+            path: File path, relative to the monorepo root
+
+        Returns:
+            The owning package, or None if no package contains the path
+        """
+        node = self._root
+        owner: Optional[str] = node.get(self._OWNER)
+        for part in _split(path):
+            child = node.get(part)
+            if child is None:
+                break
+            node = child
+            owner = node.get(self._OWNER, owner)
+        return owner
+
+
+def _split(path: str) -> List[str]:
+    """Split a relative path into its components."""
+    return [part for part in path.replace(os.sep, "/").split("/") if part and part != "."]
+
+
+class ChangeDetector:
+    """Maps the files changed since a git ref to the affected monorepo packages."""
+
+    def __init__(self, monorepo: MonoRepo, dependency_manager: "DependencyManager") -> None:
+        """Initialize change detector.
+
+        Args:
+            monorepo: MonoRepo instance
+            dependency_manager: Dependency manager used to expand changes to dependents
+        """
+        self.monorepo = monorepo
+        self.dependency_manager = dependency_manager
+        self.root = Path(monorepo.root).resolve()
+        self._trie: Optional[PathTrie] = None
+
+    @property
+    def trie(self) -> PathTrie:
+        """Path-prefix index over the package directories."""
+        if self._trie is None:
+            trie = PathTrie()
+            for package in self.monorepo.packages:
+                info = self.monorepo.get_package_info(package)
+                if info:
+                    path = Path(str(info["path"])).resolve()
+                    trie.insert(os.path.relpath(path, self.root), package)
+            self._trie = trie
+        return self._trie
+
+    def get_merge_base(self, base_ref: str = DEFAULT_BASE_REF) -> str:
+        """Get the commit where HEAD forked from a ref
+
+        Args:
+            base_ref: Git ref to compare against
+
+        Returns:
+            Commit hash
+
+        Raises:
+            MonoRepoError: If git fails, e.g. because the ref does not exist
+        """
+        return self._git("merge-base", base_ref, "HEAD").strip()
+
+    def get_changed_files(self, base_ref: str = DEFAULT_BASE_REF) -> List[str]:
+        """List files changed between the merge base of a ref and the working tree
+
+        Untracked files that are not ignored count as changed too.
+
+        Args:
+            base_ref: Git ref to compare against
+
+        Returns:
+            Changed file paths, relative to the monorepo root
+
+        Raises:
+            MonoRepoError: If git fails, e.g. because the ref does not exist
+        """
+        return self.get_changed_files_since(self.get_merge_base(base_ref))
+
+    def get_changed_files_since(self, merge_base: str) -> List[str]:
+        """List files changed between a resolved revision and the working tree
+
+        Untracked files that are not ignored count as changed too.
+
+        Args:
+            merge_base: Git revision to compare against, e.g. from get_merge_base
+
+        Returns:
+            Changed file paths, relative to the monorepo root
+
+        Raises:
+            MonoRepoError: If git fails
+        """
+        diff = self._git("diff", "--name-only", "--no-renames", "--relative", "-z", merge_base)
+        untracked = self._git("ls-files", "--others", "--exclude-standard", "-z")
+        return [path for path in f"{diff}\0{untracked}".split("\0") if path]
+
+    def get_changed_packages(self, files: Iterable[str], base: Optional[str] = None) -> Set[str]:
+        """Map changed files to the packages owning them
+
+        A changed lock file affects the packages whose locked requirements include a changed
+        entry. Without a base revision to compare the lock file against, it affects every
+        package.
+
+        Args:
+            files: File paths, relative to the monorepo root
+            base: Git revision the files changed from
+
+        Returns:
+            Set of package names
+        """
+        changed: Set[str] = set()
+        lock_changed = False
+        for path in files:
+            if path in GLOBAL_FILES:
+                return set(self.monorepo.packages)
+            if path == LOCK_FILE:
+                lock_changed = True
+                continue
+            owner = self.trie.find(path)
+            if owner is not None:
+                changed.add(owner)
+
+        if lock_changed:
+            if base is None:
+                return set(self.monorepo.packages)
+            changed |= self.get_lock_affected_packages(base)
+        return changed
+
+    def get_changed_lock_entries(self, base: str) -> Tuple[Set[str], LockReader, LockReader]:
+        """Compare the lock file of a revision with the one in the working tree, per entry
+
+        Args:
+            base: Git revision to compare against
+
+        Returns:
+            Canonical names of the entries added, removed or changed, and readers of the old
+            and the current lock file
+
+        Raises:
+            MonoRepoError: If git fails to read the revision
+        """
+        try:
+            old_content = self._git_bytes("show", f"{base}:./{LOCK_FILE}")
+        except MonoRepoError as e:
+            logger.debug("No %s at %s, treating every entry as new: %s", LOCK_FILE, base, e)
+            old_content = b""
+        old = LockReader.from_content(old_content, self.root / LOCK_FILE)
+        new = LockReader(self.root / LOCK_FILE)
+
+        old_entries, new_entries = old.entries, new.entries
+        changed = {
+            name
+            for name in old_entries.keys() | new_entries.keys()
+            if old_entries.get(name) != new_entries.get(name)
+        }
+        return changed, old, new
+
+    def get_lock_affected_packages(self, base: str) -> Set[str]:
+        """Get the packages whose locked requirements changed since a revision
+
+        Changed entries are mapped to packages through the reverse dependency indexes of both
+        lock files, so that removed entries are traced through the lock they were removed from.
+
+        Args:
+            base: Git revision to compare against
+
+        Returns:
+            Set of package names
+        """
+        try:
+            entries, old, new = self.get_changed_lock_entries(base)
+        except MonoRepoError as e:
+            logger.warning("Cannot compare %s, considering all packages affected: %s", LOCK_FILE, e)
+            return set(self.monorepo.packages)
+        if not entries:
+            return set()
+
+        local = {canonicalize_name(package) for package in self.monorepo.packages}
+        requirements: Dict[str, List[str]] = {}
+        for package in self.monorepo.packages:
+            info = self.monorepo.get_package_info(package) or {}
+            requirements[package] = [
+                dep for dep in info.get("dependencies", ()) if canonicalize_name(dep) not in local
+            ]
+        return old.requirers(entries, requirements) | new.requirers(entries, requirements)
+
+    def get_affected_packages(self, base_ref: str = DEFAULT_BASE_REF) -> Set[str]:
+        """Get packages changed since a ref together with their transitive dependents
+
+        If the changes cannot be computed, every package is considered affected.
+
+        Args:
+            base_ref: Git ref to compare against
+
+        Returns:
+            Set of package names
+        """
+        try:
+            merge_base = self.get_merge_base(base_ref)
+            files = self.get_changed_files_since(merge_base)
+        except MonoRepoError as e:
+            logger.warning("Cannot detect changes, considering all packages affected: %s", e)
+            return set(self.monorepo.packages)
+
+        changed = self.get_changed_packages(files, merge_base)
+        return changed | self.dependency_manager.get_dependents_of(changed)
+
+    def _git(self, *args: str) -> str:
+        """Run a git command in the monorepo root."""
+        return self._git_bytes(*args).decode("utf-8")
+
+    def _git_bytes(self, *args: str) -> bytes:
+        """Run a git command in the monorepo root and return its raw output."""
+        try:
+            result = subprocess.run(
+                ["git", *args],
+                cwd=self.root,
+                check=True,
+                capture_output=True,
+            )
+        except (OSError, subprocess.CalledProcessError) as e:
+            stderr = getattr(e, "stderr", None) or str(e)
+            if isinstance(stderr, bytes):
+                stderr = stderr.decode("utf-8", "replace")
+            raise MonoRepoError(f"git {args[0]} failed: {stderr.strip()}") from e
+        return result.stdout
@@ -1,8 +1,14 @@
 """CI utilities."""
 
+import logging
 from typing import Set
 
-from poetflow.types.monorepo import MonoRepo
+from poetflow.core.changes import ChangeDetector
+from poetflow.core.config import DEFAULT_BASE_REF
+from poetflow.core.exceptions import MonoRepoError
+from poetflow.core.monorepo import MonoRepo
+
+logger = logging.getLogger(__name__)
 
 
 class CIManager:
@@ -10,17 +16,25 @@ class CIManager:
 
     def __init__(self, monorepo: MonoRepo) -> None:
         self.monorepo = monorepo
+        # Reuse the monorepo's manager, with its graph snapshot and memoized dependents
+        self.dependency_manager = monorepo.dependency_manager
+        self.change_detector = ChangeDetector(monorepo, self.dependency_manager)
+
+    def get_affected_packages(self, base_ref: str = DEFAULT_BASE_REF) -> Set[str]:
+        """Get packages changed since a ref together with their dependents."""
+        return self.change_detector.get_affected_packages(base_ref)
+
+    def get_dependent_packages(self, base_ref: str = DEFAULT_BASE_REF) -> Set[str]:
+        """Get packages that only need to run because a dependency changed.
+
+        If the changes cannot be computed, every package is considered affected.
+        """
+        try:
+            merge_base = self.change_detector.get_merge_base(base_ref)
+            files = self.change_detector.get_changed_files_since(merge_base)
+        except MonoRepoError as e:
+            logger.warning("Cannot detect changes, considering all packages affected: %s", e)
+            return set(self.monorepo.packages)
 
-    def get_affected_packages(self) -> Set[str]:
-        """Get affected packages."""
-        affected: Set[str] = set()
-        for package in self.monorepo.packages:  # Use packages property
-            affected.add(package)
-        return affected
-
-    def get_dependent_packages(self) -> Set[str]:
-        """Get dependent packages."""
-        dependent: Set[str] = set()
-        for package in self.monorepo.packages:  # Use packages property
-            dependent.add(package)
-        return dependent
+        changed = self.change_detector.get_changed_packages(files, merge_base)
+        return self.dependency_manager.get_dependents_of(changed) - changed
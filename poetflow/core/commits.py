@@ -0,0 +1,102 @@
+"""Copyright (C) 2024 Felipe Pimentel <fpimentel88@gmail.com>
+
+This module classifies conventional commits into the sections shared by changelogs and version
+bumps.
+"""
+
+from dataclasses import dataclass, field
+from typing import Dict, FrozenSet, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+from poetflow.types.versioning import CommitInfo
+
+BREAKING_CHANGES = "Breaking Changes"
+
+# Bump types ordered by precedence
+BUMP_TYPES = ("patch", "minor", "major")
+
+
+@dataclass(frozen=True)
+class Section:
+    """A group of commit types shown together in changelogs.
+
+    Attributes:
+        title: Section heading
+        types: Commit types belonging to the section
+        bump: Version bump caused by commits of the section, if any
+    """
+
+    title: str
+    types: FrozenSet[str]
+    bump: Optional[str] = None
+
+
+DEFAULT_SECTIONS: Tuple[Section, ...] = (
+    Section("Features", frozenset({"feat", "feature"}), bump="minor"),
+    Section("Bug Fixes", frozenset({"fix"}), bump="patch"),
+)
+
+# Extra sections for projects that also report these commit types
+PERFORMANCE = Section("Performance Improvements", frozenset({"perf"}), bump="patch")
+REFACTORING = Section("Code Refactoring", frozenset({"refactor"}))
+DEPENDENCIES = Section("Dependencies", frozenset({"deps"}), bump="patch")
+
+
+@dataclass
+class CommitBuckets:
+    """Commits classified into sections.
+
+    Breaking commits only appear under breaking changes, never in the section of their type.
+
+    Attributes:
+        breaking: Breaking commits
+        sections: Non-breaking commits by section, in section order
+    """
+
+    breaking: List[CommitInfo] = field(default_factory=list)
+    sections: Dict[Section, List[CommitInfo]] = field(default_factory=dict)
+
+    @property
+    def bump(self) -> Optional[str]:
+        """Version bump required by the commits, or None if no bump is needed."""
+        if self.breaking:
+            return "major"
+        bumps = [section.bump for section, commits in self.sections.items() if commits]
+        return max((bump for bump in bumps if bump is not None), key=BUMP_TYPES.index, default=None)
+
+    def __iter__(self) -> Iterator[Tuple[str, List[CommitInfo]]]:
+        """Iterate over the titles and commits of the non-empty sections, breaking changes first."""
+        if self.breaking:
+            yield BREAKING_CHANGES, self.breaking
+        for section, commits in self.sections.items():
+            if commits:
+                yield section.title, commits
+
+
+def classify_commits(
+    commits: Iterable[CommitInfo], sections: Sequence[Section] = DEFAULT_SECTIONS
+) -> CommitBuckets:
+    """Classify commits into sections in a single pass
+
+    Commits whose type belongs to no section are left out.
+
+    Args:
+        commits: Commits to classify
+        sections: Sections to classify the commits into
+
+    Returns:
+        The classified commits
+    """
+    buckets = CommitBuckets(sections={section: [] for section in sections})
+    by_type = {
+        commit_type: buckets.sections[section]
+        for section in reversed(sections)
+        for commit_type in section.types
+    }
+    for commit in commits:
+        if commit.breaking:
+            buckets.breaking.append(commit)
+        else:
+            bucket = by_type.get(commit.type)
+            if bucket is not None:
+                bucket.append(commit)
+    return buckets
@@ -7,6 +7,9 @@ from dataclasses import dataclass
 from pathlib import Path
 from typing import Any, Dict, Optional
 
+# Git ref that changes are detected against
+DEFAULT_BASE_REF = "origin/main"
+
 
 @dataclass
 class Config:
@@ -14,6 +17,8 @@ class Config:
 
     root_dir: Path
     packages_dir: Path
+    cache_dir: Path
+    base_ref: str = DEFAULT_BASE_REF
     enabled: bool = True
     log_level: str = "INFO"
 
@@ -29,17 +34,26 @@ class Config:
         """
         root_dir = Path(data.get("root_dir", "."))
         packages_dir = root_dir / data.get("packages_dir", "packages")
+        cache_dir = root_dir / data.get("cache_dir", ".poetflow")
+        base_ref = data.get("base_ref", DEFAULT_BASE_REF)
         enabled = data.get("enabled", True)
         log_level = data.get("log_level", "INFO")
 
         return cls(
-            root_dir=root_dir, packages_dir=packages_dir, enabled=enabled, log_level=log_level
+            root_dir=root_dir,
+            packages_dir=packages_dir,
+            cache_dir=cache_dir,
+            base_ref=base_ref,
+            enabled=enabled,
+            log_level=log_level,
         )
 
     def __init__(
         self,
         root_dir: Optional[Path] = None,
         packages_dir: Optional[Path] = None,
+        cache_dir: Optional[Path] = None,
+        base_ref: str = DEFAULT_BASE_REF,
         enabled: bool = True,
         log_level: str = "INFO",
     ):
@@ -48,10 +62,14 @@ class Config:
         Args:
             root_dir: Root directory path
             packages_dir: Packages directory path
+            cache_dir: Directory for PoetFlow's on-disk caches
+            base_ref: Git ref that changes are detected against
             enabled: Whether PoetFlow is enabled
             log_level: Logging level
         """
         self.root_dir = root_dir or Path(".")
         self.packages_dir = packages_dir or self.root_dir / "packages"
+        self.cache_dir = cache_dir or self.root_dir / ".poetflow"
+        self.base_ref = base_ref
         self.enabled = enabled
         self.log_level = log_level
@@ -1,24 +1,86 @@
 """Dependency management module."""
 
-from typing import Dict, List, Set
+from collections import deque
+from pathlib import Path
+from typing import Deque, Dict, FrozenSet, Iterable, List, Optional, Set
 
+from packaging.utils import canonicalize_name
+
+from poetflow.core.changes import ChangeDetector
+from poetflow.core.config import DEFAULT_BASE_REF
+from poetflow.core.graph import GraphSnapshot, dependency_fingerprint
 from poetflow.types.monorepo import MonoRepo
 
 
 class DependencyManager:
     """Manages dependencies between packages."""
 
-    def __init__(self, monorepo: MonoRepo) -> None:
+    def __init__(self, monorepo: MonoRepo, snapshot_path: Optional[Path] = None) -> None:
+        """Initialize dependency manager.
+
+        Args:
+            monorepo: MonoRepo instance
+            snapshot_path: Location of the dependency graph snapshot. If None, the graph is
+                rebuilt every time.
+        """
         self.monorepo = monorepo
+        self.snapshot_path = snapshot_path
         self._dependency_graph: Dict[str, Set[str]] = {}
+        self._reverse_graph: Dict[str, Set[str]] = {}
+        self._dependents_cache: Dict[str, FrozenSet[str]] = {}
         self._build_dependency_graph()
 
     def _build_dependency_graph(self) -> None:
-        """Build dependency graph from packages."""
-        for package in self.monorepo.packages:
-            info = self.monorepo.get_package_info(package)
-            if info:
-                self._dependency_graph[package] = set(info.get("dependencies", []))
+        """Build dependency graph from packages.
+
+        Only dependencies on other monorepo packages become edges. The reverse adjacency index
+        is built in the same pass so dependent queries never scan the whole graph.
+
+        With a snapshot, only packages whose declared dependencies changed since it was written
+        are resolved again. Removed packages are dropped from the edges; when packages were
+        added, every package is resolved again since any of them may depend on the new ones.
+        """
+        packages = self.monorepo.packages
+        snapshot = GraphSnapshot.load(self.snapshot_path) if self.snapshot_path else None
+        if snapshot is not None and not snapshot.index.keys() >= set(packages):
+            snapshot = None
+        names: Optional[Dict[str, str]] = None
+
+        self._dependency_graph = {}
+        self._reverse_graph = {package: set() for package in packages}
+        self._dependents_cache = {}
+        fingerprints: Dict[str, int] = {}
+        changed = snapshot is None or len(snapshot.names) != len(packages)
+
+        for package in packages:
+            info = self.monorepo.get_package_info(package) or {}
+            declared = info.get("dependencies", [])
+            fingerprint = info.get("fingerprint") or dependency_fingerprint(declared)
+            fingerprints[package] = fingerprint
+
+            deps: Optional[Set[str]] = None
+            if snapshot is not None:
+                i = snapshot.index[package]
+                if snapshot.fingerprints[i] == fingerprint:
+                    deps = snapshot.dependencies(package)
+                    if len(snapshot.names) != len(packages):
+                        deps = {dep for dep in deps or () if dep in self._reverse_graph}
+            if deps is None:
+                changed = True
+                if names is None:
+                    names = {canonicalize_name(name): name for name in packages}
+                deps = set()
+                for dep in declared:
+                    target = names.get(canonicalize_name(dep))
+                    if target is not None and target != package:
+                        deps.add(target)
+
+            self._dependency_graph[package] = deps
+            for target in deps:
+                self._reverse_graph[target].add(package)
+
+        if self.snapshot_path and changed:
+            GraphSnapshot.from_graph(self._dependency_graph, fingerprints).save(self.snapshot_path)
 
     def get_dependencies(self, package: str) -> Set[str]:
         """Get direct dependencies of a package
@@ -31,15 +93,64 @@ class DependencyManager:
         """
         return self._dependency_graph.get(package, set())
 
+    def get_direct_dependents(self, package: str) -> Set[str]:
+        """Get packages that directly depend on a package
+
+        Args:
+            package: Package name
+
+        Returns:
+            Set of package names
+        """
+        return set(self._reverse_graph.get(package, set()))
+
     def get_all_dependents(self, package: str) -> Set[str]:
         """Get all packages that depend on this package."""
+        return set(self._transitive_dependents(package))
+
+    def get_dependents_of(self, packages: Iterable[str]) -> Set[str]:
+        """Get all packages that depend on any of the given packages
+
+        Args:
+            packages: Package names, e.g. the packages changed in a commit range
+
+        Returns:
+            Set of transitive dependents. A given package is only included if it depends on
+            another given package.
+        """
         dependents: Set[str] = set()
-        for pkg, deps in self._dependency_graph.items():
-            if package in deps:
-                dependents.add(pkg)
-                dependents.update(self.get_all_dependents(pkg))
+        for package in packages:
+            if package not in dependents:
+                dependents.update(self._transitive_dependents(package))
         return dependents
 
+    def _transitive_dependents(self, package: str) -> FrozenSet[str]:
+        """Collect the transitive dependents of a package with a memoized BFS.
+
+        Every node is expanded at most once per query, and nodes whose closure is already known
+        contribute their memoized result instead of being expanded again.
+        """
+        cached = self._dependents_cache.get(package)
+        if cached is not None:
+            return cached
+
+        seen: Set[str] = set()
+        queue: Deque[str] = deque(self._reverse_graph.get(package, ()))
+        while queue:
+            current = queue.popleft()
+            if current in seen:
+                continue
+            seen.add(current)
+            known = self._dependents_cache.get(current)
+            if known is not None:
+                seen.update(known)
+                continue
+            queue.extend(dep for dep in self._reverse_graph.get(current, ()) if dep not in seen)
+
+        result = frozenset(seen)
+        self._dependents_cache[package] = result
+        return result
+
     def get_build_order(self) -> List[str]:
         """Get packages in dependency order."""
         visited: Set[str] = set()
@@ -58,9 +169,13 @@ class DependencyManager:
 
         return order
 
-    def get_affected_packages(self) -> Set[str]:
-        """Get packages affected by changes."""
-        affected: Set[str] = set()
-        for package in self.monorepo.packages:
-            affected.add(package)
-        return affected
+    def get_affected_packages(self, base_ref: str = DEFAULT_BASE_REF) -> Set[str]:
+        """Get packages affected by changes
+
+        Args:
+            base_ref: Git ref to compare against
+
+        Returns:
+            Packages changed since the ref together with their transitive dependents
+        """
+        return ChangeDetector(self.monorepo, self).get_affected_packages(base_ref)
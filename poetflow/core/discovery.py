@@ -0,0 +1,226 @@
+"""Copyright (C) 2024 Felipe Pimentel <fpimentel88@gmail.com>
+
+This module discovers the packages of a monorepo by scanning for their pyproject.toml files.
+"""
+
+import json
+import logging
+import os
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+from poetflow.core.cache import PYPROJECT as PYPROJECT_NAMESPACE
+from poetflow.core.cache import CacheManager
+from poetflow.core.graph import dependency_fingerprint
+from poetflow.types.discovery import PackageInfo
+from poetflow.utils import toml
+from poetflow.utils.fs import atomic_write_text
+
+logger = logging.getLogger(__name__)
+
+PYPROJECT = "pyproject.toml"
+INDEX_VERSION = 2
+
+# Directories that never contain monorepo packages
+SKIP_DIRS = frozenset({"node_modules", "__pycache__", "build", "dist", "venv"})
+
+
+def parse_pyproject(path: Path) -> Optional[Dict[str, Any]]:
+    """Extract the package metadata PoetFlow needs from a pyproject.toml
+
+    Args:
+        path: Path to the pyproject.toml file
+
+    Returns:
+        Dictionary with name, version, dependency names and their fingerprint, or None if the
+        file does not describe a Poetry package
+    """
+    data = toml.load(path)
+
+    poetry = data.get("tool", {}).get("poetry", {})
+    name = poetry.get("name")
+    if not name:
+        return None
+
+    dependencies: List[str] = []
+    sections = [poetry.get("dependencies", {}), poetry.get("dev-dependencies", {})]
+    sections.extend(group.get("dependencies", {}) for group in poetry.get("group", {}).values())
+    for section in sections:
+        for dep in section:
+            if dep != "python" and dep not in dependencies:
+                dependencies.append(str(dep))
+
+    return {
+        "name": str(name),
+        "version": str(poetry.get("version", "0.0.0")),
+        "dependencies": dependencies,
+        "fingerprint": dependency_fingerprint(dependencies),
+    }
+
+
+class PackageDiscovery:
+    """Discovers packages below a directory.
+
+    Every pyproject.toml found is parsed in a thread pool. The parsed metadata is kept in an
+    on-disk index keyed by each file's mtime and size, so later runs only re-parse the files that
+    changed since the index was written. When a cache is given, parse results are also stored by
+    content hash, so files whose mtime changed without their content changing (e.g. after
+    switching branches) are not parsed again either.
+    """
+
+    def __init__(
+        self,
+        packages_dir: Path,
+        index_path: Optional[Path] = None,
+        max_workers: Optional[int] = None,
+        cache: Optional[CacheManager] = None,
+    ) -> None:
+        """Initialize package discovery.
+
+        Args:
+            packages_dir: Directory to scan for packages
+            index_path: Location of the discovery index. If None, no index is kept.
+            max_workers: Maximum number of parser threads
+            cache: Cache for parsed pyproject data
+        """
+        self.packages_dir = packages_dir
+        self.index_path = index_path
+        self.max_workers = max_workers
+        self.cache = cache
+
+    def discover(self) -> Dict[str, PackageInfo]:
+        """Discover all packages.
+
+        Returns:
+            Mapping of package name to package information
+        """
+        index = self._load_index()
+        found = self._scan()
+
+        entries: Dict[str, Dict[str, Any]] = {}
+        stale: List[Tuple[str, Path, os.stat_result]] = []
+        for key, path, stat in found:
+            cached = index.get(key)
+            if (
+                cached is not None
+                and cached["mtime_ns"] == stat.st_mtime_ns
+                and cached["size"] == stat.st_size
+            ):
+                entries[key] = cached
+            else:
+                stale.append((key, path, stat))
+
+        if stale:
+            logger.debug("Parsing %d of %d pyproject files", len(stale), len(found))
+            with ThreadPoolExecutor(max_workers=self.max_workers) as pool:
+                parsed = pool.map(lambda item: self._parse(item[1]), stale)
+                for (key, _, stat), meta in zip(stale, parsed):
+                    entries[key] = {
+                        "mtime_ns": stat.st_mtime_ns,
+                        "size": stat.st_size,
+                        "meta": meta,
+                    }
+
+        if stale or len(entries) != len(index):
+            self._save_index(entries)
+
+        packages: Dict[str, PackageInfo] = {}
+        for key in sorted(entries):
+            meta = entries[key]["meta"]
+            if meta is None:
+                continue
+            if meta["name"] in packages:
+                logger.warning("Duplicate package %s found in %s", meta["name"], key)
+                continue
+            packages[meta["name"]] = PackageInfo(
+                name=meta["name"],
+                version=meta["version"],
+                path=self.packages_dir / Path(key).parent,
+                dependencies=frozenset(meta["dependencies"]),
+                fingerprint=meta["fingerprint"],
+            )
+        return packages
+
+    def _scan(self) -> List[Tuple[str, Path, os.stat_result]]:
+        """Find every pyproject.toml below the packages directory.
+
+        A directory containing a pyproject.toml is a package root, so its subdirectories are not
+        scanned any further.
+
+        Returns:
+            List of (index key, path, stat result) tuples
+        """
+        found: List[Tuple[str, Path, os.stat_result]] = []
+        if not self.packages_dir.is_dir():
+            return found
+
+        stack = [self.packages_dir]
+        while stack:
+            directory = stack.pop()
+            subdirs: List[Path] = []
+            pyproject: Optional[os.DirEntry[str]] = None
+            try:
+                with os.scandir(directory) as it:
+                    for entry in it:
+                        if entry.name == PYPROJECT and entry.is_file():
+                            pyproject = entry
+                        elif (
+                            entry.is_dir(follow_symlinks=False)
+                            and not entry.name.startswith(".")
+                            and entry.name not in SKIP_DIRS
+                        ):
+                            subdirs.append(Path(entry.path))
+            except OSError as e:
+                logger.warning("Cannot scan %s: %s", directory, e)
+                continue
+
+            if pyproject is not None and directory != self.packages_dir:
+                path = Path(pyproject.path)
+                key = path.relative_to(self.packages_dir).as_posix()
+                found.append((key, path, pyproject.stat()))
+            else:
+                stack.extend(subdirs)
+        return found
+
+    def _parse(self, path: Path) -> Optional[Dict[str, Any]]:
+        """Parse a single pyproject.toml, logging rather than raising on errors."""
+        try:
+            if self.cache is None or not self.cache.enabled:
+                return parse_pyproject(path)
+
+            key = CacheManager.key("discovery", INDEX_VERSION, path.read_bytes())
+            cached = self.cache.get(PYPROJECT_NAMESPACE, key)
+            if cached is not None:
+                meta: Optional[Dict[str, Any]] = cached["meta"]
+                return meta
+            meta = parse_pyproject(path)
+            self.cache.set(PYPROJECT_NAMESPACE, key, {"meta": meta})
+            return meta
+        except Exception as e:
+            logger.warning("Skipping %s: %s", path, e)
+            return None
+
+    def _load_index(self) -> Dict[str, Dict[str, Any]]:
+        """Load the discovery index from disk."""
+        if self.index_path is None or not self.index_path.exists():
+            return {}
+        try:
+            data = json.loads(self.index_path.read_text(encoding="utf-8"))
+        except (OSError, ValueError) as e:
+            logger.debug("Ignoring unreadable discovery index %s: %s", self.index_path, e)
+            return {}
+        if data.get("version") != INDEX_VERSION:
+            return {}
+        entries: Dict[str, Dict[str, Any]] = data.get("entries", {})
+        return entries
+
+    def _save_index(self, entries: Dict[str, Dict[str, Any]]) -> None:
+        """Write the discovery index to disk."""
+        if self.index_path is None:
+            return
+        data = {"version": INDEX_VERSION, "entries": entries}
+        try:
+            atomic_write_text(self.index_path, json.dumps(data, separators=(",", ":")))
+        except OSError as e:
+            logger.debug("Cannot write discovery index %s: %s", self.index_path, e)
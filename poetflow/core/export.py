@@ -0,0 +1,266 @@
+"""Copyright (C) 2024 Felipe Pimentel <fpimentel88@gmail.com>
+
+This module exports pinned requirements of monorepo packages from the shared poetry.lock.
+"""
+
+import logging
+import re
+from pathlib import Path
+from typing import Any, Dict, FrozenSet, Iterable, List, Optional, Set, Tuple
+
+from packaging.utils import canonicalize_name
+
+from poetflow.core.exceptions import PackageError
+from poetflow.core.lock import LockReader
+from poetflow.types.monorepo import DependencyGraph, MonoRepo
+from poetflow.utils import toml
+from poetflow.utils.fs import atomic_write_text
+
+logger = logging.getLogger(__name__)
+
+REQUIREMENTS_SUFFIX = ".requirements.txt"
+
+# Lock entries installed from the working tree rather than from an index
+LOCAL_SOURCES = frozenset({"directory", "file"})
+
+# Name at the start of a requirement string such as "PySocks (>=1.5.6,!=1.5.7)"
+REQUIREMENT_NAME_PATTERN = re.compile(r"^\s*([A-Za-z0-9][A-Za-z0-9._-]*)")
+
+# A requirement edge: dependency name, requested extras and environment marker
+Edge = Tuple[str, Tuple[str, ...], Optional[str]]
+
+# Markers that must all hold for a requirement to be installed through one path to it
+Condition = FrozenSet[str]
+
+
+def _edges(name: str, spec: Any) -> List[Edge]:
+    """Turn a dependency specification into edges, one per constraint.
+
+    Optional dependencies are returned with the marker "optional"; callers decide whether an
+    extra activates them.
+    """
+    specs = spec if isinstance(spec, list) else [spec]
+    edges: List[Edge] = []
+    for item in specs:
+        if not isinstance(item, dict):
+            edges.append((canonicalize_name(name), (), None))
+            continue
+        extras = tuple(sorted(canonicalize_name(extra) for extra in item.get("extras", [])))
+        marker = "optional" if item.get("optional") else item.get("markers")
+        edges.append((canonicalize_name(name), extras, marker))
+    return edges
+
+
+def _join(markers: Iterable[str], operator: str) -> str:
+    """Join markers with a boolean operator, parenthesizing them when there are several."""
+    parts = sorted(markers)
+    if len(parts) == 1:
+        return parts[0]
+    return f" {operator} ".join(f"({part})" for part in parts)
+
+
+def _condition(parent: Condition, marker: Optional[str]) -> Condition:
+    """Extend the condition of a path with the marker of its next edge."""
+    return parent | {marker} if marker else parent
+
+
+class RequirementsExporter:
+    """Exports the locked requirements of monorepo packages.
+
+    The requirements of a package are the main dependencies of the package and of every
+    monorepo package it depends on, transitively, expanded over the shared lock file. The lock
+    file is parsed once per exporter, so exporting every package costs a single parse.
+    """
+
+    def __init__(
+        self,
+        monorepo: MonoRepo,
+        dependency_manager: DependencyGraph,
+        lock: Optional[LockReader] = None,
+        with_hashes: bool = True,
+    ) -> None:
+        """Initialize requirements exporter.
+
+        Args:
+            monorepo: MonoRepo instance
+            dependency_manager: Dependency manager providing in-monorepo dependencies
+            lock: Reader of the shared lock file. Defaults to the monorepo root poetry.lock.
+            with_hashes: Whether to pin the hashes of the locked files
+        """
+        self.monorepo = monorepo
+        self.dependency_manager = dependency_manager
+        self.lock = lock or LockReader(Path(monorepo.root) / "poetry.lock")
+        self.with_hashes = with_hashes
+        self._local = {canonicalize_name(package) for package in monorepo.get_all_packages()}
+        self._declared: Dict[str, List[Edge]] = {}
+
+    def local_closure(self, package: str) -> Set[str]:
+        """Get a package and the monorepo packages it depends on, transitively
+
+        Args:
+            package: Package name
+
+        Returns:
+            Names of the monorepo packages
+        """
+        seen: Set[str] = set()
+        stack = [package]
+        while stack:
+            name = stack.pop()
+            if name in seen:
+                continue
+            seen.add(name)
+            stack.extend(self.dependency_manager.get_dependencies(name) - seen)
+        return seen
+
+    def requirements(self, package: str) -> List[str]:
+        """Get the pinned requirements of a package
+
+        Args:
+            package: Package name
+
+        Returns:
+            Requirement lines in requirements.txt format, sorted by name
+
+        Raises:
+            PackageError: If the package is unknown or a requirement is not in the lock file
+        """
+        if self.monorepo.get_package_info(package) is None:
+            raise PackageError(f"Package {package} not found")
+
+        roots: List[Edge] = []
+        for local in sorted(self.local_closure(package)):
+            roots.extend(self._declared_dependencies(local))
+
+        # A requirement is installed when the markers along any path to it all hold
+        conditions: Dict[str, List[Condition]] = {}
+        extras: Dict[str, Set[str]] = {}
+        queue = [
+            (name, requested, _condition(frozenset(), marker)) for name, requested, marker in roots
+        ]
+        while queue:
+            name, requested, condition = queue.pop()
+            entry = self.lock.get(name)
+            if entry is None:
+                raise PackageError(f"{name} is required by {package} but not locked")
+            known = conditions.setdefault(name, [])
+            active = extras.setdefault(name, set())
+            implied = any(weaker <= condition for weaker in known)
+            new_extras = not active.issuperset(requested)
+            if implied and not new_extras:
+                continue
+            if not implied:
+                # The new condition makes the stronger ones it is implied by redundant
+                known[:] = [other for other in known if not condition <= other]
+                known.append(condition)
+            active.update(requested)
+            # New extras activate more dependencies under every known condition
+            for parent in known if new_extras else [condition]:
+                queue.extend(
+                    (dep, dep_extras, _condition(parent, marker))
+                    for dep, dep_extras, marker in self._locked_edges(entry, active)
+                )
+
+        lines = []
+        for name in sorted(conditions):
+            line = self._format(self.lock.entries[name], conditions[name])
+            if line:
+                lines.append(line)
+        return lines
+
+    def export(self, package: str, output: Path) -> Path:
+        """Write the requirements file of a package
+
+        Args:
+            package: Package name
+            output: Requirements file to write
+
+        Returns:
+            The requirements file
+        """
+        lines = self.requirements(package)
+        atomic_write_text(output, "".join(f"{line}\n" for line in lines))
+        return output
+
+    def export_all(
+        self, output_dir: Path, packages: Optional[Iterable[str]] = None
+    ) -> Dict[str, Path]:
+        """Write the requirements files of several packages
+
+        Args:
+            output_dir: Directory receiving one <package>.requirements.txt file per package
+            packages: Packages to export. Defaults to every package.
+
+        Returns:
+            Requirements file by package name
+        """
+        selected = sorted(packages if packages is not None else self.monorepo.get_all_packages())
+        return {
+            package: self.export(package, output_dir / f"{package}{REQUIREMENTS_SUFFIX}")
+            for package in selected
+        }
+
+    def _declared_dependencies(self, package: str) -> List[Edge]:
+        """Get the third-party main dependencies a monorepo package declares."""
+        cached = self._declared.get(package)
+        if cached is not None:
+            return cached
+
+        info = self.monorepo.get_package_info(package) or {}
+        pyproject = Path(str(info["path"])) / "pyproject.toml"
+        section = toml.load(pyproject).get("tool", {}).get("poetry", {}).get("dependencies", {})
+        edges: List[Edge] = []
+        for name, spec in section.items():
+            if name == "python" or canonicalize_name(name) in self._local:
+                continue
+            # Optional dependencies are only installed through the package's own extras
+            edges.extend(edge for edge in _edges(name, spec) if edge[2] != "optional")
+        self._declared[package] = edges
+        return edges
+
+    def _locked_edges(self, entry: Dict[str, Any], extras: Set[str]) -> List[Edge]:
+        """Get the dependencies of a lock entry that are installed with the given extras."""
+        activated: Set[str] = set()
+        for extra, requirements in entry.get("extras", {}).items():
+            if canonicalize_name(extra) in extras:
+                for requirement in requirements:
+                    match = REQUIREMENT_NAME_PATTERN.match(requirement)
+                    if match:
+                        activated.add(canonicalize_name(match.group(1)))
+
+        edges = []
+        for name, spec in entry.get("dependencies", {}).items():
+            for dep, dep_extras, marker in _edges(name, spec):
+                if marker == "optional":
+                    if dep not in activated:
+                        continue
+                    marker = None
+                edges.append((dep, dep_extras, marker))
+        return edges
+
+    def _format(self, entry: Dict[str, Any], conditions: List[Condition]) -> Optional[str]:
+        """Format the requirement line of a lock entry
+
+        A package reached through any unconditional path is required unconditionally, otherwise
+        it is required when the markers along any of its paths all hold.
+        """
+        name = entry["name"]
+        source = entry.get("source", {})
+        if source.get("type") in LOCAL_SOURCES:
+            logger.debug("Skipping %s, installed from %s", name, source.get("url"))
+            return None
+
+        if source.get("type") == "git":
+            line = f"{name} @ git+{source['url']}@{source.get('resolved_reference', '')}"
+        elif source.get("type") == "url":
+            line = f"{name} @ {source['url']}"
+        else:
+            line = f"{name}=={entry['version']}"
+
+        if all(conditions):
+            line += " ; " + _join((_join(condition, "and") for condition in conditions), "or")
+
+        if self.with_hashes:
+            hashes = sorted(file["hash"] for file in entry.get("files", []) if "hash" in file)
+            line += "".join(f" \\\n    --hash={digest}" for digest in hashes)
+        return line
@@ -0,0 +1,136 @@
+"""Copyright (C) 2024 Felipe Pimentel <fpimentel88@gmail.com>
+
+This module computes content fingerprints of monorepo packages and their inputs.
+"""
+
+import hashlib
+import json
+import os
+from pathlib import Path
+from typing import Dict, List, Optional, Set, Tuple
+
+from packaging.utils import canonicalize_name
+
+from poetflow.core.discovery import PYPROJECT, SKIP_DIRS
+from poetflow.core.lock import LockReader
+from poetflow.types.monorepo import DependencyGraph, MonoRepo
+
+READ_CHUNK_SIZE = 1024 * 1024
+
+
+def hash_file(path: Path) -> str:
+    """Hash the content of a file
+
+    Args:
+        path: File to hash
+
+    Returns:
+        Hex digest of the content
+    """
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        while chunk := f.read(READ_CHUNK_SIZE):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def hash_directory(path: Path) -> str:
+    """Compute a Merkle hash over the files of a package directory
+
+    Hidden files, caches, build outputs and nested packages are not part of the hash.
+
+    Args:
+        path: Package directory
+
+    Returns:
+        Hex digest covering the relative path and content of every file
+    """
+    files: List[Tuple[str, str]] = []
+    stack = [path]
+    while stack:
+        directory = stack.pop()
+        with os.scandir(directory) as it:
+            for entry in it:
+                if entry.name.startswith(".") or entry.name in SKIP_DIRS:
+                    continue
+                if entry.is_dir(follow_symlinks=False):
+                    nested = Path(entry.path)
+                    if not entry.name.endswith(".egg-info") and not (nested / PYPROJECT).exists():
+                        stack.append(nested)
+                elif entry.is_file():
+                    relative = Path(entry.path).relative_to(path).as_posix()
+                    files.append((relative, hash_file(Path(entry.path))))
+
+    digest = hashlib.sha256()
+    for relative, file_hash in sorted(files):
+        digest.update(f"{relative}\0{file_hash}\n".encode())
+    return digest.hexdigest()
+
+
+class PackageFingerprinter:
+    """Computes fingerprints that change whenever anything a package depends on changes.
+
+    A package fingerprint combines the hash of the package's own files, the lock entries of the
+    third-party packages it uses, and the fingerprints of its in-monorepo dependencies, so it
+    forms a Merkle tree over the dependency graph.
+    """
+
+    def __init__(
+        self,
+        monorepo: MonoRepo,
+        dependency_manager: DependencyGraph,
+        lock: Optional[LockReader] = None,
+    ) -> None:
+        """Initialize the fingerprinter.
+
+        Args:
+            monorepo: MonoRepo instance
+            dependency_manager: Dependency manager providing in-monorepo dependencies
+            lock: Reader of the shared lock file. Defaults to the monorepo root poetry.lock.
+        """
+        self.monorepo = monorepo
+        self.dependency_manager = dependency_manager
+        self.lock = lock or LockReader(Path(monorepo.root) / "poetry.lock")
+        self._fingerprints: Dict[str, str] = {}
+
+    def fingerprint(self, package: str) -> str:
+        """Get the fingerprint of a package
+
+        Args:
+            package: Package name
+
+        Returns:
+            Hex digest over the package's inputs
+        """
+        return self._fingerprint(package, set())
+
+    def _fingerprint(self, package: str, visiting: Set[str]) -> str:
+        """Compute a fingerprint, ignoring edges that close a dependency cycle."""
+        cached = self._fingerprints.get(package)
+        if cached is not None:
+            return cached
+
+        info = self.monorepo.get_package_info(package) or {}
+        visiting.add(package)
+        local = self.dependency_manager.get_dependencies(package)
+        dependencies = {
+            dep: self._fingerprint(dep, visiting) if dep not in visiting else "cycle"
+            for dep in sorted(local)
+        }
+        visiting.discard(package)
+
+        local_names = {canonicalize_name(dep) for dep in local}
+        third_party = [
+            dep for dep in info.get("dependencies", []) if canonicalize_name(dep) not in local_names
+        ]
+        locked = {name: self.lock.entries[name] for name in sorted(self.lock.closure(third_party))}
+
+        digest = hashlib.sha256()
+        digest.update(package.encode())
+        if "path" in info:
+            digest.update(hash_directory(Path(str(info["path"]))).encode())
+        digest.update(json.dumps(locked, sort_keys=True, default=str).encode())
+        digest.update(json.dumps(dependencies, sort_keys=True).encode())
+        result = digest.hexdigest()
+        self._fingerprints[package] = result
+        return result
@@ -0,0 +1,175 @@
+"""Copyright (C) 2024 Felipe Pimentel <fpimentel88@gmail.com>
+
+This module stores the package dependency graph in a compact binary snapshot, so that it can be
+reloaded without resolving every declared dependency again.
+"""
+
+import hashlib
+import logging
+import struct
+from array import array
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Set
+
+from poetflow.utils.fs import atomic_write_bytes
+
+logger = logging.getLogger(__name__)
+
+MAGIC = b"PFGS"
+SNAPSHOT_VERSION = 1
+
+# Magic, version, node count, edge count and size of the name table
+HEADER = struct.Struct("<4sIIII")
+
+
+def dependency_fingerprint(dependencies: Iterable[str]) -> int:
+    """Fingerprint the declared dependencies of a package
+
+    Args:
+        dependencies: Declared dependency names, in any order
+
+    Returns:
+        64-bit fingerprint, stable across processes
+    """
+    data = "\0".join(sorted(dependencies)).encode("utf-8")
+    return int.from_bytes(hashlib.blake2b(data, digest_size=8).digest(), "little")
+
+
+class GraphSnapshot:
+    """Array-backed dependency graph with interned package names.
+
+    Nodes are numbered by their position in the name table. The edges of node i are the node
+    numbers in targets[offsets[i]:offsets[i + 1]] (compressed sparse rows), and fingerprints[i]
+    is the dependency fingerprint the edges were resolved from.
+    """
+
+    def __init__(
+        self, names: List[str], fingerprints: array, offsets: array, targets: array
+    ) -> None:
+        """Initialize snapshot.
+
+        Args:
+            names: Package names, indexed by node number
+            fingerprints: Dependency fingerprint of every node
+            offsets: Start of the edges of every node in targets, plus the total edge count
+            targets: Node numbers of the dependencies of every node
+        """
+        self.names = names
+        self.fingerprints = fingerprints
+        self.offsets = offsets
+        self.targets = targets
+        self.index = {name: i for i, name in enumerate(names)}
+
+    @classmethod
+    def from_graph(
+        cls, graph: Dict[str, Set[str]], fingerprints: Dict[str, int]
+    ) -> "GraphSnapshot":
+        """Create a snapshot of a dependency graph
+
+        Args:
+            graph: Direct dependencies by package name
+            fingerprints: Dependency fingerprint by package name
+
+        Returns:
+            The snapshot
+        """
+        names = list(graph)
+        index = {name: i for i, name in enumerate(names)}
+        offsets = array("I", [0])
+        targets = array("I")
+        for name in names:
+            targets.extend(sorted(index[dep] for dep in graph[name]))
+            offsets.append(len(targets))
+        return cls(names, array("Q", (fingerprints[name] for name in names)), offsets, targets)
+
+    def dependencies(self, name: str) -> Optional[Set[str]]:
+        """Get the direct dependencies of a package
+
+        Args:
+            name: Package name
+
+        Returns:
+            Dependency names, or None if the package is not in the snapshot
+        """
+        i = self.index.get(name)
+        if i is None:
+            return None
+        return set(map(self.names.__getitem__, self.targets[self.offsets[i] : self.offsets[i + 1]]))
+
+    def to_bytes(self) -> bytes:
+        """Serialize the snapshot."""
+        name_table = "\0".join(self.names).encode("utf-8")
+        header = HEADER.pack(
+            MAGIC, SNAPSHOT_VERSION, len(self.names), len(self.targets), len(name_table)
+        )
+        return b"".join(
+            (
+                header,
+                name_table,
+                self.fingerprints.tobytes(),
+                self.offsets.tobytes(),
+                self.targets.tobytes(),
+            )
+        )
+
+    @classmethod
+    def from_bytes(cls, data: bytes) -> "GraphSnapshot":
+        """Deserialize a snapshot
+
+        Args:
+            data: Serialized snapshot
+
+        Returns:
+            The snapshot
+
+        Raises:
+            ValueError: If the data is not a valid snapshot of this version
+        """
+        magic, version, nodes, edges, names_size = HEADER.unpack_from(data)
+        if magic != MAGIC or version != SNAPSHOT_VERSION:
+            raise ValueError("not a dependency graph snapshot of this version")
+
+        position = HEADER.size
+        name_table = data[position : position + names_size].decode("utf-8")
+        names = name_table.split("\0") if nodes else []
+        position += names_size
+
+        arrays = []
+        for typecode, count in (("Q", nodes), ("I", nodes + 1), ("I", edges)):
+            values = array(typecode)
+            size = values.itemsize * count
+            values.frombytes(data[position : position + size])
+            position += size
+            arrays.append(values)
+        if len(names) != nodes or position != len(data):
+            raise ValueError("truncated dependency graph snapshot")
+        return cls(names, *arrays)
+
+    @classmethod
+    def load(cls, path: Path) -> Optional["GraphSnapshot"]:
+        """Load a snapshot from disk
+
+        Args:
+            path: Snapshot file
+
+        Returns:
+            The snapshot, or None if it is missing or invalid
+        """
+        try:
+            return cls.from_bytes(path.read_bytes())
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError, struct.error) as e:
+            logger.debug("Ignoring invalid dependency graph snapshot %s: %s", path, e)
+            return None
+
+    def save(self, path: Path) -> None:
+        """Write the snapshot to disk atomically
+
+        Args:
+            path: Snapshot file
+        """
+        try:
+            atomic_write_bytes(path, self.to_bytes())
+        except OSError as e:
+            logger.warning("Cannot write dependency graph snapshot %s: %s", path, e)
@@ -0,0 +1,130 @@
+"""Copyright (C) 2024 Felipe Pimentel <fpimentel88@gmail.com>
+
+This module streams the conventional commits of the monorepo history from git log.
+"""
+
+import io
+import os
+import subprocess
+import tempfile
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Tuple
+
+from poetflow.core.changes import PathTrie
+from poetflow.core.exceptions import MonoRepoError
+from poetflow.types.versioning import CommitInfo
+
+# Every commit starts with a record separator, followed by NUL-separated hash, message and paths
+LOG_FORMAT = "%x1e%H%x00%B"
+RECORD_SEPARATOR = "\x1e"
+READ_CHUNK_SIZE = 64 * 1024
+
+
+def iter_commits(
+    project_root: Path, since_tag: Optional[str] = None
+) -> Iterator[Tuple[CommitInfo, List[str]]]:
+    """Stream conventional commits from git log together with the paths they touched
+
+    Commits that do not follow the conventional format are skipped.
+
+    Args:
+        project_root: Directory of the git checkout
+        since_tag: Tag of the last release; history stops there
+
+    Yields:
+        Each commit, newest first, and the paths it touched relative to the project root
+
+    Raises:
+        MonoRepoError: If git fails, e.g. because the tag does not exist
+    """
+    revision = f"{since_tag}..HEAD" if since_tag else "HEAD"
+    for record in _git_log(project_root, revision):
+        commit_hash, message, *files = record.split("\0")
+        commit = _parse_message(commit_hash, message)
+        if commit is not None:
+            yield commit, [path.lstrip("\n") for path in files if path.strip()]
+
+
+def commits_by_package(
+    project_root: Path, package_paths: Dict[str, Path], since_tag: Optional[str] = None
+) -> Dict[str, List[CommitInfo]]:
+    """Attribute conventional commits to the packages whose files they touched
+
+    History is read once for all packages, so the cost does not grow with the number of
+    packages. A commit touching several packages is attributed to each of them.
+
+    Args:
+        project_root: Directory of the git checkout
+        package_paths: Package directories by package name
+        since_tag: Tag of the last release; only commits after it are included
+
+    Returns:
+        Commits by package name, newest first
+
+    Raises:
+        MonoRepoError: If git fails, e.g. because the tag does not exist
+    """
+    root = project_root.resolve()
+    trie = PathTrie()
+    for package, path in package_paths.items():
+        trie.insert(os.path.relpath(Path(path).resolve(), root), package)
+
+    commits: Dict[str, List[CommitInfo]] = {package: [] for package in package_paths}
+    for commit, files in iter_commits(project_root, since_tag):
+        owners = {trie.find(path) for path in files}
+        owners.discard(None)
+        for owner in owners:
+            commits[str(owner)].append(commit)
+    return commits
+
+
+def _parse_message(commit_hash: str, message: str) -> Optional[CommitInfo]:
+    """Parse a raw commit message, or return None if it is not a conventional commit."""
+    commit = CommitInfo.parse(message, commit_hash)
+    # Headers that are neither conventional nor reverts are parsed with the type "other"
+    return None if commit.type == "other" else commit
+
+
+def _git_log(project_root: Path, revision: str) -> Iterator[str]:
+    """Stream raw git log records without holding the whole history in memory."""
+    # Errors go to a file rather than a pipe: a full stderr pipe would block git while it is
+    # still writing the log we are reading
+    with tempfile.TemporaryFile() as errors:
+        try:
+            process = subprocess.Popen(
+                [
+                    "git",
+                    "log",
+                    "-z",
+                    "--name-only",
+                    "--relative",
+                    f"--format={LOG_FORMAT}",
+                    revision,
+                ],
+                cwd=project_root,
+                stdout=subprocess.PIPE,
+                stderr=errors,
+            )
+        except OSError as e:
+            raise MonoRepoError(f"git log failed: {e}") from e
+        assert process.stdout is not None
+        completed = False
+        try:
+            reader = io.TextIOWrapper(process.stdout, encoding="utf-8", errors="replace")
+            pending = ""
+            while chunk := reader.read(READ_CHUNK_SIZE):
+                records = (pending + chunk).split(RECORD_SEPARATOR)
+                pending = records.pop()
+                yield from filter(None, records)
+            if pending:
+                yield pending
+            completed = True
+        finally:
+            if not completed:
+                process.kill()
+            returncode = process.wait()
+            process.stdout.close()
+        if returncode != 0:
+            errors.seek(0)
+            stderr = errors.read().decode("utf-8", errors="replace")
+            raise MonoRepoError(f"git log failed: {stderr.strip()}")
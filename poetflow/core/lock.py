@@ -0,0 +1,234 @@
+"""Copyright (C) 2024 Felipe Pimentel <fpimentel88@gmail.com>
+
+This module provides read-only access to the shared poetry.lock of the monorepo.
+"""
+
+import hashlib
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from types import MappingProxyType
+from typing import Any, Dict, FrozenSet, Iterable, List, Mapping, Optional, Set
+
+from packaging.utils import canonicalize_name
+
+from poetflow.utils import toml
+
+# Parsed lock files kept in memory, keyed by the hash of their content
+INDEX_CACHE_SIZE = 8
+
+
+class LockIndex:
+    """Parsed poetry.lock with name and reverse-dependency indexes.
+
+    Instances are shared between readers of identical lock files and must not be modified.
+    """
+
+    __slots__ = ("entries", "dependencies", "dependents")
+
+    def __init__(self, packages: Iterable[Dict[str, Any]]) -> None:
+        """Index lock entries.
+
+        Args:
+            packages: The [[package]] entries of a lock file
+        """
+        self.entries: Dict[str, Dict[str, Any]] = {}
+        self.dependencies: Dict[str, FrozenSet[str]] = {}
+        dependents: Dict[str, Set[str]] = {}
+        for entry in packages:
+            name = canonicalize_name(entry["name"])
+            deps = frozenset(canonicalize_name(dep) for dep in entry.get("dependencies", {}))
+            self.entries[name] = entry
+            self.dependencies[name] = deps
+            for dep in deps:
+                dependents.setdefault(dep, set()).add(name)
+        self.dependents: Dict[str, FrozenSet[str]] = {
+            name: frozenset(names) for name, names in dependents.items()
+        }
+
+    @classmethod
+    def parse(cls, content: bytes) -> "LockIndex":
+        """Parse and index the content of a lock file
+
+        Args:
+            content: Lock file content
+
+        Returns:
+            The index
+        """
+        return cls(toml.loads(content.decode("utf-8")).get("package", []))
+
+
+_index_cache: "OrderedDict[str, LockIndex]" = OrderedDict()
+_index_cache_lock = threading.Lock()
+_EMPTY_INDEX = LockIndex([])
+
+
+def load_index(content: bytes) -> LockIndex:
+    """Get the index of a lock file content, parsing it only if it was not seen recently
+
+    Args:
+        content: Lock file content
+
+    Returns:
+        The shared index
+    """
+    key = hashlib.sha256(content).hexdigest()
+    with _index_cache_lock:
+        index = _index_cache.get(key)
+        if index is not None:
+            _index_cache.move_to_end(key)
+            return index
+
+    index = LockIndex.parse(content)
+    with _index_cache_lock:
+        _index_cache[key] = index
+        if len(_index_cache) > INDEX_CACHE_SIZE:
+            _index_cache.popitem(last=False)
+    return index
+
+
+def clear_index_cache() -> None:
+    """Forget every parsed lock file."""
+    with _index_cache_lock:
+        _index_cache.clear()
+
+
+class LockReader:
+    """Read-only view of a poetry.lock file.
+
+    The lock file is parsed on first access with the fast TOML parser and indexed
+    by canonical package name and by reverse dependency. Parsed lock files are shared by
+    content hash, so readers of an unchanged lock file do not parse it again.
+    """
+
+    def __init__(self, path: Path) -> None:
+        """Initialize lock reader.
+
+        Args:
+            path: Path to the poetry.lock file
+        """
+        self.path = path
+        self._index: Optional[LockIndex] = None
+
+    @classmethod
+    def from_content(cls, content: bytes, path: Path = Path("poetry.lock")) -> "LockReader":
+        """Create a reader over lock content that is not on disk, e.g. from a git revision
+
+        Args:
+            content: Lock file content
+            path: Path the content belongs to
+
+        Returns:
+            Lock reader
+        """
+        reader = cls(path)
+        reader._index = load_index(content)
+        return reader
+
+    @property
+    def index(self) -> LockIndex:
+        """Parsed and indexed lock file."""
+        if self._index is None:
+            try:
+                content = self.path.read_bytes()
+            except FileNotFoundError:
+                self._index = _EMPTY_INDEX
+            else:
+                self._index = load_index(content)
+        return self._index
+
+    @property
+    def entries(self) -> Mapping[str, Dict[str, Any]]:
+        """Lock entries by canonical package name."""
+        return MappingProxyType(self.index.entries)
+
+    def get(self, name: str) -> Optional[Dict[str, Any]]:
+        """Get the lock entry of a package
+
+        Args:
+            name: Package name
+
+        Returns:
+            The lock entry, or None if the package is not locked
+        """
+        return self.index.entries.get(canonicalize_name(name))
+
+    def dependencies_of(self, name: str) -> Set[str]:
+        """Get the locked direct dependencies of a package
+
+        Args:
+            name: Package name
+
+        Returns:
+            Canonical names of the dependencies
+        """
+        return set(self.index.dependencies.get(canonicalize_name(name), ()))
+
+    def dependents_of(self, name: str) -> Set[str]:
+        """Get the locked packages depending directly on a package
+
+        Args:
+            name: Package name
+
+        Returns:
+            Canonical names of the dependents
+        """
+        return set(self.index.dependents.get(canonicalize_name(name), ()))
+
+    def closure(self, names: Iterable[str]) -> Set[str]:
+        """Get the packages locked for a set of requirements, including transitive ones
+
+        Args:
+            names: Names of the required packages
+
+        Returns:
+            Canonical names of every locked package reachable from the requirements
+        """
+        return self._walk(names, self.index.dependencies)
+
+    def reverse_closure(self, names: Iterable[str]) -> Set[str]:
+        """Get the locked packages that require any of the given packages, transitively
+
+        Args:
+            names: Package names
+
+        Returns:
+            Canonical names of the given locked packages and everything that depends on them
+        """
+        return self._walk(names, self.index.dependents)
+
+    def requirers(
+        self, names: Iterable[str], requirements: Mapping[str, Iterable[str]]
+    ) -> Set[str]:
+        """Get the projects whose locked requirements include any of the given packages
+
+        This answers questions like "which monorepo packages pull in urllib3" without
+        computing the closure of every project.
+
+        Args:
+            names: Locked package names
+            requirements: Direct requirement names by project name
+
+        Returns:
+            Names of the projects requiring the packages, directly or transitively
+        """
+        pulled_in = self.reverse_closure(names)
+        return {
+            project
+            for project, required in requirements.items()
+            if any(canonicalize_name(name) in pulled_in for name in required)
+        }
+
+    def _walk(self, names: Iterable[str], edges: Mapping[str, FrozenSet[str]]) -> Set[str]:
+        """Collect the locked packages reachable from names over an index."""
+        entries = self.index.entries
+        seen: Set[str] = set()
+        stack: List[str] = [canonicalize_name(name) for name in names]
+        while stack:
+            name = stack.pop()
+            if name in seen or name not in entries:
+                continue
+            seen.add(name)
+            stack.extend(edges.get(name, frozenset()) - seen)
+        return seen
@@ -0,0 +1,186 @@
+"""Copyright (C) 2024 Felipe Pimentel <fpimentel88@gmail.com>
+
+This module records the dependency tables the shared poetry.lock was resolved from, so that
+resolving the monorepo root again can be skipped while they are unchanged.
+"""
+
+import hashlib
+import json
+import logging
+import os
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Mapping, Optional, Tuple
+
+from packaging.utils import canonicalize_name
+
+from poetflow.utils import toml
+from poetflow.utils.fs import atomic_write_text
+
+logger = logging.getLogger(__name__)
+
+LOCK_FILE = "poetry.lock"
+PYPROJECT = "pyproject.toml"
+STATE_VERSION = 1
+
+
+def _normalize_dependencies(section: Mapping[str, Any]) -> Dict[str, Any]:
+    """Key a dependency table by canonical name, so spelling variants compare equal."""
+    return {canonicalize_name(name): spec for name, spec in section.items()}
+
+
+def dependency_tables(data: Mapping[str, Any]) -> Dict[str, Any]:
+    """Extract the parts of a pyproject.toml that the lock file is resolved from
+
+    Args:
+        data: Parsed pyproject.toml
+
+    Returns:
+        Normalized dependency tables, independent of formatting, comments and key order
+    """
+    poetry = data.get("tool", {}).get("poetry", {})
+    project = data.get("project", {})
+    return {
+        "name": canonicalize_name(poetry.get("name") or project.get("name") or ""),
+        "dependencies": _normalize_dependencies(poetry.get("dependencies", {})),
+        "dev-dependencies": _normalize_dependencies(poetry.get("dev-dependencies", {})),
+        "group": {
+            name: _normalize_dependencies(group.get("dependencies", {}))
+            for name, group in poetry.get("group", {}).items()
+        },
+        "extras": {
+            canonicalize_name(extra): sorted(canonicalize_name(dep) for dep in deps)
+            for extra, deps in poetry.get("extras", {}).items()
+        },
+        "source": poetry.get("source", []),
+        "project": {
+            key: project.get(key)
+            for key in ("dependencies", "optional-dependencies", "requires-python")
+        },
+    }
+
+
+def _path_dependencies(pyproject: Path, tables: Mapping[str, Any]) -> List[str]:
+    """Get the pyproject.toml files of the directory dependencies of a project."""
+    sections = [tables["dependencies"], tables["dev-dependencies"], *tables["group"].values()]
+    members = set()
+    for section in sections:
+        for spec in section.values():
+            if isinstance(spec, Mapping) and "path" in spec:
+                member = (pyproject.parent / spec["path"]).resolve() / PYPROJECT
+                if member.is_file():
+                    members.add(str(member))
+    return sorted(members)
+
+
+def _read_inputs(pyproject: Path) -> Tuple[str, List[str]]:
+    """Hash the dependency tables of a pyproject.toml and list the projects it depends on."""
+    tables = dependency_tables(toml.load(pyproject))
+    encoded = json.dumps(tables, sort_keys=True, default=str).encode("utf-8")
+    return hashlib.sha256(encoded).hexdigest(), _path_dependencies(pyproject, tables)
+
+
+class LockState:
+    """Fingerprint of the inputs of the shared lock file, stored next to it.
+
+    The inputs are the dependency tables of the root pyproject.toml and of every project it
+    depends on by path, transitively. Per-file digests are kept with the mtime and size of each
+    file, so checking an unchanged monorepo stats its pyproject files without parsing them.
+    """
+
+    def __init__(self, root: Path) -> None:
+        """Initialize lock state.
+
+        Args:
+            root: Monorepo root directory
+        """
+        self.root = root.resolve()
+        self.lock_path = self.root / LOCK_FILE
+        self.path = self.root / f".{LOCK_FILE}.json"
+
+    def is_fresh(self, covering: Iterable[Path] = ()) -> bool:
+        """Tell whether the lock file was resolved from the current dependency tables
+
+        Only the root and the projects it reaches by path are fingerprinted. A project outside
+        that set can change without making the state stale, so callers that changed a project
+        must pass it in covering.
+
+        Args:
+            covering: pyproject.toml files that must be part of the fingerprint
+
+        Returns:
+            True if the lock file and every dependency table are unchanged since the state was
+            recorded, and every covering file is one of them
+        """
+        stored = self._load()
+        if stored is None:
+            return False
+        try:
+            if self._hash_lock() != stored["lock"]:
+                return False
+            inputs, files = self._inputs(stored["files"])
+        except Exception as e:
+            # Let Poetry report unreadable projects while resolving
+            logger.debug("Cannot fingerprint the lock inputs of %s: %s", self.root, e)
+            return False
+        for pyproject in covering:
+            if os.path.relpath(Path(pyproject).resolve(), self.root) not in files:
+                return False
+        return bool(inputs == stored["inputs"])
+
+    def record(self) -> None:
+        """Record the current lock file and dependency tables as resolved."""
+        stored = self._load()
+        try:
+            inputs, files = self._inputs(stored["files"] if stored else {})
+            state = {
+                "version": STATE_VERSION,
+                "lock": self._hash_lock(),
+                "inputs": inputs,
+                "files": files,
+            }
+            atomic_write_text(self.path, json.dumps(state, indent=2, sort_keys=True))
+        except Exception as e:
+            logger.warning("Cannot record the lock inputs of %s: %s", self.root, e)
+
+    def _load(self) -> Optional[Dict[str, Any]]:
+        """Load the recorded state, or None if it is missing or from another version."""
+        try:
+            state = json.loads(self.path.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return None
+        if not isinstance(state, dict) or state.get("version") != STATE_VERSION:
+            return None
+        return state
+
+    def _hash_lock(self) -> str:
+        """Hash the content of the lock file."""
+        return hashlib.sha256(self.lock_path.read_bytes()).hexdigest()
+
+    def _inputs(self, known: Mapping[str, List[Any]]) -> Tuple[str, Dict[str, List[Any]]]:
+        """Fingerprint the dependency tables of the root and its path dependencies
+
+        Args:
+            known: Previously recorded [mtime, size, digest, members] by relative file path
+
+        Returns:
+            Combined fingerprint, and the entries to record for the files visited
+        """
+        files: Dict[str, List[Any]] = {}
+        stack = [str((self.root / PYPROJECT).resolve())]
+        while stack:
+            pyproject = stack.pop()
+            key = os.path.relpath(pyproject, self.root)
+            if key in files:
+                continue
+            stat = os.stat(pyproject)
+            entry = known.get(key)
+            if entry is None or entry[:2] != [stat.st_mtime_ns, stat.st_size]:
+                digest, members = _read_inputs(Path(pyproject))
+                # Members are recorded relative to the root, so moving the checkout keeps them
+                relative = sorted(os.path.relpath(member, self.root) for member in members)
+                entry = [stat.st_mtime_ns, stat.st_size, digest, relative]
+            files[key] = entry
+            stack.extend(str((self.root / member).resolve()) for member in entry[3])
+
+        combined = "\n".join(f"{key}\0{files[key][2]}" for key in sorted(files))
+        return hashlib.sha256(combined.encode("utf-8")).hexdigest(), files
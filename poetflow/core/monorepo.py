@@ -1,12 +1,15 @@
 """Monorepo management."""
 
+import dataclasses
 from pathlib import Path
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Mapping, Optional, Set
 
+from poetflow.core.cache import CacheManager
 from poetflow.core.config import Config
 from poetflow.core.dependencies import DependencyManager
+from poetflow.core.discovery import PackageDiscovery
 from poetflow.core.versioning import VersionManager
-from poetflow.types.discovery import PackageInfo
+from poetflow.types.discovery import PackageInfo, PackageInfoView
 from poetflow.types.monorepo import MonoRepo as MonoRepoProtocol
 
 
@@ -17,15 +20,34 @@ class MonoRepo(MonoRepoProtocol):
         """Initialize monorepo."""
         self.root_path: Path = config.root_dir
         self.config: Config = config
-        self.version_manager: VersionManager = VersionManager(self)
-        self.dependency_manager: DependencyManager = DependencyManager(self)
+        self.cache: CacheManager = CacheManager(config.cache_dir / "cache")
         self._packages: Dict[str, PackageInfo] = {}
+        self._views: Dict[str, PackageInfoView] = {}
+        self.version_manager: VersionManager
+        self.dependency_manager: DependencyManager
+        self.reload()
+
+    def reload(self) -> None:
+        """Reload packages and their dependency graph from disk.
+
+        Unchanged packages are taken from the discovery index and the graph snapshot, so a reload
+        only parses and resolves what changed since the last one.
+        """
         self._load_packages()
+        self.version_manager = VersionManager(self)
+        self.dependency_manager = DependencyManager(
+            self, snapshot_path=self.config.cache_dir / "graph.bin"
+        )
 
     def _load_packages(self) -> None:
         """Load packages from disk."""
-        # Implementation here
-        pass
+        discovery = PackageDiscovery(
+            self.config.packages_dir,
+            index_path=self.config.cache_dir / "discovery.json",
+            cache=self.cache,
+        )
+        self._packages = discovery.discover()
+        self._views = {name: PackageInfoView(info) for name, info in self._packages.items()}
 
     @property
     def root(self) -> str:
@@ -41,14 +63,42 @@ class MonoRepo(MonoRepoProtocol):
         """Get all packages."""
         return self.packages
 
-    def get_package_info(self, name: str) -> Optional[Dict[str, Any]]:
-        """Get package information."""
-        pkg = self._packages.get(name)
-        if not pkg:
-            return None
-        return {
-            "name": pkg.name,
-            "version": pkg.version,
-            "path": str(pkg.path),
-            "dependencies": list(pkg.dependencies),
-        }
+    def get_affected_packages(self, base_ref: Optional[str] = None) -> Set[str]:
+        """Get packages affected by changes since a git ref.
+
+        Args:
+            base_ref: Git ref to compare against. Defaults to the configured base ref.
+        """
+        return self.dependency_manager.get_affected_packages(base_ref or self.config.base_ref)
+
+    def get_build_order(self) -> List[str]:
+        """Get all packages in dependency order."""
+        return self.dependency_manager.get_build_order()
+
+    def get_dependencies(self, package: str) -> Set[str]:
+        """Get the monorepo packages a package depends on directly."""
+        return self.dependency_manager.get_dependencies(package)
+
+    def get_package_path(self, package: str) -> Optional[str]:
+        """Get the path to a package."""
+        pkg = self._packages.get(package)
+        return str(pkg.path) if pkg else None
+
+    def set_package_versions(self, versions: Mapping[str, str]) -> None:
+        """Record package versions written to disk, without discovering the packages again.
+
+        Args:
+            versions: New version by package name
+        """
+        for name, version in versions.items():
+            info = dataclasses.replace(self._packages[name], version=version)
+            self._packages[name] = info
+            self._views[name] = PackageInfoView(info)
+
+    def get_package_info(self, name: str) -> Optional[Mapping[str, Any]]:
+        """Get package information.
+
+        Returns:
+            A read-only view of the package information, or None if the package is unknown
+        """
+        return self._views.get(name)
@@ -3,27 +3,43 @@
 This module handles semantic versioning and changelog generation for packages in the monorepo.
 """
 
+import re
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 from pathlib import Path
-from typing import Any, Dict, List, Optional, TypeVar, Union
+from typing import Any, Dict, List, Optional, Sequence, TypeVar, Union
 
+from packaging.utils import canonicalize_name
 from tomlkit.container import Container
 from tomlkit.items import Item, Table
 
+from poetflow.core.commits import DEFAULT_SECTIONS, Section, classify_commits
 from poetflow.core.exceptions import PackageError
 from poetflow.types.monorepo import MonoRepo
-from poetflow.types.tomlkit import dumps, parse, table
+from poetflow.types.tomlkit import TOMLDocument, dumps, parse, table
 from poetflow.types.versioning import CommitInfo
+from poetflow.utils.fs import atomic_write_text
 
 TOMLValue = Union[str, int, float, bool, Dict[str, Any], List[Any], Item, Container]
 TOMLMapping = Dict[str, TOMLValue]
 
 T = TypeVar("T")
 
+# A constraint made of a single clause, e.g. "^1.2.0", ">=1.2" or "1.2.0"
+CONSTRAINT_PATTERN = re.compile(r"^(?P<operator>\^|~=|~|>=|==|=)?\s*\d+(?:\.\d+)*$")
+
 
 class ChangelogGenerator:
     """Generates changelogs from commit information"""
 
+    def __init__(self, sections: Sequence[Section] = DEFAULT_SECTIONS) -> None:
+        """Initialize changelog generator
+
+        Args:
+            sections: Sections listed in changelog entries, after breaking changes
+        """
+        self.sections = sections
+
     def generate_markdown(self, version: str, commits: List[CommitInfo]) -> str:
         """Generate markdown changelog
 
@@ -41,29 +57,9 @@ class ChangelogGenerator:
             "",
         ]
 
-        # Add breaking changes
-        breaking = [c for c in commits if c.breaking]
-        if breaking:
-            lines.extend(["### Breaking Changes", ""])
-            for commit in breaking:
-                scope = f"**{commit.scope}:** " if commit.scope else ""
-                lines.append(f"- {scope}{commit.message}")
-            lines.append("")
-
-        # Add features
-        features = [c for c in commits if c.type == "feat" and not c.breaking]
-        if features:
-            lines.extend(["### Features", ""])
-            for commit in features:
-                scope = f"**{commit.scope}:** " if commit.scope else ""
-                lines.append(f"- {scope}{commit.message}")
-            lines.append("")
-
-        # Add fixes
-        fixes = [c for c in commits if c.type == "fix" and not c.breaking]
-        if fixes:
-            lines.extend(["### Bug Fixes", ""])
-            for commit in fixes:
+        for title, section in classify_commits(commits, self.sections):
+            lines.extend([f"### {title}", ""])
+            for commit in section:
                 scope = f"**{commit.scope}:** " if commit.scope else ""
                 lines.append(f"- {scope}{commit.message}")
             lines.append("")
@@ -74,13 +70,15 @@ class ChangelogGenerator:
 class VersionManager:
     """Manages versioning for packages"""
 
-    def __init__(self, monorepo: MonoRepo) -> None:
+    def __init__(self, monorepo: MonoRepo, sections: Sequence[Section] = DEFAULT_SECTIONS) -> None:
         """Initialize version manager
 
         Args:
             monorepo: MonoRepo instance
+            sections: Sections whose commits cause a version bump
         """
         self.monorepo = monorepo
+        self.sections = sections
 
     def _bump_major(self, version: str) -> str:
         major, _, _ = version.split(".")
@@ -112,22 +110,44 @@ class VersionManager:
             raise PackageError(f"Package {package} not found")
 
         current = str(pkg_info["version"])
-        breaking_changes = [c for c in commits if c.breaking]
-        features = [c for c in commits if c.type == "feat"]
-        fixes = [c for c in commits if c.type == "fix"]
-
-        if breaking_changes:
+        bump = classify_commits(commits, self.sections).bump
+        if bump == "major":
             return self._bump_major(current)
-        elif features:
+        elif bump == "minor":
             return self._bump_minor(current)
-        elif fixes:
+        elif bump == "patch":
             return self._bump_patch(current)
 
         return current
 
+    def get_next_versions(self, commits: Dict[str, List[CommitInfo]]) -> Dict[str, str]:
+        """Get the next version of every package that needs a bump
+
+        Args:
+            commits: Commits by package name
+
+        Returns:
+            New version by package name, for packages whose version changes
+
+        Raises:
+            PackageError: If a package is not found
+        """
+        bumps: Dict[str, str] = {}
+        for package, package_commits in commits.items():
+            pkg_info = self.monorepo.get_package_info(package)
+            if not pkg_info:
+                raise PackageError(f"Package {package} not found")
+            version = self.get_next_version(package, package_commits)
+            if version != str(pkg_info["version"]):
+                bumps[package] = version
+        return bumps
+
     def update_version(self, package: str, version: str) -> None:
         """Update package version
 
+        Only the pyproject.toml of the package is written; constraints on the package in other
+        packages are left alone. Use update_versions to rewrite them too.
+
         Args:
             package: Package name
             version: New version
@@ -135,16 +155,74 @@ class VersionManager:
         Raises:
             PackageError: If package not found or if TOML structure is invalid
         """
-        pkg_info = self.monorepo.get_package_info(package)
-        if not pkg_info:
-            raise PackageError(f"Package {package} not found")
+        self.update_versions({package: version}, rewrite_constraints=False)
+
+    def update_versions(
+        self,
+        versions: Dict[str, str],
+        max_workers: Optional[int] = None,
+        rewrite_constraints: bool = True,
+    ) -> List[Path]:
+        """Update the versions of several packages in a single write pass
+
+        Besides the version of every bumped package, version constraints on the bumped packages
+        in the other packages of the monorepo are rewritten to the new versions, unless
+        rewrite_constraints is False. Every affected pyproject.toml is parsed and written exactly
+        once, in a thread pool, and replaced atomically. The package information of the monorepo
+        is updated to the new versions afterwards.
+
+        Args:
+            versions: New version by package name
+            max_workers: Maximum number of writer threads
+            rewrite_constraints: Whether to rewrite constraints on the bumped packages
 
-        pkg_path = Path(str(pkg_info["path"]))
-        pyproject_path = pkg_path / "pyproject.toml"
+        Returns:
+            Paths of the rewritten pyproject.toml files
 
-        with open(pyproject_path) as f:
-            pyproject = parse(f.read())
+        Raises:
+            PackageError: If a package is not found or if a TOML structure is invalid
+        """
+        bumped: Dict[str, str] = {}
+        for package in versions:
+            if not self.monorepo.get_package_info(package):
+                raise PackageError(f"Package {package} not found")
+            bumped[canonicalize_name(package)] = versions[package]
+
+        # Collect the edits of every file first, so each one is written once
+        edits: Dict[str, Optional[str]] = {}
+        for package in self.monorepo.packages:
+            pkg_info = self.monorepo.get_package_info(package)
+            if not pkg_info:
+                continue
+            refers = rewrite_constraints and any(
+                canonicalize_name(dep) in bumped for dep in pkg_info.get("dependencies", [])
+            )
+            if package in versions or refers:
+                edits[str(pkg_info["path"])] = versions.get(package)
+
+        def rewrite(path: str) -> Path:
+            pyproject_path = Path(path) / "pyproject.toml"
+            with open(pyproject_path) as f:
+                pyproject = parse(f.read())
+            version = edits[path]
+            if version is not None:
+                self._poetry_section(pyproject)["version"] = version
+            if rewrite_constraints:
+                self._rewrite_constraints(pyproject, bumped)
+            atomic_write_text(pyproject_path, dumps(pyproject))
+            return pyproject_path
+
+        with ThreadPoolExecutor(max_workers=max_workers) as pool:
+            written = list(pool.map(rewrite, sorted(edits)))
+        self.monorepo.set_package_versions(versions)
+        return written
+
+    def _poetry_section(self, pyproject: TOMLDocument) -> Table:
+        """Get the tool.poetry table of a pyproject, creating it if needed
 
+        Raises:
+            PackageError: If the TOML structure is invalid
+        """
         # Create tool.poetry section if it doesn't exist
         if "tool" not in pyproject:
             tool_table = table()
@@ -163,8 +241,39 @@ class VersionManager:
             raise PackageError(
                 "Invalid pyproject.toml: 'tool.poetry' section is missing or invalid"
             )
+        return poetry_section
 
-        poetry_section["version"] = version
+    def _rewrite_constraints(self, pyproject: TOMLDocument, bumped: Dict[str, str]) -> None:
+        """Point version constraints on bumped packages at their new versions.
 
-        with open(pyproject_path, "w") as f:
-            f.write(dumps(pyproject))
+        Path dependencies without a version are left alone, as are constraints with several
+        clauses, which cannot be rewritten without guessing the intent.
+        """
+        poetry_section = self._poetry_section(pyproject)
+        sections: List[Any] = [
+            poetry_section.get("dependencies"),
+            poetry_section.get("dev-dependencies"),
+        ]
+        groups: Any = poetry_section.get("group", {})
+        sections.extend(group.get("dependencies") for group in groups.values())
+
+        for section in sections:
+            if not section:
+                continue
+            for name in list(section.keys()):
+                version = bumped.get(canonicalize_name(name))
+                if version is None:
+                    continue
+                spec = section[name]
+                if isinstance(spec, str):
+                    section[name] = self._rewrite_constraint(spec, version)
+                elif isinstance(spec, dict) and isinstance(spec.get("version"), str):
+                    spec["version"] = self._rewrite_constraint(spec["version"], version)
+
+    @staticmethod
+    def _rewrite_constraint(constraint: str, version: str) -> str:
+        """Replace the version of a single clause constraint, keeping its operator."""
+        match = CONSTRAINT_PATTERN.match(constraint.strip())
+        if not match:
+            return constraint
+        return f"{match.group('operator') or ''}{version}"
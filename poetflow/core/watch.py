@@ -0,0 +1,613 @@
+"""Copyright (C) 2024 Felipe Pimentel <fpimentel88@gmail.com>
+
+This module keeps the monorepo model in memory, refreshes it when package files change and
+answers queries about it over a local Unix socket.
+"""
+
+import ctypes
+import ctypes.util
+import errno
+import json
+import logging
+import os
+import select
+import socket
+import socketserver
+import struct
+import threading
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Mapping, Optional, Protocol, Set, Tuple, TypeVar
+
+from poetflow.core.cache import CacheManager
+from poetflow.core.config import Config
+from poetflow.core.discovery import PYPROJECT, SKIP_DIRS
+from poetflow.core.exceptions import MonoRepoError
+from poetflow.core.monorepo import MonoRepo
+
+__all__ = [
+    "InotifyWatcher",
+    "PollingWatcher",
+    "WatchClient",
+    "WatchService",
+    "WatchedMonoRepo",
+    "create_watcher",
+    "running_service",
+]
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+SOCKET_NAME = "watch.sock"
+
+# Files whose changes invalidate the model
+WATCHED_FILES = frozenset({PYPROJECT, "poetry.lock"})
+
+DEFAULT_POLL_INTERVAL = 1.0
+
+# inotify(7) constants
+IN_MODIFY = 0x00000002
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_FROM = 0x00000040
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_DELETE = 0x00000200
+IN_DELETE_SELF = 0x00000400
+IN_ISDIR = 0x40000000
+WATCH_MASK = IN_MODIFY | IN_CLOSE_WRITE | IN_MOVED_FROM | IN_MOVED_TO | IN_CREATE | IN_DELETE
+INOTIFY_EVENT = struct.Struct("iIII")
+
+
+class Watcher(Protocol):
+    """Reports changes to the files the monorepo model is built from."""
+
+    def wait(self, timeout: float) -> bool:
+        """Wait for changes
+
+        Args:
+            timeout: Maximum time to wait, in seconds
+
+        Returns:
+            Whether relevant files changed
+        """
+        ...
+
+    def close(self) -> None:
+        """Release the watcher's resources."""
+        ...
+
+
+def _package_dirs(packages_dir: Path) -> List[Path]:
+    """List the directories below the packages directory that may contain packages."""
+    dirs = []
+    stack = [packages_dir]
+    while stack:
+        directory = stack.pop()
+        dirs.append(directory)
+        try:
+            with os.scandir(directory) as it:
+                for entry in it:
+                    if (
+                        entry.is_dir(follow_symlinks=False)
+                        and not entry.name.startswith(".")
+                        and entry.name not in SKIP_DIRS
+                    ):
+                        stack.append(Path(entry.path))
+        except OSError:
+            continue
+    return dirs
+
+
+class PollingWatcher:
+    """Detects changes by comparing the mtime and size of the watched files."""
+
+    def __init__(self, root_dir: Path, packages_dir: Path) -> None:
+        """Initialize polling watcher.
+
+        Args:
+            root_dir: Monorepo root directory
+            packages_dir: Directory containing the packages
+        """
+        self.root_dir = root_dir
+        self.packages_dir = packages_dir
+        self._stopped = threading.Event()
+        self._state = self._snapshot()
+
+    def _snapshot(self) -> Dict[str, Tuple[int, int]]:
+        """Stat every watched file."""
+        state = {}
+        for directory in [self.root_dir, *_package_dirs(self.packages_dir)]:
+            for name in WATCHED_FILES:
+                try:
+                    stat = os.stat(directory / name)
+                except OSError:
+                    continue
+                state[str(directory / name)] = (stat.st_mtime_ns, stat.st_size)
+        return state
+
+    def wait(self, timeout: float) -> bool:
+        """Wait for changes, polling once per call."""
+        if self._stopped.wait(timeout):
+            return False
+        state = self._snapshot()
+        changed = state != self._state
+        self._state = state
+        return changed
+
+    def close(self) -> None:
+        """Stop waiting."""
+        self._stopped.set()
+
+
+class InotifyWatcher:
+    """Detects changes through Linux inotify, without scanning the tree."""
+
+    def __init__(self, root_dir: Path, packages_dir: Path) -> None:
+        """Initialize inotify watcher.
+
+        Args:
+            root_dir: Monorepo root directory
+            packages_dir: Directory containing the packages
+
+        Raises:
+            OSError: If inotify is not available
+        """
+        library = ctypes.util.find_library("c")
+        libc = ctypes.CDLL(library or "libc.so.6", use_errno=True)
+        if not hasattr(libc, "inotify_init1"):
+            raise OSError(errno.ENOSYS, "inotify is not available")
+        self._libc = libc
+        self._fd = libc.inotify_init1(os.O_NONBLOCK | os.O_CLOEXEC)
+        if self._fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 failed")
+        self._dirs: Dict[int, Path] = {}
+        self._add_watch(root_dir)
+        for directory in _package_dirs(packages_dir):
+            self._add_watch(directory)
+
+    def _add_watch(self, directory: Path) -> None:
+        """Watch a single directory."""
+        wd = self._libc.inotify_add_watch(self._fd, os.fsencode(directory), WATCH_MASK)
+        if wd < 0:
+            logger.debug("Cannot watch %s: %s", directory, os.strerror(ctypes.get_errno()))
+            return
+        self._dirs[wd] = directory
+
+    def wait(self, timeout: float) -> bool:
+        """Wait for inotify events and report whether any concerns the watched files."""
+        try:
+            readable, _, _ = select.select([self._fd], [], [], timeout)
+        except (OSError, ValueError):
+            # The watcher was closed
+            return False
+        if not readable:
+            return False
+
+        changed = False
+        while True:
+            try:
+                data = os.read(self._fd, 64 * 1024)
+            except BlockingIOError:
+                break
+            except OSError:
+                return changed
+            offset = 0
+            while offset < len(data):
+                wd, mask, _, length = INOTIFY_EVENT.unpack_from(data, offset)
+                offset += INOTIFY_EVENT.size
+                name = os.fsdecode(data[offset : offset + length].rstrip(b"\0"))
+                offset += length
+                changed |= self._handle_event(wd, mask, name)
+        return changed
+
+    def _handle_event(self, wd: int, mask: int, name: str) -> bool:
+        """Update the watches for an event and tell whether it is relevant."""
+        directory = self._dirs.get(wd)
+        if mask & IN_DELETE_SELF:
+            self._dirs.pop(wd, None)
+            return True
+        if directory is None:
+            return False
+        if mask & IN_ISDIR:
+            if name.startswith(".") or name in SKIP_DIRS:
+                return False
+            if mask & (IN_CREATE | IN_MOVED_TO):
+                for subdir in _package_dirs(directory / name):
+                    self._add_watch(subdir)
+            return True
+        return name in WATCHED_FILES
+
+    def close(self) -> None:
+        """Release the inotify file descriptor."""
+        if self._fd >= 0:
+            os.close(self._fd)
+            self._fd = -1
+
+
+def create_watcher(root_dir: Path, packages_dir: Path, polling: bool = False) -> Watcher:
+    """Create the best available watcher
+
+    Args:
+        root_dir: Monorepo root directory
+        packages_dir: Directory containing the packages
+        polling: Whether to use polling even if inotify is available
+
+    Returns:
+        An inotify watcher where supported, a polling watcher otherwise
+    """
+    if not polling:
+        try:
+            return InotifyWatcher(root_dir, packages_dir)
+        except (OSError, AttributeError) as e:
+            logger.info("Falling back to polling for changes: %s", e)
+    return PollingWatcher(root_dir, packages_dir)
+
+
+class _RequestHandler(socketserver.StreamRequestHandler):
+    """Answers one JSON request per connection."""
+
+    server: "_UnixServer"
+
+    def handle(self) -> None:
+        try:
+            request = json.loads(self.rfile.readline())
+            result = self.server.service.handle(request["command"], **request.get("args", {}))
+            response: Dict[str, Any] = {"ok": True, "result": result}
+        except Exception as e:
+            response = {"ok": False, "error": str(e)}
+        self.wfile.write(json.dumps(response).encode("utf-8") + b"\n")
+
+
+class _UnixServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    daemon_threads = True
+
+    def __init__(self, path: str, service: "WatchService") -> None:
+        self.service = service
+        super().__init__(path, _RequestHandler)
+
+
+class WatchService:
+    """Keeps a monorepo model hot and serves queries about it over a Unix socket.
+
+    The model is refreshed when the watcher reports changes. Refreshing reuses the discovery
+    index and the dependency graph snapshot, so only changed packages are parsed and resolved.
+    """
+
+    def __init__(
+        self,
+        monorepo: MonoRepo,
+        watcher: Optional[Watcher] = None,
+        socket_path: Optional[Path] = None,
+        poll_interval: float = DEFAULT_POLL_INTERVAL,
+    ) -> None:
+        """Initialize watch service.
+
+        Args:
+            monorepo: MonoRepo to keep in memory
+            watcher: Change watcher. Defaults to the best available one.
+            socket_path: Socket to serve on. Defaults to watch.sock in the cache directory.
+            poll_interval: Maximum time between checks for changes, in seconds
+        """
+        config = monorepo.config
+        self.monorepo = monorepo
+        self.watcher = watcher or create_watcher(config.root_dir, config.packages_dir)
+        self.socket_path = socket_path or config.cache_dir / SOCKET_NAME
+        self.poll_interval = poll_interval
+        self.generation = 0
+        self._lock = threading.RLock()
+        self._stopped = threading.Event()
+        self._server: Optional[_UnixServer] = None
+        self._handlers: Dict[str, Callable[..., Any]] = {
+            "ping": lambda: "pong",
+            "status": self._status,
+            "packages": self._packages,
+            "dependencies": lambda package: sorted(
+                self.monorepo.dependency_manager.get_dependencies(package)
+            ),
+            "dependents": lambda package: sorted(
+                self.monorepo.dependency_manager.get_all_dependents(package)
+            ),
+            "build-order": lambda: self.monorepo.dependency_manager.get_build_order(),
+            "affected": lambda base_ref=None: sorted(self.monorepo.get_affected_packages(base_ref)),
+            "shutdown": self.shutdown,
+        }
+
+    def handle(self, command: str, **args: Any) -> Any:
+        """Answer a query against the current model
+
+        Args:
+            command: Query name
+            **args: Query arguments
+
+        Returns:
+            JSON-serializable result
+
+        Raises:
+            MonoRepoError: If the command is unknown
+        """
+        handler = self._handlers.get(command)
+        if handler is None:
+            raise MonoRepoError(f"Unknown watch command {command!r}")
+        with self._lock:
+            return handler(**args)
+
+    def refresh(self) -> None:
+        """Reload the model from disk."""
+        with self._lock:
+            self.monorepo.reload()
+            self.generation += 1
+        self._warm_root_poetry()
+        logger.info("Reloaded %d packages", len(self.monorepo.packages))
+
+    def serve_forever(self) -> None:
+        """Serve queries until shut down, refreshing the model on changes
+
+        Raises:
+            MonoRepoError: If another watch service already serves the socket
+        """
+        self._bind()
+        assert self._server is not None
+        server_thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        server_thread.start()
+        self._warm_root_poetry()
+        try:
+            while not self._stopped.is_set():
+                if self.watcher.wait(self.poll_interval) and not self._stopped.is_set():
+                    self.refresh()
+        finally:
+            self._server.shutdown()
+            self._server.server_close()
+            self.watcher.close()
+            try:
+                self.socket_path.unlink()
+            except FileNotFoundError:
+                pass
+
+    def shutdown(self) -> str:
+        """Stop serving."""
+        self._stopped.set()
+        self.watcher.close()
+        return "stopping"
+
+    def _bind(self) -> None:
+        """Bind the socket, replacing a stale one left by a crashed service."""
+        if self.socket_path.exists():
+            if WatchClient(self.socket_path).is_running():
+                raise MonoRepoError(f"A watch service is already running on {self.socket_path}")
+            self.socket_path.unlink()
+        self.socket_path.parent.mkdir(parents=True, exist_ok=True)
+        self._server = _UnixServer(str(self.socket_path), self)
+
+    def _warm_root_poetry(self) -> None:
+        """Load the root Poetry project, so plugins in this process reuse it."""
+        if not (self.monorepo.root_path / PYPROJECT).exists():
+            return
+        try:
+            from poetflow.plugins.root_poetry import get_root_poetry
+
+            get_root_poetry(self.monorepo.root_path)
+        except Exception as e:
+            logger.warning("Cannot load the root Poetry project: %s", e)
+
+    def _status(self) -> Dict[str, Any]:
+        return {
+            "pid": os.getpid(),
+            "generation": self.generation,
+            "packages": len(self.monorepo.packages),
+            "watcher": type(self.watcher).__name__,
+        }
+
+    def _packages(self) -> List[Dict[str, Any]]:
+        packages = []
+        for package in self.monorepo.packages:
+            info = self.monorepo.get_package_info(package) or {}
+            packages.append(
+                {
+                    "name": package,
+                    "version": info.get("version"),
+                    "path": info.get("path"),
+                    "dependencies": sorted(info.get("dependencies", ())),
+                }
+            )
+        return packages
+
+
+class WatchClient:
+    """Sends queries to a running watch service."""
+
+    def __init__(self, socket_path: Path, timeout: float = 10.0) -> None:
+        """Initialize watch client.
+
+        Args:
+            socket_path: Socket the service listens on
+            timeout: Maximum time to wait for an answer, in seconds
+        """
+        self.socket_path = socket_path
+        self.timeout = timeout
+
+    def request(self, command: str, **args: Any) -> Any:
+        """Send a query
+
+        Args:
+            command: Query name
+            **args: Query arguments
+
+        Returns:
+            The query result
+
+        Raises:
+            ConnectionError: If no service is listening
+            MonoRepoError: If the service failed to answer the query
+        """
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+            sock.settimeout(self.timeout)
+            try:
+                sock.connect(str(self.socket_path))
+            except (FileNotFoundError, ConnectionRefusedError) as e:
+                raise ConnectionError(f"No watch service on {self.socket_path}") from e
+            sock.sendall(json.dumps({"command": command, "args": args}).encode("utf-8") + b"\n")
+            with sock.makefile("rb") as f:
+                line = f.readline()
+        if not line:
+            raise ConnectionError("The watch service closed the connection")
+        response = json.loads(line)
+        if not response["ok"]:
+            raise MonoRepoError(response["error"])
+        return response["result"]
+
+    def is_running(self) -> bool:
+        """Tell whether a service answers on the socket."""
+        try:
+            return bool(self.request("ping") == "pong")
+        except (OSError, ValueError, MonoRepoError):
+            return False
+
+
+def running_service(socket_path: Path) -> Optional[WatchClient]:
+    """Get a client for the watch service, if one is running
+
+    Args:
+        socket_path: Socket the service would listen on
+
+    Returns:
+        A client, or None if no service is running
+    """
+    if not socket_path.exists():
+        return None
+    client = WatchClient(socket_path)
+    return client if client.is_running() else None
+
+
+class WatchedMonoRepo:
+    """Monorepo manager answering from the running watch service, if there is one.
+
+    Without a service, or once it stops answering, queries are answered by an in-process
+    MonoRepo. That model is only built on first use, so commands served by the watch service
+    do not discover packages or resolve the dependency graph themselves.
+    """
+
+    def __init__(self, config: Config, client: Optional[WatchClient] = None) -> None:
+        """Initialize watched monorepo.
+
+        Args:
+            config: Monorepo configuration
+            client: Client of the watch service, or None to answer everything in-process
+        """
+        self.config = config
+        self.client = client
+        self.cache = CacheManager(config.cache_dir / "cache")
+        self._local: Optional[MonoRepo] = None
+        self._package_table: Optional[Dict[str, Mapping[str, Any]]] = None
+
+    @classmethod
+    def connect(cls, config: Config) -> "WatchedMonoRepo":
+        """Create a manager using the watch service of the monorepo when it is running
+
+        Args:
+            config: Monorepo configuration
+
+        Returns:
+            The manager
+        """
+        return cls(config, running_service(config.cache_dir / SOCKET_NAME))
+
+    @property
+    def local(self) -> MonoRepo:
+        """In-process monorepo model, built on first use."""
+        if self._local is None:
+            self._local = MonoRepo(self.config)
+        return self._local
+
+    @property
+    def root(self) -> str:
+        """Get root directory."""
+        return str(self.config.root_dir)
+
+    @property
+    def packages(self) -> List[str]:
+        """Get list of packages."""
+        return list(self._packages())
+
+    def get_all_packages(self) -> List[str]:
+        """Get all packages."""
+        return self.packages
+
+    def get_package_path(self, package: str) -> Optional[str]:
+        """Get the path to a package."""
+        info = self._packages().get(package)
+        return str(info["path"]) if info else None
+
+    def get_package_info(self, name: str) -> Optional[Mapping[str, Any]]:
+        """Get package information."""
+        return self._packages().get(name)
+
+    def set_package_versions(self, versions: Mapping[str, str]) -> None:
+        """Record package versions written to disk.
+
+        Args:
+            versions: New version by package name
+        """
+        if self._local is not None:
+            self._local.set_package_versions(versions)
+        if self._package_table is not None:
+            for name, version in versions.items():
+                self._package_table[name] = {**self._package_table[name], "version": version}
+
+    def get_affected_packages(self, base_ref: Optional[str] = None) -> Set[str]:
+        """Get packages affected by changes since a git ref.
+
+        Args:
+            base_ref: Git ref to compare against. Defaults to the configured base ref.
+        """
+        return self._query(
+            lambda client: set(client.request("affected", base_ref=base_ref)),
+            lambda: self.local.get_affected_packages(base_ref),
+        )
+
+    def get_build_order(self) -> List[str]:
+        """Get all packages in dependency order."""
+        return self._query(
+            lambda client: list(client.request("build-order")),
+            lambda: self.local.dependency_manager.get_build_order(),
+        )
+
+    def get_dependencies(self, package: str) -> Set[str]:
+        """Get the monorepo packages a package depends on directly."""
+        return self._query(
+            lambda client: set(client.request("dependencies", package=package)),
+            lambda: self.local.dependency_manager.get_dependencies(package),
+        )
+
+    def _packages(self) -> Dict[str, Mapping[str, Any]]:
+        """Get the information of every package by name."""
+
+        def served(client: WatchClient) -> Dict[str, Mapping[str, Any]]:
+            return {
+                package["name"]: {**package, "dependencies": frozenset(package["dependencies"])}
+                for package in client.request("packages")
+            }
+
+        def local() -> Dict[str, Mapping[str, Any]]:
+            return {name: self.local.get_package_info(name) or {} for name in self.local.packages}
+
+        if self._package_table is None:
+            self._package_table = self._query(served, local)
+        return self._package_table
+
+    def _query(self, served: Callable[[WatchClient], T], fallback: Callable[[], T]) -> T:
+        """Answer a query from the watch service, or in-process if it cannot answer
+
+        Args:
+            served: Answers the query with the watch service client
+            fallback: Answers the query in-process
+
+        Returns:
+            The answer
+        """
+        if self.client is not None:
+            try:
+                return served(self.client)
+            except (OSError, ValueError) as e:
+                logger.info("Watch service unavailable, answering in-process: %s", e)
+                self.client = None
+        return fallback()
@@ -1,6 +1,25 @@
 """Plugin system for PoetFlow."""
 
-from .path_rewriter import PathRewriter
-from .venv_modifier import VenvModifier
+from importlib import import_module
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    from .path_rewriter import PathRewriter
+    from .venv_modifier import VenvModifier
 
 __all__ = ["VenvModifier", "PathRewriter"]
+
+_LAZY_IMPORTS = {
+    "PathRewriter": ".path_rewriter",
+    "VenvModifier": ".venv_modifier",
+}
+
+
+def __getattr__(name: str) -> Any:
+    """Import public names on first access."""
+    module = _LAZY_IMPORTS.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(import_module(module, __name__), name)
+    globals()[name] = value
+    return value
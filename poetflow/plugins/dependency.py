@@ -8,52 +8,27 @@ from __future__ import annotations
 
 import copy
 from pathlib import Path
-from typing import TYPE_CHECKING
+from typing import TYPE_CHECKING, Any
 
-from poetry.config.config import Config
-from poetry.console.commands.add import AddCommand
-from poetry.console.commands.remove import RemoveCommand
-from poetry.factory import Factory
-from poetry.installation.installer import Installer
-from poetry.poetry import Poetry
-from tomlkit.toml_document import TOMLDocument
+from poetflow.core.lockstate import LockState
+from poetflow.plugins.profiling import instrument
+from poetflow.plugins.root_poetry import get_root_poetry
 
 if TYPE_CHECKING:
     from cleo.events.console_command_event import ConsoleCommandEvent
     from cleo.events.console_terminate_event import ConsoleTerminateEvent
+    from tomlkit.toml_document import TOMLDocument
 
     from poetflow.types.config import MonorangerConfig
 
 
-class DummyInstaller(Installer):
-    """A dummy installer that overrides the run method and disables it
+def __getattr__(name: str) -> Any:
+    """Import DummyInstaller, which pulls in Poetry's installer, only when it is used."""
+    if name == "DummyInstaller":
+        from poetflow.plugins.installer import DummyInstaller
 
-    Note: For more details, refer to the docstring of `MonorepoAdderRemover`.
-    """
-
-    @classmethod
-    def from_installer(cls, installer: "Installer") -> "DummyInstaller":
-        """Creates a DummyInstaller instance from an existing Installer instance.
-
-        Args:
-            installer: The original installer instance.
-
-        Returns:
-            A new DummyInstaller instance with the same attributes.
-        """
-        new_installer = cls.__new__(cls)
-        new_installer.__dict__.update(installer.__dict__)
-        return new_installer
-
-    def run(self) -> int:
-        """Overrides the run method to always return 0.
-
-        The add/remove commands will modify the pyproject.toml file only if this command returns 0.
-
-        Returns:
-            Always returns 0.
-        """
-        return 0
+        return DummyInstaller
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 
 class MonorepoError(Exception):
@@ -78,6 +53,7 @@ class MonorepoAdderRemover:
     def __init__(self, plugin_conf: "MonorangerConfig") -> None:
         self.plugin_conf = plugin_conf
         self.pre_add_pyproject: None | TOMLDocument = None
+        instrument(self, plugin_conf)
 
     def execute(self, event: "ConsoleCommandEvent") -> None:
         """Replaces the installer with a dummy installer.
@@ -89,6 +65,12 @@ class MonorepoAdderRemover:
         Args:
             event: The event that triggered the command.
         """
+        from poetry.console.commands.add import AddCommand
+        from poetry.console.commands.remove import RemoveCommand
+        from poetry.poetry import Poetry
+
+        from poetflow.plugins.installer import DummyInstaller
+
         command = event.command
         assert isinstance(command, (AddCommand, RemoveCommand)), (
             f"{self.__class__.__name__} can only be used for `poetry add` and "
@@ -113,6 +95,10 @@ class MonorepoAdderRemover:
         Args:
             event: The event that triggered the command termination.
         """
+        from poetry.console.commands.add import AddCommand
+        from poetry.console.commands.remove import RemoveCommand
+        from poetry.installation.installer import Installer
+
         command = event.command
         assert isinstance(command, (AddCommand, RemoveCommand)), (
             f"{self.__class__.__name__} can only be used for `poetry add` and "
@@ -125,13 +111,17 @@ class MonorepoAdderRemover:
         if self.pre_add_pyproject and (poetry.file.read() == self.pre_add_pyproject):
             return
 
-        # Force reload global config
-        _ = Config.create(reload=True)
         monorepo_root: Path = (
             poetry.pyproject_path.parent / self.plugin_conf.monorepo_root
         ).resolve()
-        monorepo_root_poetry = Factory().create_poetry(
-            cwd=monorepo_root, io=io, disable_cache=poetry.disable_cache
+        lock_state = LockState(monorepo_root)
+        if lock_state.is_fresh(covering=[poetry.pyproject_path]):
+            # The root lock file resolves this project, and only formatting or comments of its
+            # dependency tables changed, so resolving again would reproduce the same lock file
+            return
+
+        monorepo_root_poetry = get_root_poetry(
+            monorepo_root, io=io, disable_cache=poetry.disable_cache
         )
 
         installer = Installer(
@@ -157,6 +147,9 @@ class MonorepoAdderRemover:
             status = installer.run()
         except Exception as e:
             raise LockfileUpdateError(f"Failed to update lockfile: {str(e)}") from e
+        else:
+            if status == 0 and not command.option("dry-run"):
+                lock_state.record()
         finally:
             if status != 0 and not command.option("dry-run") and self.pre_add_pyproject is not None:
                 io.write_line(
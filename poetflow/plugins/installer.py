@@ -0,0 +1,39 @@
+"""Copyright (C) 2024 Felipe Pimentel <fpimentel88@gmail.com>
+
+This module provides the installer used to disable installation in `poetry add` and
+`poetry remove`, kept apart from the plugins so that Poetry's installer is imported only when
+those commands run.
+"""
+
+from poetry.installation.installer import Installer
+
+
+class DummyInstaller(Installer):
+    """A dummy installer that overrides the run method and disables it
+
+    Note: For more details, refer to the docstring of `MonorepoAdderRemover`.
+    """
+
+    @classmethod
+    def from_installer(cls, installer: "Installer") -> "DummyInstaller":
+        """Creates a DummyInstaller instance from an existing Installer instance.
+
+        Args:
+            installer: The original installer instance.
+
+        Returns:
+            A new DummyInstaller instance with the same attributes.
+        """
+        new_installer = cls.__new__(cls)
+        new_installer.__dict__.update(installer.__dict__)
+        return new_installer
+
+    def run(self) -> int:
+        """Overrides the run method to always return 0.
+
+        The add/remove commands will modify the pyproject.toml file only if this command returns 0.
+
+        Returns:
+            Always returns 0.
+        """
+        return 0
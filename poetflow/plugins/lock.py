@@ -2,17 +2,16 @@
 
 from __future__ import annotations
 
-from typing import TYPE_CHECKING, Union
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Optional, Union
 
-from poetry.config.config import Config
-from poetry.console.commands.install import InstallCommand
-from poetry.console.commands.lock import LockCommand
-from poetry.console.commands.update import UpdateCommand
-from poetry.factory import Factory
-from poetry.installation.installer import Installer
+from poetflow.core.lockstate import LockState
+from poetflow.plugins.profiling import instrument
+from poetflow.plugins.root_poetry import get_root_poetry
 
 if TYPE_CHECKING:
     from cleo.events.console_command_event import ConsoleCommandEvent
+    from cleo.events.console_terminate_event import ConsoleTerminateEvent
 
     from poetflow.types.config import MonorangerConfig
     from tests.types import MockEvent
@@ -25,6 +24,9 @@ class LockModifier:
 
     def __init__(self, config: MonorangerConfig) -> None:
         self.plugin_conf = config
+        # Root whose lock file the command resolves, recorded once the command succeeds
+        self._resolved_root: Optional[Path] = None
+        instrument(self, config)
 
     def execute(self, event: "EventType") -> None:
         """Execute the plugin.
@@ -35,6 +37,11 @@ class LockModifier:
         if not self.plugin_conf.enabled:
             return
 
+        from poetry.console.commands.install import InstallCommand
+        from poetry.console.commands.lock import LockCommand
+        from poetry.console.commands.update import UpdateCommand
+        from poetry.installation.installer import Installer
+
         command = event.command
         assert isinstance(command, (LockCommand, InstallCommand, UpdateCommand)), (
             f"{self.__class__.__name__} can only be used for "
@@ -42,18 +49,32 @@ class LockModifier:
         )
 
         io = event.io
-        io.write_line("<info>Running command from monorepo root directory</info>")
-
-        # Force reload global config
-        _ = Config.create(reload=True)
         monorepo_root = (
             command.poetry.pyproject_path.parent / self.plugin_conf.monorepo_root
         ).resolve()
-        monorepo_root_poetry = Factory().create_poetry(
-            cwd=monorepo_root, io=io, disable_cache=command.poetry.disable_cache
+
+        # `poetry lock --no-update` keeps the locked versions, so from unchanged dependency
+        # tables it reproduces the same lock file. A plain `poetry lock` upgrades to the newest
+        # allowed versions, `poetry update` does too and `poetry install` installs packages.
+        if (
+            isinstance(command, LockCommand)
+            and _option(command, "no-update")
+            and LockState(monorepo_root).is_fresh()
+        ):
+            from poetflow.plugins.installer import DummyInstaller
+
+            io.write_line("<info>Dependencies unchanged, poetry.lock is up to date</info>")
+            command.set_installer(DummyInstaller.from_installer(command.installer))
+            return
+
+        io.write_line("<info>Running command from monorepo root directory</info>")
+
+        monorepo_root_poetry = get_root_poetry(
+            monorepo_root, io=io, disable_cache=command.poetry.disable_cache
         )
 
         command.set_poetry(monorepo_root_poetry)
+        self._resolved_root = monorepo_root
 
         installer = Installer(
             io,
@@ -65,3 +86,23 @@ class LockModifier:
             disable_cache=monorepo_root_poetry.disable_cache,
         )
         command.set_installer(installer)
+
+    def post_execute(self, event: "ConsoleTerminateEvent") -> None:
+        """Record the dependency tables the lock file was resolved from.
+
+        Args:
+            event: Command termination event
+        """
+        root, self._resolved_root = self._resolved_root, None
+        if root is None or event.exit_code != 0:
+            return
+
+        command = event.command
+        if _option(command, "dry-run") or _option(command, "check"):
+            return
+        LockState(root).record()
+
+
+def _option(command: Any, name: str) -> bool:
+    """Get a flag of a command, or False if the command does not define it."""
+    return bool(command.io.input.has_option(name) and command.option(name))
@@ -3,8 +3,7 @@
 from pathlib import Path
 from typing import TYPE_CHECKING, Any, Protocol
 
-from poetry.console.commands.command import Command
-from poetry.core.packages.directory_dependency import DirectoryDependency
+from poetflow.plugins.profiling import instrument
 
 if TYPE_CHECKING:
     from poetflow.types.config import MonorangerConfig
@@ -22,12 +21,16 @@ class PathRewriter:
 
     def __init__(self, config: "MonorangerConfig") -> None:
         self.config = config
+        instrument(self, config)
 
     def execute(self, event: CommandEvent) -> None:
         """Execute the plugin."""
         if not self.config.enabled:
             return
 
+        from poetry.console.commands.command import Command
+        from poetry.core.packages.directory_dependency import DirectoryDependency
+
         command = event.command
         assert isinstance(command, Command)
 
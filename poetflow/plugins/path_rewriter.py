@@ -2,8 +2,6 @@
 
 from typing import TYPE_CHECKING, Any, Protocol
 
-from poetry.console.commands.command import Command
-
 if TYPE_CHECKING:
     from poetflow.types.config import MonorangerConfig
 
@@ -26,6 +24,8 @@ class PathRewriter:
         if not self.config.enabled:
             return
 
+        from poetry.console.commands.command import Command
+
         command = event.command
         assert isinstance(command, Command)
         # Rest of implementation...
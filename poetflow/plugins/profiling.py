@@ -0,0 +1,240 @@
+"""Copyright (C) 2024 Felipe Pimentel <fpimentel88@gmail.com>
+
+This module instruments the PoetFlow plugins to report how much each of their phases costs.
+
+Profiling is enabled with the POETFLOW_PROFILE environment variable or the `profile` config key.
+"1", "true" or "table" print a summary table to stderr when the process exits; any other value
+is the path of a Chrome-trace JSON file (open it in chrome://tracing or Perfetto).
+"""
+
+import atexit
+import functools
+import json
+import os
+import sys
+import threading
+import time
+import tracemalloc
+from contextlib import contextmanager
+from dataclasses import dataclass
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Callable, Dict, Iterator, List, Optional, TypeVar
+
+if TYPE_CHECKING:
+    from poetflow.types.config import MonorangerConfig
+
+PROFILE_ENV = "POETFLOW_PROFILE"
+
+# Values printing a summary table instead of writing a trace file
+TABLE_OUTPUTS = frozenset({"1", "true", "table"})
+DISABLED_OUTPUTS = frozenset({"", "0", "false"})
+
+F = TypeVar("F", bound=Callable[..., Any])
+
+
+@dataclass
+class Span:
+    """A timed plugin phase.
+
+    Attributes:
+        name: Phase name, e.g. "LockModifier.execute"
+        start: Start time in seconds, relative to the profiler start
+        duration: Wall time in seconds
+        create_poetry_calls: Number of Factory.create_poetry calls during the phase
+        peak_memory: Peak traced memory during the phase, in bytes
+        thread_id: Thread running the phase
+    """
+
+    name: str
+    start: float
+    duration: float
+    create_poetry_calls: int
+    peak_memory: int
+    thread_id: int
+
+
+class Profiler:
+    """Records the wall time, Poetry instance creations and peak memory of plugin phases."""
+
+    def __init__(self, output: str) -> None:
+        """Initialize profiler and start tracing memory allocations.
+
+        Args:
+            output: "table" style value or Chrome-trace file path, see the module docstring
+        """
+        self.output = output
+        self.spans: List[Span] = []
+        self.create_poetry_calls = 0
+        self._origin = time.perf_counter()
+        self._child_peaks: List[int] = []
+        self._lock = threading.Lock()
+
+        self._started_tracemalloc = not tracemalloc.is_tracing()
+        if self._started_tracemalloc:
+            tracemalloc.start()
+
+        from poetry.factory import Factory
+
+        self._create_poetry = Factory.create_poetry
+        profiler = self
+
+        @functools.wraps(self._create_poetry)
+        def create_poetry(factory: Any, *args: Any, **kwargs: Any) -> Any:
+            with profiler._lock:
+                profiler.create_poetry_calls += 1
+            return profiler._create_poetry(factory, *args, **kwargs)
+
+        setattr(Factory, "create_poetry", create_poetry)
+
+    @contextmanager
+    def phase(self, name: str) -> Iterator[None]:
+        """Record a phase
+
+        Peak memory is measured per phase; nested phases contribute to the peak of their parent.
+
+        Args:
+            name: Phase name
+        """
+        calls = self.create_poetry_calls
+        tracemalloc.reset_peak()
+        self._child_peaks.append(0)
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            duration = time.perf_counter() - start
+            peak = max(tracemalloc.get_traced_memory()[1], self._child_peaks.pop())
+            if self._child_peaks:
+                self._child_peaks[-1] = max(self._child_peaks[-1], peak)
+            self.spans.append(
+                Span(
+                    name=name,
+                    start=start - self._origin,
+                    duration=duration,
+                    create_poetry_calls=self.create_poetry_calls - calls,
+                    peak_memory=peak,
+                    thread_id=threading.get_ident(),
+                )
+            )
+
+    def wrap(self, name: str, func: F) -> F:
+        """Wrap a function so that every call is recorded as a phase
+
+        Args:
+            name: Phase name
+            func: Function to wrap
+
+        Returns:
+            The wrapped function
+        """
+
+        @functools.wraps(func)
+        def wrapper(*args: Any, **kwargs: Any) -> Any:
+            with self.phase(name):
+                return func(*args, **kwargs)
+
+        return wrapper  # type: ignore[return-value]
+
+    def summary(self) -> str:
+        """Format the recorded phases as a table."""
+        lines = [f"{'phase':<36} {'wall (s)':>10} {'create_poetry':>14} {'peak (MiB)':>11}"]
+        for span in self.spans:
+            lines.append(
+                f"{span.name:<36} {span.duration:>10.3f} {span.create_poetry_calls:>14} "
+                f"{span.peak_memory / 2**20:>11.1f}"
+            )
+        return "\n".join(lines)
+
+    def chrome_trace(self) -> Dict[str, Any]:
+        """Get the recorded phases in the Chrome trace event format."""
+        pid = os.getpid()
+        return {
+            "traceEvents": [
+                {
+                    "name": span.name,
+                    "cat": "poetflow",
+                    "ph": "X",
+                    "ts": span.start * 1e6,
+                    "dur": span.duration * 1e6,
+                    "pid": pid,
+                    "tid": span.thread_id,
+                    "args": {
+                        "create_poetry_calls": span.create_poetry_calls,
+                        "peak_memory": span.peak_memory,
+                    },
+                }
+                for span in self.spans
+            ],
+            "displayTimeUnit": "ms",
+        }
+
+    def report(self) -> None:
+        """Print the summary table or write the Chrome trace, depending on the output."""
+        if not self.spans:
+            return
+        if self.output.lower() in TABLE_OUTPUTS:
+            print(self.summary(), file=sys.stderr)
+        else:
+            Path(self.output).write_text(json.dumps(self.chrome_trace()), encoding="utf-8")
+
+    def close(self) -> None:
+        """Stop profiling, restoring Factory.create_poetry and memory tracing."""
+        from poetry.factory import Factory
+
+        setattr(Factory, "create_poetry", self._create_poetry)
+        if self._started_tracemalloc:
+            tracemalloc.stop()
+
+
+_profiler: Optional[Profiler] = None
+
+
+def profile_output(config: "MonorangerConfig") -> Optional[str]:
+    """Get where profiling results go, or None if profiling is disabled
+
+    The environment variable takes precedence over the config key.
+
+    Args:
+        config: Plugin configuration
+
+    Returns:
+        The profiling output, see the module docstring
+    """
+    output = os.environ.get(PROFILE_ENV, config.profile or "")
+    return None if output.strip().lower() in DISABLED_OUTPUTS else output.strip()
+
+
+def get_profiler(output: str) -> Profiler:
+    """Get the process-wide profiler, reporting its results when the process exits
+
+    Args:
+        output: Profiling output used if the profiler does not exist yet
+
+    Returns:
+        Profiler instance
+    """
+    global _profiler
+    if _profiler is None:
+        _profiler = Profiler(output)
+        atexit.register(_profiler.report)
+    return _profiler
+
+
+def instrument(plugin: object, config: "MonorangerConfig") -> None:
+    """Record the execute and post_execute phases of a plugin if profiling is enabled
+
+    When profiling is disabled the plugin is left untouched, so it costs nothing per call.
+
+    Args:
+        plugin: Plugin instance
+        config: Plugin configuration
+    """
+    output = profile_output(config)
+    if output is None:
+        return
+
+    profiler = get_profiler(output)
+    for method in ("execute", "post_execute"):
+        func = getattr(plugin, method, None)
+        if func is not None:
+            setattr(plugin, method, profiler.wrap(f"{type(plugin).__name__}.{method}", func))
@@ -0,0 +1,56 @@
+"""Copyright (C) 2024 Felipe Pimentel <fpimentel88@gmail.com>
+
+This module memoizes the Poetry instance of the monorepo root, so that the plugins handling one
+command parse the root pyproject.toml and build its repository pool only once.
+"""
+
+from __future__ import annotations
+
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Dict, Optional, Tuple
+
+if TYPE_CHECKING:
+    from poetry.poetry import Poetry
+
+_cache: Dict[Tuple[Path, int, int, bool], "Poetry"] = {}
+
+
+def get_root_poetry(root: Path, io: Optional[Any] = None, disable_cache: bool = False) -> "Poetry":
+    """Get the Poetry instance of the monorepo root
+
+    Instances are memoized per process, keyed by the resolved root directory and the mtime and
+    size of its pyproject.toml, so an edited root project is loaded again. The global Poetry
+    config is reloaded before loading the root project, which undoes changes made by a
+    subproject's poetry.toml.
+
+    Args:
+        root: Monorepo root directory
+        io: IO used to report problems while loading the project
+        disable_cache: Whether the Poetry instance should disable Poetry's repository cache
+
+    Returns:
+        Poetry instance of the monorepo root
+    """
+    from poetry.config.config import Config
+    from poetry.factory import Factory
+
+    root = root.resolve()
+    try:
+        stat = (root / "pyproject.toml").stat()
+    except OSError:
+        # Let Poetry report the missing project, and never memoize it
+        _ = Config.create(reload=True)
+        return Factory().create_poetry(cwd=root, io=io, disable_cache=disable_cache)
+
+    key = (root, stat.st_mtime_ns, stat.st_size, disable_cache)
+    poetry = _cache.get(key)
+    if poetry is None:
+        _ = Config.create(reload=True)
+        poetry = Factory().create_poetry(cwd=root, io=io, disable_cache=disable_cache)
+        _cache[key] = poetry
+    return poetry
+
+
+def clear_root_poetry_cache() -> None:
+    """Forget every memoized root Poetry instance."""
+    _cache.clear()
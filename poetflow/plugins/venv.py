@@ -10,15 +10,12 @@ from __future__ import annotations
 import os
 from typing import TYPE_CHECKING, Any, Protocol
 
-from poetry.config.config import Config
-from poetry.console.commands.env_command import EnvCommand
-from poetry.console.commands.installer_command import InstallerCommand
-from poetry.factory import Factory
-from poetry.installation.installer import Installer
-from poetry.utils.env import EnvManager
+from poetflow.plugins.profiling import instrument
+from poetflow.plugins.root_poetry import get_root_poetry
 
 if TYPE_CHECKING:
     from cleo.events.console_command_event import ConsoleCommandEvent
+    from poetry.utils.env import EnvManager
 
     from poetflow.types.config import MonorangerConfig
 
@@ -42,6 +39,7 @@ class VenvModifier:
     def __init__(self, plugin_conf: MonorangerConfig):
         self.plugin_conf: MonorangerConfig = plugin_conf
         self.env_manager: EnvManager | None = None
+        instrument(self, plugin_conf)
 
     def execute(self, event: ConsoleCommandEvent) -> None:
         """Execute the plugin.
@@ -52,13 +50,24 @@ class VenvModifier:
         if not self.plugin_conf.enabled:
             return
 
+        from poetry.console.commands.env_command import EnvCommand
+        from poetry.console.commands.installer_command import InstallerCommand
+        from poetry.installation.installer import Installer
+        from poetry.utils.env import EnvManager
+
         command = event.command
         if not isinstance(command, (EnvCommand, InstallerCommand)):
             return
 
-        # Get the root poetry instance
-        root_poetry = Factory.create_poetry(
-            command.poetry.file.parent / self.plugin_conf.monorepo_root
+        io = event.io
+
+        # Get the root poetry instance, which also undoes global config changes made by the
+        # subproject's poetry.toml
+        monorepo_root = (
+            command.poetry.pyproject_path.parent / self.plugin_conf.monorepo_root
+        ).resolve()
+        root_poetry = get_root_poetry(
+            monorepo_root, io=io, disable_cache=command.poetry.disable_cache
         )
 
         # Set the root poetry instance on the command
@@ -68,19 +77,8 @@ class VenvModifier:
         if in_venv:
             return
 
-        io = event.io
-
-        # Force reload global config to undo changes from subproject's poetry.toml configs
-        _ = Config.create(reload=True)
-        monorepo_root = (
-            root_poetry.pyproject_path.parent / self.plugin_conf.monorepo_root
-        ).resolve()
-        monorepo_root_poetry = Factory().create_poetry(
-            cwd=monorepo_root, io=io, disable_cache=root_poetry.disable_cache
-        )
-
         io.write_line(f"<info>Using monorepo root venv <fg=green>{monorepo_root.name}</></info>\n")
-        env_manager = EnvManager(monorepo_root_poetry, io=io)
+        env_manager = EnvManager(root_poetry, io=io)
         root_env = env_manager.create_venv()
 
         command.set_env(root_env)
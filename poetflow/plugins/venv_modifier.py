@@ -1,11 +1,14 @@
 """Venv modifier plugin for Poetry."""
 
-from typing import Any, Protocol
+from __future__ import annotations
 
-from poetry.utils.env import EnvManager
+from typing import TYPE_CHECKING, Any, Protocol
 
 from poetflow.types.config import MonorangerConfig
 
+if TYPE_CHECKING:
+    from poetry.utils.env import EnvManager
+
 
 class CommandEvent(Protocol):
     """Protocol for command events."""
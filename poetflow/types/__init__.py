@@ -1,6 +1,6 @@
 """Type definitions for poetflow."""
 
-from .monorepo import MonoRepo, MonorepoManager
+from .monorepo import DependencyGraph, MonoRepo, MonorepoManager
 from .poetry_app import Application, EventDispatcher
 from .poetry_commands import (
     AddCommand,
@@ -18,6 +18,7 @@ __all__ = [
     "Application",
     "BuildCommand",
     "Command",
+    "DependencyGraph",
     "EnvCommand",
     "EventDispatcher",
     "InstallCommand",
@@ -13,3 +13,4 @@ class MonorangerConfig:
     monorepo_root: Path
     packages_dir: Optional[str] = None
     version_rewrite_rule: Optional[str] = None
+    profile: Optional[str] = None
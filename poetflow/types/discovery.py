@@ -1,15 +1,55 @@
 """Package discovery functionality"""
 
+import sys
 from dataclasses import dataclass
 from pathlib import Path
-from typing import Set
+from typing import Any, FrozenSet, Iterator, Mapping, Optional
 
+# Keys of the mapping returned by MonoRepo.get_package_info
+PACKAGE_INFO_KEYS = ("name", "version", "path", "dependencies", "fingerprint")
 
-@dataclass
+
+@dataclass(frozen=True, slots=True)
 class PackageInfo:
-    """Information about a package"""
+    """Information about a package
+
+    Names are interned, since the same dependency names recur across thousands of packages.
+    """
 
     name: str
     version: str
     path: Path
-    dependencies: Set[str]
+    dependencies: FrozenSet[str]
+    fingerprint: Optional[int] = None
+
+    def __post_init__(self) -> None:
+        object.__setattr__(self, "name", sys.intern(self.name))
+        object.__setattr__(self, "dependencies", frozenset(map(sys.intern, self.dependencies)))
+
+
+class PackageInfoView(Mapping[str, Any]):
+    """Read-only mapping view of a PackageInfo, returned instead of a copy of its fields.
+
+    The path is exposed as a string and the dependencies as a frozenset.
+    """
+
+    __slots__ = ("_info",)
+
+    def __init__(self, info: PackageInfo) -> None:
+        self._info = info
+
+    def __getitem__(self, key: str) -> Any:
+        if key == "path":
+            return str(self._info.path)
+        if key in PACKAGE_INFO_KEYS:
+            return getattr(self._info, key)
+        raise KeyError(key)
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(PACKAGE_INFO_KEYS)
+
+    def __len__(self) -> int:
+        return len(PACKAGE_INFO_KEYS)
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}({self._info!r})"
@@ -1,6 +1,10 @@
 """Types for monorepo management"""
 
-from typing import Any, Dict, List, Optional, Protocol, Set
+from typing import TYPE_CHECKING, Any, List, Mapping, Optional, Protocol, Set
+
+if TYPE_CHECKING:
+    from poetflow.core.cache import CacheManager
+    from poetflow.core.config import Config
 
 
 class MonoRepo(Protocol):
@@ -16,7 +20,7 @@ class MonoRepo(Protocol):
         """Get the list of packages in the monorepo"""
         ...
 
-    def get_package_info(self, name: str) -> Optional[Dict[str, Any]]:
+    def get_package_info(self, name: str) -> Optional[Mapping[str, Any]]:
         """Get the package information"""
         ...
 
@@ -24,18 +28,41 @@ class MonoRepo(Protocol):
         """Get all packages in the monorepo"""
         ...
 
+    def set_package_versions(self, versions: Mapping[str, str]) -> None:
+        """Record package versions written to disk"""
+        ...
 
-class MonorepoManager(Protocol):
-    """Protocol defining the interface for monorepo management"""
 
-    def get_all_packages(self) -> List[str]:
-        """Get all packages in the monorepo"""
+class DependencyGraph(Protocol):
+    """Protocol defining the lookup of in-monorepo dependencies"""
+
+    def get_dependencies(self, package: str) -> Set[str]:
+        """Get the monorepo packages a package depends on directly"""
         ...
 
+
+class MonorepoManager(MonoRepo, Protocol):
+    """Protocol defining the interface for monorepo management"""
+
+    config: "Config"
+    cache: "CacheManager"
+
     def get_package_path(self, package: str) -> Optional[str]:
         """Get the path to a package"""
         ...
 
-    def get_affected_packages(self) -> Set[str]:
-        """Get the affected packages"""
+    def get_package_info(self, name: str) -> Optional[Mapping[str, Any]]:
+        """Get the package information"""
+        ...
+
+    def get_affected_packages(self, base_ref: Optional[str] = None) -> Set[str]:
+        """Get the packages affected by changes since a git ref"""
+        ...
+
+    def get_build_order(self) -> List[str]:
+        """Get all packages in dependency order"""
+        ...
+
+    def get_dependencies(self, package: str) -> Set[str]:
+        """Get the monorepo packages a package depends on directly"""
         ...
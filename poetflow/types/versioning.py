@@ -1,13 +1,29 @@
 """Types for versioning and changelog functionality."""
 
 import re
+import sys
+import threading
+from collections import OrderedDict
 from dataclasses import dataclass
-from typing import Optional
+from typing import List, Optional, Tuple
 
 from ..core.exceptions import PackageError
 
+COMMIT_HEADER_PATTERN = re.compile(
+    r"^(?P<type>[\w-]+)(?:\((?P<scope>[^()\r\n]+)\))?(?P<breaking>!)?: (?P<message>.+)$"
+)
+FOOTER_PATTERN = re.compile(r"^(?P<token>BREAKING[ -]CHANGE|[\w-]+)(?:: | #)(?P<value>.*)$")
+REVERT_PATTERN = re.compile(r'^Revert "(?P<header>.+)"$')
+BREAKING_TOKENS = frozenset({"BREAKING CHANGE", "BREAKING-CHANGE"})
 
-@dataclass
+# Number of parsed commits memoized by hash
+PARSE_CACHE_SIZE = 65536
+
+_parse_cache: "OrderedDict[str, CommitInfo]" = OrderedDict()
+_parse_cache_lock = threading.Lock()
+
+
+@dataclass(frozen=True, slots=True)
 class Version:
     """Represents a semantic version."""
 
@@ -39,39 +55,128 @@ class Version:
             raise PackageError(f"Invalid bump type: {bump_type}")
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class CommitInfo:
-    """Information about a commit."""
+    """Information about a commit.
+
+    Commit types and scopes are interned, since a large history repeats a handful of them.
+    """
 
     type: str
     scope: Optional[str]
     message: str
     breaking: bool = False
+    body: str = ""
+    footers: Tuple[Tuple[str, str], ...] = ()
+    reverts: Optional[str] = None
+    hash: Optional[str] = None
+
+    def __post_init__(self) -> None:
+        object.__setattr__(self, "type", sys.intern(self.type))
+        if self.scope is not None:
+            object.__setattr__(self, "scope", sys.intern(self.scope))
 
     @classmethod
-    def parse(cls, commit_message: str) -> "CommitInfo":
+    def parse(cls, commit_message: str, commit_hash: Optional[str] = None) -> "CommitInfo":
         """Parse a conventional commit message.
 
-        Format: type(scope): message
+        Format: type(scope)!: message, followed by an optional body and footers
         Example: feat(core): add new feature
 
+        A commit is breaking if its header has a "!" before the colon or it has a
+        "BREAKING CHANGE" footer. Reverts, either "revert: <header>" or git's default
+        'Revert "<header>"', have the type "revert" and record the reverted header.
+
         Args:
-            commit_message: The commit message to parse
+            commit_message: The full commit message to parse
+            commit_hash: Hash of the commit, recorded on the result; parsed commits are
+                memoized by hash
 
         Returns:
             CommitInfo instance
         """
-        # Check for breaking change marker
-        breaking = "!" in commit_message
-        commit_message = commit_message.replace("!", "")
-
-        # Parse conventional commit format
-        pattern = r"^(\w+)(?:\(([^)]+)\))?: (.+)$"
-        match = re.match(pattern, commit_message)
+        if commit_hash is None:
+            return cls._parse(commit_message)
+
+        with _parse_cache_lock:
+            cached = _parse_cache.get(commit_hash)
+            if cached is not None:
+                _parse_cache.move_to_end(commit_hash)
+                return cached
+
+        commit = cls._parse(commit_message, commit_hash)
+        with _parse_cache_lock:
+            _parse_cache[commit_hash] = commit
+            if len(_parse_cache) > PARSE_CACHE_SIZE:
+                _parse_cache.popitem(last=False)
+        return commit
 
+    @classmethod
+    def _parse(cls, commit_message: str, commit_hash: Optional[str] = None) -> "CommitInfo":
+        """Parse a commit message without memoization."""
+        header, _, rest = commit_message.strip().partition("\n")
+        header = header.strip()
+        body, footers = _split_footers(rest.strip("\n"))
+        breaking = any(token in BREAKING_TOKENS for token, _ in footers)
+
+        revert = REVERT_PATTERN.match(header)
+        if revert:
+            reverted = revert.group("header")
+            return cls(
+                type="revert",
+                scope=None,
+                message=reverted,
+                breaking=breaking,
+                body=body,
+                footers=footers,
+                reverts=reverted,
+                hash=commit_hash,
+            )
+
+        match = COMMIT_HEADER_PATTERN.match(header)
         if not match:
-            return cls(type="other", scope=None, message=commit_message, breaking=breaking)
-
+            return cls(
+                type="other",
+                scope=None,
+                message=header,
+                breaking=breaking,
+                body=body,
+                footers=footers,
+                hash=commit_hash,
+            )
+
+        commit_type = match.group("type")
         return cls(
-            type=match.group(1), scope=match.group(2), message=match.group(3), breaking=breaking
+            type=commit_type,
+            scope=match.group("scope"),
+            message=match.group("message"),
+            breaking=breaking or match.group("breaking") is not None,
+            body=body,
+            footers=footers,
+            reverts=match.group("message") if commit_type.lower() == "revert" else None,
+            hash=commit_hash,
         )
+
+
+def _split_footers(text: str) -> Tuple[str, Tuple[Tuple[str, str], ...]]:
+    """Split the text after a commit header into its body and footers
+
+    Footers form the last paragraph when its first line is a "Token: value" or "Token #value"
+    trailer; lines that are not trailers continue the value of the previous footer.
+    """
+    if not text:
+        return "", ()
+
+    body, _, paragraph = text.rpartition("\n\n")
+    lines = paragraph.split("\n")
+    if not FOOTER_PATTERN.match(lines[0]):
+        return text.strip(), ()
+
+    footers: List[List[str]] = []
+    for line in lines:
+        match = FOOTER_PATTERN.match(line)
+        if match:
+            footers.append([match.group("token"), match.group("value")])
+        else:
+            footers[-1][1] = f"{footers[-1][1]}\n{line}"
+    return body.strip(), tuple((token, value.strip()) for token, value in footers)
@@ -4,11 +4,14 @@ This module provides parallel execution capabilities for running commands across
 """
 
 import asyncio
+import re
+from collections import deque
 from dataclasses import dataclass
 from pathlib import Path
-from typing import List, Optional
+from typing import IO, Callable, Deque, Dict, List, Optional, Tuple
 
-from poetflow.monorepo import MonorepoManager
+from poetflow.types.monorepo import MonorepoManager
+from poetflow.utils.scheduler import DAGScheduler, ScheduleReport
 
 
 @dataclass
@@ -19,14 +22,155 @@ class CommandResult:
     success: bool
     output: str
     error: Optional[str] = None
+    log_file: Optional[Path] = None
+    returncode: Optional[int] = None
+
+
+# Called with (package, stream name, line) for every line a command writes
+OutputCallback = Callable[[str, str, str], None]
+
+DEFAULT_BUFFER_SIZE = 1024 * 1024
+DEFAULT_TAIL_LINES = 100
+READ_CHUNK_SIZE = 64 * 1024
+
+
+class _OutputCollector:
+    """Collects the output of one command.
+
+    Output is kept in memory until it exceeds ``buffer_size`` bytes. From then on it is spilled
+    to a log file and only the last ``tail_lines`` lines of each stream are kept in memory.
+    """
+
+    def __init__(
+        self,
+        package: str,
+        buffer_size: int,
+        tail_lines: int,
+        log_path: Path,
+        on_output: Optional[OutputCallback],
+    ) -> None:
+        self.package = package
+        self.buffer_size = buffer_size
+        self.log_path = log_path
+        self.on_output = on_output
+        self._buffer: List[Tuple[str, str]] = []
+        self._buffered = 0
+        self._tails: Dict[str, Deque[str]] = {
+            "stdout": deque(maxlen=tail_lines),
+            "stderr": deque(maxlen=tail_lines),
+        }
+        self._log: Optional[IO[str]] = None
+
+    def write(self, stream: str, data: bytes) -> None:
+        """Record a line written by the command."""
+        line = data.decode(errors="replace")
+        if self.on_output is not None:
+            self.on_output(self.package, stream, line)
+        self._tails[stream].append(line)
+
+        if self._log is not None:
+            self._log.write(f"{line}\n")
+            return
+
+        self._buffer.append((stream, line))
+        self._buffered += len(data) + 1
+        if self._buffered > self.buffer_size:
+            self._spill()
+
+    def close(self) -> Tuple[str, str, Optional[Path]]:
+        """Finish collecting.
+
+        Returns:
+            The collected stdout and stderr, or their tails if the output was spilled, and the
+            log file if any
+        """
+        if self._log is not None:
+            self._log.close()
+            return (
+                "\n".join(self._tails["stdout"]),
+                "\n".join(self._tails["stderr"]),
+                self.log_path,
+            )
+        stdout = "\n".join(line for stream, line in self._buffer if stream == "stdout")
+        stderr = "\n".join(line for stream, line in self._buffer if stream == "stderr")
+        return stdout, stderr, None
+
+    def _spill(self) -> None:
+        """Move the buffered output to the log file."""
+        self.log_path.parent.mkdir(parents=True, exist_ok=True)
+        self._log = open(self.log_path, "w", encoding="utf-8")
+        self._log.writelines(f"{line}\n" for _, line in self._buffer)
+        self._buffer = []
+        self._buffered = 0
+
+
+async def _pump(stream: asyncio.StreamReader, name: str, collector: _OutputCollector) -> None:
+    """Forward a process stream to a collector line by line."""
+    pending = b""
+    while chunk := await stream.read(READ_CHUNK_SIZE):
+        pending += chunk
+        *lines, pending = pending.split(b"\n")
+        for line in lines:
+            collector.write(name, line)
+        if len(pending) > READ_CHUNK_SIZE:
+            # Do not let a single line without newlines grow without bounds
+            collector.write(name, pending)
+            pending = b""
+    if pending:
+        collector.write(name, pending)
 
 
 class ParallelExecutor:
-    """Executes commands across multiple packages in parallel"""
+    """Executes commands across multiple packages in parallel
+
+    Command output is streamed line by line to ``on_output`` while the commands run. Each result
+    keeps the full output only while it fits in ``buffer_size`` bytes; larger outputs are spilled
+    to ``<log_dir>/<package>.log`` and the result keeps the last ``tail_lines`` lines.
+    """
 
-    def __init__(self, manager: MonorepoManager, max_workers: int = 4):
+    def __init__(
+        self,
+        manager: MonorepoManager,
+        max_workers: int = 4,
+        on_output: Optional[OutputCallback] = None,
+        buffer_size: int = DEFAULT_BUFFER_SIZE,
+        tail_lines: int = DEFAULT_TAIL_LINES,
+        log_dir: Optional[Path] = None,
+    ):
         self.manager = manager
         self.max_workers = max_workers
+        self.on_output = on_output
+        self.buffer_size = buffer_size
+        self.tail_lines = tail_lines
+        self.log_dir = log_dir or manager.config.cache_dir / "logs"
+
+    async def run_in_dependency_order(
+        self,
+        command: List[str],
+        packages: Optional[List[str]] = None,
+        fail_fast: bool = True,
+    ) -> ScheduleReport[CommandResult]:
+        """Runs a command across packages, respecting their dependencies
+
+        A package starts as soon as all of its in-monorepo dependencies have finished
+        successfully, with at most ``max_workers`` commands running at once.
+
+        Args:
+            command: Command to run as list of strings
+            packages: List of package names to run command for. If None, runs for all packages.
+            fail_fast: Whether to stop starting commands after the first failure
+
+        Returns:
+            Report with the per-package results, skipped packages and the critical path
+        """
+        if packages is None:
+            packages = self.manager.get_build_order()
+
+        graph = {pkg: self.manager.get_dependencies(pkg) for pkg in packages}
+        scheduler: DAGScheduler[CommandResult] = DAGScheduler(
+            graph, max_workers=self.max_workers, fail_fast=fail_fast
+        )
+        return await scheduler.run(packages, lambda pkg: self.run_package(command, pkg))
 
     async def run_command(
         self, command: List[str], packages: Optional[List[str]] = None, cwd: Optional[Path] = None
@@ -49,28 +193,7 @@ class ParallelExecutor:
 
         async def run_single(package: str) -> CommandResult:
             async with semaphore:
-                pkg = self.manager.get_package(package)
-                pkg_dir = cwd or pkg.info.path
-
-                try:
-                    proc = await asyncio.create_subprocess_exec(
-                        *command,
-                        cwd=pkg_dir,
-                        stdout=asyncio.subprocess.PIPE,
-                        stderr=asyncio.subprocess.PIPE,
-                    )
-
-                    stdout, stderr = await proc.communicate()
-                    success = proc.returncode == 0
-
-                    return CommandResult(
-                        package=package,
-                        success=success,
-                        output=stdout.decode(),
-                        error=stderr.decode() if stderr else None,
-                    )
-                except Exception as e:
-                    return CommandResult(package=package, success=False, output="", error=str(e))
+                return await self.run_package(command, package, cwd)
 
         for pkg in packages:
             task = asyncio.create_task(run_single(pkg))
@@ -78,3 +201,57 @@ class ParallelExecutor:
 
         results = await asyncio.gather(*tasks)
         return list(results)
+
+    async def run_package(
+        self, command: List[str], package: str, cwd: Optional[Path] = None
+    ) -> CommandResult:
+        """Runs a command for a single package
+
+        Args:
+            command: Command to run as list of strings
+            package: Package name
+            cwd: Working directory for command execution. If None, uses package directory.
+
+        Returns:
+            CommandResult of the command
+        """
+        pkg_dir = cwd or self.manager.get_package_path(package)
+        if pkg_dir is None:
+            return CommandResult(
+                package=package, success=False, output="", error=f"Package {package} not found"
+            )
+
+        collector = _OutputCollector(
+            package,
+            buffer_size=self.buffer_size,
+            tail_lines=self.tail_lines,
+            log_path=self.log_dir / f"{re.sub(r'[^A-Za-z0-9_.-]', '_', package)}.log",
+            on_output=self.on_output,
+        )
+        try:
+            proc = await asyncio.create_subprocess_exec(
+                *command,
+                cwd=pkg_dir,
+                stdout=asyncio.subprocess.PIPE,
+                stderr=asyncio.subprocess.PIPE,
+            )
+
+            assert proc.stdout is not None and proc.stderr is not None
+            await asyncio.gather(
+                _pump(proc.stdout, "stdout", collector),
+                _pump(proc.stderr, "stderr", collector),
+            )
+            returncode = await proc.wait()
+            stdout, stderr, log_file = collector.close()
+
+            return CommandResult(
+                package=package,
+                success=returncode == 0,
+                output=stdout,
+                error=stderr or None,
+                log_file=log_file,
+                returncode=returncode,
+            )
+        except Exception as e:
+            collector.close()
+            return CommandResult(package=package, success=False, output="", error=str(e))
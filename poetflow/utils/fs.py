@@ -0,0 +1,93 @@
+"""Copyright (C) 2024 Felipe Pimentel <fpimentel88@gmail.com>
+
+This module provides filesystem helpers shared by PoetFlow components.
+"""
+
+import os
+import shutil
+import stat
+import tempfile
+from contextlib import contextmanager
+from pathlib import Path
+from typing import BinaryIO, Iterator
+
+COPY_CHUNK_SIZE = 1024 * 1024
+
+# The umask can only be read by setting it, which is not thread-safe, so it is read once on import
+_UMASK = os.umask(0o022)
+os.umask(_UMASK)
+
+
+def _target_mode(path: Path) -> int:
+    """Get the permissions a file written over path should have."""
+    try:
+        return stat.S_IMODE(os.stat(path).st_mode)
+    except FileNotFoundError:
+        return 0o666 & ~_UMASK
+
+
+@contextmanager
+def _atomic_file(path: Path) -> Iterator[BinaryIO]:
+    """Open a temporary file that replaces the target once the block succeeds.
+
+    The replacement keeps the permissions of the target, or gets the default permissions of
+    new files if the target does not exist, rather than the private mode of temporary files.
+    """
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp_name = tempfile.mkstemp(dir=path.parent, prefix=f".{path.name}.", suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            yield f
+        os.chmod(tmp_name, _target_mode(path))
+        os.replace(tmp_name, path)
+    except BaseException:
+        try:
+            os.unlink(tmp_name)
+        except FileNotFoundError:
+            pass
+        raise
+
+
+def atomic_write_bytes(path: Path, data: bytes) -> None:
+    """Write data to a file atomically
+
+    The data is written to a temporary file in the same directory and then renamed over the
+    target, so readers never observe a partially written file.
+
+    Args:
+        path: Destination file
+        data: Content to write
+    """
+    with _atomic_file(path) as f:
+        f.write(data)
+
+
+def atomic_write_text(path: Path, text: str, encoding: str = "utf-8") -> None:
+    """Write text to a file atomically
+
+    Args:
+        path: Destination file
+        text: Content to write
+        encoding: Text encoding
+    """
+    atomic_write_bytes(path, text.encode(encoding))
+
+
+def atomic_prepend_bytes(path: Path, data: bytes, chunk_size: int = COPY_CHUNK_SIZE) -> None:
+    """Insert data at the start of a file atomically
+
+    The existing content is copied after the new data in fixed-size chunks, so large files are
+    never held in memory.
+
+    Args:
+        path: Destination file, created if missing
+        data: Content to insert
+        chunk_size: Size of the chunks used to copy the existing content
+    """
+    with _atomic_file(path) as f:
+        f.write(data)
+        try:
+            with path.open("rb") as existing:
+                shutil.copyfileobj(existing, f, chunk_size)
+        except FileNotFoundError:
+            pass
@@ -0,0 +1,212 @@
+"""Copyright (C) 2024 Felipe Pimentel <fpimentel88@gmail.com>
+
+This module schedules package tasks along the dependency graph of the monorepo.
+"""
+
+import asyncio
+import heapq
+import time
+from dataclasses import dataclass, field
+from typing import (
+    Awaitable,
+    Callable,
+    Dict,
+    Generic,
+    List,
+    Mapping,
+    Protocol,
+    Set,
+    Tuple,
+    TypeVar,
+)
+
+from poetflow.core.exceptions import MonoRepoError
+
+
+class Outcome(Protocol):
+    """Result of a scheduled task."""
+
+    success: bool
+
+
+R = TypeVar("R", bound=Outcome)
+
+
+@dataclass
+class ScheduleReport(Generic[R]):
+    """Report of a scheduled run"""
+
+    results: Dict[str, R] = field(default_factory=dict)
+    skipped: List[str] = field(default_factory=list)
+    durations: Dict[str, float] = field(default_factory=dict)
+    critical_path: List[str] = field(default_factory=list)
+    critical_path_duration: float = 0.0
+    wall_time: float = 0.0
+
+    @property
+    def success(self) -> bool:
+        """Whether every package ran and succeeded."""
+        return not self.skipped and all(result.success for result in self.results.values())
+
+
+class DAGScheduler(Generic[R]):
+    """Runs package tasks as soon as their in-monorepo dependencies have finished.
+
+    At most ``max_workers`` tasks run at once. When several packages are ready, the one with the
+    longest chain of dependents is started first, since it bounds the total run time. After a
+    failure, packages depending on the failed one are skipped; with ``fail_fast`` no new task is
+    started at all and running tasks are allowed to finish.
+    """
+
+    def __init__(
+        self,
+        dependencies: Mapping[str, Set[str]],
+        max_workers: int = 4,
+        fail_fast: bool = True,
+    ) -> None:
+        """Initialize the scheduler.
+
+        Args:
+            dependencies: Direct dependencies of each package
+            max_workers: Maximum number of concurrent tasks
+            fail_fast: Whether to stop starting tasks after the first failure
+        """
+        self.dependencies = dependencies
+        self.max_workers = max(1, max_workers)
+        self.fail_fast = fail_fast
+
+    async def run(
+        self, packages: List[str], task: Callable[[str], Awaitable[R]]
+    ) -> ScheduleReport[R]:
+        """Run a task for every package
+
+        Dependencies outside of ``packages`` are assumed to be satisfied already.
+
+        Args:
+            packages: Packages to run the task for
+            task: Coroutine function running the task for one package
+
+        Returns:
+            Report with per-package results and the critical path
+
+        Raises:
+            MonoRepoError: If the packages contain a dependency cycle
+        """
+        selected = set(packages)
+        deps = {pkg: self.dependencies.get(pkg, set()) & selected for pkg in packages}
+        dependents: Dict[str, List[str]] = {pkg: [] for pkg in packages}
+        for pkg, pkg_deps in deps.items():
+            for dep in pkg_deps:
+                dependents[dep].append(pkg)
+
+        order = self._topological_order(packages, deps, dependents)
+        height = self._heights(order, dependents)
+        position = {pkg: index for index, pkg in enumerate(packages)}
+
+        report: ScheduleReport[R] = ScheduleReport()
+        pending = {pkg: len(pkg_deps) for pkg, pkg_deps in deps.items()}
+        ready = [(-height[pkg], position[pkg], pkg) for pkg in packages if not deps[pkg]]
+        heapq.heapify(ready)
+        running: Dict["asyncio.Task[R]", str] = {}
+        started: Dict[str, float] = {}
+        blocked: Set[str] = set()
+        failed = False
+        start = time.perf_counter()
+
+        while ready or running:
+            while ready and len(running) < self.max_workers and not (failed and self.fail_fast):
+                _, _, pkg = heapq.heappop(ready)
+                started[pkg] = time.perf_counter()
+                running[asyncio.ensure_future(task(pkg))] = pkg
+
+            if not running:
+                break
+
+            done, _ = await asyncio.wait(running, return_when=asyncio.FIRST_COMPLETED)
+            for finished in done:
+                pkg = running.pop(finished)
+                result = finished.result()
+                report.results[pkg] = result
+                report.durations[pkg] = time.perf_counter() - started[pkg]
+
+                if not result.success:
+                    failed = True
+                    blocked.update(self._downstream(pkg, dependents))
+                    continue
+
+                for dependent in dependents[pkg]:
+                    pending[dependent] -= 1
+                    if pending[dependent] == 0 and dependent not in blocked:
+                        heapq.heappush(ready, (-height[dependent], position[dependent], dependent))
+
+        report.wall_time = time.perf_counter() - start
+        report.skipped = [pkg for pkg in packages if pkg not in report.results]
+        report.critical_path, report.critical_path_duration = self._critical_path(
+            order, deps, report.durations
+        )
+        return report
+
+    @staticmethod
+    def _topological_order(
+        packages: List[str], deps: Dict[str, Set[str]], dependents: Dict[str, List[str]]
+    ) -> List[str]:
+        """Order packages so that every package comes after its dependencies."""
+        remaining = {pkg: len(pkg_deps) for pkg, pkg_deps in deps.items()}
+        order = [pkg for pkg in packages if not remaining[pkg]]
+        for pkg in order:
+            for dependent in dependents[pkg]:
+                remaining[dependent] -= 1
+                if remaining[dependent] == 0:
+                    order.append(dependent)
+
+        if len(order) != len(packages):
+            cycle = sorted(pkg for pkg, count in remaining.items() if count)
+            raise MonoRepoError(f"Dependency cycle between packages: {', '.join(cycle)}")
+        return order
+
+    @staticmethod
+    def _heights(order: List[str], dependents: Dict[str, List[str]]) -> Dict[str, int]:
+        """Compute the length of the longest chain of dependents of every package."""
+        height: Dict[str, int] = {}
+        for pkg in reversed(order):
+            height[pkg] = 1 + max((height[dep] for dep in dependents[pkg]), default=0)
+        return height
+
+    @staticmethod
+    def _downstream(package: str, dependents: Dict[str, List[str]]) -> Set[str]:
+        """Collect every package depending on a package."""
+        seen: Set[str] = set()
+        stack = list(dependents[package])
+        while stack:
+            pkg = stack.pop()
+            if pkg not in seen:
+                seen.add(pkg)
+                stack.extend(dependents[pkg])
+        return seen
+
+    @staticmethod
+    def _critical_path(
+        order: List[str], deps: Dict[str, Set[str]], durations: Dict[str, float]
+    ) -> Tuple[List[str], float]:
+        """Find the chain of dependent packages with the largest total duration."""
+        finish: Dict[str, float] = {}
+        previous: Dict[str, str] = {}
+        for pkg in order:
+            if pkg not in durations:
+                continue
+            best = 0.0
+            for dep in deps[pkg]:
+                if dep in finish and finish[dep] > best:
+                    best = finish[dep]
+                    previous[pkg] = dep
+            finish[pkg] = best + durations[pkg]
+
+        if not finish:
+            return [], 0.0
+
+        last = max(finish, key=lambda pkg: finish[pkg])
+        path = [last]
+        while path[-1] in previous:
+            path.append(previous[path[-1]])
+        path.reverse()
+        return path, finish[last]
@@ -0,0 +1,88 @@
+"""Copyright (C) 2024 Felipe Pimentel <fpimentel88@gmail.com>
+
+This module reads TOML files with the fastest parser available. Read-only code paths use it;
+tomlkit, which preserves formatting, is only used where files are edited.
+"""
+
+import os
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Dict, Tuple
+
+try:
+    import tomllib
+except ModuleNotFoundError:  # Python 3.10, where tomli is a declared dependency
+    try:
+        import tomli as tomllib  # type: ignore[no-redef]
+    except ModuleNotFoundError:  # Environments installed without it fall back to tomlkit
+        tomllib = None  # type: ignore[assignment]
+
+# Parsed files kept in memory, keyed by path, mtime and size
+PARSE_CACHE_SIZE = 1024
+
+_parse_cache: "OrderedDict[Tuple[str, int, int], Dict[str, Any]]" = OrderedDict()
+_parse_cache_lock = threading.Lock()
+
+
+def loads(text: str) -> Dict[str, Any]:
+    """Parse a TOML document into plain Python values
+
+    Uses tomllib, or tomli on Python 3.10, and falls back to tomlkit when neither is installed.
+
+    Args:
+        text: TOML document
+
+    Returns:
+        Parsed document
+
+    Raises:
+        ValueError: If the document is not valid TOML
+    """
+    if tomllib is not None:
+        parsed: Dict[str, Any] = tomllib.loads(text)
+        return parsed
+
+    from poetflow.types.tomlkit import parse
+
+    document: Any = parse(text)
+    data: Dict[str, Any] = document.unwrap()
+    return data
+
+
+def load(path: Path) -> Dict[str, Any]:
+    """Parse a TOML file, reusing the result while the file is unchanged
+
+    Results are shared between callers and must not be modified.
+
+    Args:
+        path: TOML file
+
+    Returns:
+        Parsed document
+
+    Raises:
+        OSError: If the file cannot be read
+        ValueError: If the file is not valid TOML
+    """
+    stat = os.stat(path)
+    key = (os.path.abspath(path), stat.st_mtime_ns, stat.st_size)
+    with _parse_cache_lock:
+        data = _parse_cache.get(key)
+        if data is not None:
+            _parse_cache.move_to_end(key)
+            return data
+
+    with open(path, "rb") as f:
+        data = loads(f.read().decode("utf-8"))
+    with _parse_cache_lock:
+        _parse_cache[key] = data
+        if len(_parse_cache) > PARSE_CACHE_SIZE:
+            _parse_cache.popitem(last=False)
+    return data
+
+
+def clear_cache() -> None:
+    """Forget every parsed file."""
+    with _parse_cache_lock:
+        _parse_cache.clear()
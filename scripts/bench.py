@@ -0,0 +1,17 @@
+"""Script to run benchmarks."""
+
+import subprocess
+import sys
+
+
+def main() -> int:
+    """Run the benchmark suite."""
+    try:
+        subprocess.run([sys.executable, "-m", "benchmarks.suite", *sys.argv[1:]], check=True)
+        return 0
+    except subprocess.CalledProcessError as e:
+        return e.returncode
+
+
+if __name__ == "__main__":
+    sys.exit(main())
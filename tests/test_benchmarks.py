@@ -0,0 +1,36 @@
+"""Tests for the benchmark suite."""
+
+from pathlib import Path
+
+from benchmarks.suite import run_size
+from benchmarks.synthetic import generate_monorepo
+from poetflow.core.config import Config
+from poetflow.core.monorepo import MonoRepo
+
+
+def test_generated_monorepo_matches_graph(tmp_path: Path) -> None:
+    """Test the synthetic monorepo is discovered with the generated dependency graph."""
+    graph = generate_monorepo(tmp_path, 30, fan_out=2, depth=3)
+    monorepo = MonoRepo(Config(root_dir=tmp_path))
+
+    assert sorted(monorepo.packages) == sorted(graph)
+    for package, deps in graph.items():
+        assert monorepo.dependency_manager.get_dependencies(package) == set(deps)
+    assert graph["pkg-00000"] == []
+    assert len(graph["pkg-00029"]) == 2
+
+
+def test_run_size_reports_every_benchmark(tmp_path: Path) -> None:
+    """Test a small run produces a timing for every benchmark."""
+    results = run_size(tmp_path, 10, fan_out=2, depth=3, repeat=1)
+
+    assert set(results) == {
+        "discovery_cold",
+        "discovery_warm",
+        "dependency_manager",
+        "dependency_manager_snapshot",
+        "build_order",
+        "all_dependents",
+        "version_bump",
+        "changelog_render",
+    }
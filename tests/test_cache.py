@@ -0,0 +1,80 @@
+"""Tests for CacheManager."""
+
+import os
+from pathlib import Path
+
+from poetflow.core.cache import ARTIFACT, GRAPH, CacheManager
+
+
+def test_round_trips_entries(tmp_path: Path) -> None:
+    """Test JSON and raw entries can be written and read back."""
+    cache = CacheManager(tmp_path)
+    key = CacheManager.key("graph", {"b": 1, "a": [1, 2]})
+
+    assert cache.get(GRAPH, key) is None
+    cache.set(GRAPH, key, {"core": []})
+    assert cache.get(GRAPH, key) == {"core": []}
+
+    cache.set_bytes(GRAPH, "raw", b"\x00data")
+    assert cache.get_bytes(GRAPH, "raw") == b"\x00data"
+
+
+def test_key_is_order_independent_for_mappings() -> None:
+    """Test keys only depend on the content of their inputs."""
+    assert CacheManager.key({"a": 1, "b": 2}) == CacheManager.key({"b": 2, "a": 1})
+    assert CacheManager.key("ab", "c") != CacheManager.key("a", "bc")
+
+
+def test_get_or_compute_only_computes_on_miss(tmp_path: Path) -> None:
+    """Test get_or_compute stores the computed value."""
+    cache = CacheManager(tmp_path)
+    calls = []
+
+    def compute() -> int:
+        calls.append(1)
+        return 42
+
+    assert cache.get_or_compute(GRAPH, "answer", compute) == 42
+    assert cache.get_or_compute(GRAPH, "answer", compute) == 42
+    assert len(calls) == 1
+
+
+def test_evicts_least_recently_used_entries(tmp_path: Path) -> None:
+    """Test entries are evicted in LRU order once the size cap is exceeded."""
+    cache = CacheManager(tmp_path, max_size=250)
+    for index, key in enumerate(["first", "second"]):
+        cache.set_bytes(ARTIFACT, key, b"x" * 100)
+        path = cache._path(ARTIFACT, key)
+        assert path is not None
+        os.utime(path, (1000 + index, 1000 + index))
+
+    # Reading "first" makes "second" the least recently used entry
+    assert cache.get_bytes(ARTIFACT, "first") is not None
+    cache.set_bytes(ARTIFACT, "third", b"x" * 100)
+
+    assert cache.get_bytes(ARTIFACT, "first") is not None
+    assert cache.get_bytes(ARTIFACT, "second") is None
+    assert cache.get_bytes(ARTIFACT, "third") is not None
+
+
+def test_put_file_stores_artifacts(tmp_path: Path) -> None:
+    """Test files can be stored and retrieved."""
+    cache = CacheManager(tmp_path / "cache")
+    wheel = tmp_path / "pkg-0.1.0-py3-none-any.whl"
+    wheel.write_bytes(b"wheel")
+
+    key = CacheManager.key(wheel.read_bytes())
+    stored = cache.put_file(ARTIFACT, key, wheel)
+
+    assert stored is not None
+    assert cache.get_file(ARTIFACT, key) == stored
+    assert stored.read_bytes() == b"wheel"
+
+
+def test_disabled_cache_misses() -> None:
+    """Test a cache without a directory never stores anything."""
+    cache = CacheManager(None)
+    cache.set(GRAPH, "key", 1)
+
+    assert not cache.enabled
+    assert cache.get(GRAPH, "key") is None
@@ -0,0 +1,81 @@
+"""Tests for ChangelogGenerator."""
+
+from pathlib import Path
+
+from poetflow.core.changelog import ChangelogGenerator
+from poetflow.types.versioning import CommitInfo
+from poetflow.utils import fs
+from poetflow.utils.fs import atomic_prepend_bytes
+from tests.test_changes import git
+from tests.test_version_command import commit
+
+
+def test_atomic_prepend_streams_existing_content(tmp_path: Path) -> None:
+    """Test prepending keeps the existing content intact across chunk boundaries."""
+    path = tmp_path / "file.txt"
+    atomic_prepend_bytes(path, b"first\n")
+    atomic_prepend_bytes(path, b"second\n", chunk_size=3)
+
+    assert path.read_bytes() == b"second\nfirst\n"
+    assert [p.name for p in tmp_path.iterdir()] == ["file.txt"]
+
+
+def test_write_changelog_keeps_file_permissions(tmp_path: Path) -> None:
+    """Test prepending releases keeps the changelog mode, and new files follow the umask."""
+    generator = ChangelogGenerator(tmp_path)
+    changelog = tmp_path / "CHANGELOG.md"
+    generator.write_changelog("0.1.0", [CommitInfo.parse("feat: first")])
+    assert changelog.stat().st_mode & 0o777 == 0o666 & ~fs._UMASK
+
+    changelog.chmod(0o664)
+    generator.write_changelog("0.2.0", [CommitInfo.parse("fix: second")])
+    assert changelog.stat().st_mode & 0o777 == 0o664
+
+
+def test_write_changelog_prepends_each_release_once(tmp_path: Path) -> None:
+    """Test new releases go on top and already released versions are skipped."""
+    generator = ChangelogGenerator(tmp_path, cache_dir=tmp_path / "cache")
+    changelog = tmp_path / "CHANGELOG.md"
+
+    assert generator.write_changelog("0.1.0", [CommitInfo.parse("feat: first")])
+    assert generator.write_changelog("0.2.0", [CommitInfo.parse("fix: second")])
+    assert not generator.write_changelog("0.1.0", [CommitInfo.parse("feat: again")])
+
+    assert len(list((tmp_path / "cache" / "changelogs").glob("*.json"))) == 1
+    content = changelog.read_text()
+    assert content.index("## 0.2.0") < content.index("## 0.1.0")
+    assert "again" not in content
+
+
+def test_existing_changelog_versions_are_indexed(tmp_path: Path) -> None:
+    """Test changelogs written before the index existed are not given duplicate entries."""
+    changelog = tmp_path / "CHANGELOG.md"
+    changelog.write_text("## 1.0.0\n\n- legacy\n")
+    generator = ChangelogGenerator(tmp_path)
+
+    assert not generator.write_changelog("1.0.0", [])
+    assert generator.write_changelog("1.1.0", [])
+    assert not generator.write_changelog("1.0.0", [])
+    assert changelog.read_text().endswith("## 1.0.0\n\n- legacy\n")
+
+
+def test_write_changelogs_for_several_packages(tmp_path: Path) -> None:
+    """Test a batch release writes one changelog per package from a single history scan."""
+    git(tmp_path, "init", "-q", "-b", "main")
+    commit(tmp_path, "packages/core/a.py", "feat(core): add parser")
+    commit(tmp_path, "packages/api/b.py", "fix(api): handle timeouts")
+    paths = {name: tmp_path / "packages" / name for name in ("core", "api")}
+    generator = ChangelogGenerator(tmp_path)
+
+    assert generator.write_changelogs({"core": "0.2.0", "api": "0.1.1"}, paths) == {
+        "core": True,
+        "api": True,
+    }
+    assert generator.write_changelogs({"core": "0.2.0"}, paths) == {"core": False}
+
+    # The index of released versions stays out of the package directories
+    assert sorted(path.name for path in paths["core"].iterdir()) == ["CHANGELOG.md", "a.py"]
+    core = (paths["core"] / "CHANGELOG.md").read_text()
+    api = (paths["api"] / "CHANGELOG.md").read_text()
+    assert "add parser" in core and "handle timeouts" not in core
+    assert "handle timeouts" in api and "add parser" not in api
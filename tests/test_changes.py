@@ -0,0 +1,140 @@
+"""Tests for git-diff-driven change detection."""
+
+import subprocess
+from pathlib import Path
+
+from poetflow.core.changes import PathTrie
+from poetflow.core.ci import CIManager
+from poetflow.core.config import Config
+from poetflow.core.monorepo import MonoRepo
+from tests.test_discovery import write_package
+
+
+def git(cwd: Path, *args: str) -> None:
+    """Run a git command quietly."""
+    subprocess.run(
+        ["git", "-c", "user.name=test", "-c", "user.email=test@example.com", *args],
+        cwd=cwd,
+        check=True,
+        capture_output=True,
+    )
+
+
+def test_path_trie_finds_deepest_owner() -> None:
+    """Test files map to the innermost package containing them."""
+    trie = PathTrie()
+    trie.insert("packages/api", "api")
+    trie.insert("packages/api/plugins/auth", "auth")
+    trie.insert("packages/core", "core")
+
+    assert trie.find("packages/api/src/main.py") == "api"
+    assert trie.find("packages/api/plugins/auth/pyproject.toml") == "auth"
+    assert trie.find("packages/core") == "core"
+    assert trie.find("packages/corelib/x.py") is None
+    assert trie.find("README.md") is None
+
+
+def test_affected_packages_follow_reverse_dependencies(tmp_path: Path) -> None:
+    """Test changed packages are expanded to their dependents."""
+    packages_dir = tmp_path / "packages"
+    core = write_package(packages_dir, "core")
+    write_package(packages_dir, "api", deps=("core",))
+    write_package(packages_dir, "cli", deps=("api",))
+    write_package(packages_dir, "docs")
+    (tmp_path / ".gitignore").write_text(".poetflow/\n")
+
+    git(tmp_path, "init", "-q", "-b", "main")
+    git(tmp_path, "add", ".")
+    git(tmp_path, "commit", "-q", "-m", "initial")
+
+    monorepo = MonoRepo(Config(root_dir=tmp_path, base_ref="main"))
+    assert monorepo.get_affected_packages() == set()
+
+    (core / "module.py").write_text("VALUE = 1\n")
+    (tmp_path / "README.md").write_text("docs\n")
+    git(tmp_path, "add", ".")
+    git(tmp_path, "commit", "-q", "-m", "change core")
+
+    assert monorepo.get_affected_packages("HEAD~1") == {"core", "api", "cli"}
+    ci = CIManager(monorepo)
+    assert ci.dependency_manager is monorepo.dependency_manager
+    assert ci.get_dependent_packages("HEAD~1") == {"api", "cli"}
+
+    # Every locked entry is new, and every package requires requests
+    (tmp_path / "poetry.lock").write_text(LOCK.format(urllib3="2.0.0", botocore="1.34.0"))
+    assert monorepo.get_affected_packages("HEAD") == {"core", "api", "cli", "docs"}
+
+    (tmp_path / "pyproject.toml").write_text("[tool.poetry]\n")
+    assert monorepo.get_affected_packages("HEAD") == {"core", "api", "cli", "docs"}
+
+
+LOCK = """
+[[package]]
+name = "requests"
+version = "2.31.0"
+
+[package.dependencies]
+urllib3 = ">=1.21.1"
+
+[[package]]
+name = "urllib3"
+version = "{urllib3}"
+
+[[package]]
+name = "boto3"
+version = "1.34.0"
+
+[package.dependencies]
+botocore = ">=1.34.0"
+
+[[package]]
+name = "botocore"
+version = "{botocore}"
+
+[[package]]
+name = "pytest"
+version = "8.0.0"
+"""
+
+
+def test_lock_changes_affect_packages_requiring_changed_entries(tmp_path: Path) -> None:
+    """Test a lock change affects only the packages whose dependency closure changed."""
+    packages_dir = tmp_path / "packages"
+    write_package(packages_dir, "core")
+    write_package(packages_dir, "api", deps=("core",))
+    worker = packages_dir / "worker"
+    worker.mkdir()
+    (worker / "pyproject.toml").write_text(
+        '[tool.poetry]\nname = "worker"\nversion = "0.1.0"\n\n'
+        '[tool.poetry.dependencies]\npython = "^3.10"\nboto3 = "^1.34"\n'
+    )
+    lock = tmp_path / "poetry.lock"
+    lock.write_text(LOCK.format(urllib3="2.0.0", botocore="1.34.0"))
+    (tmp_path / ".gitignore").write_text(".poetflow/\n")
+    git(tmp_path, "init", "-q", "-b", "main")
+    git(tmp_path, "add", ".")
+    git(tmp_path, "commit", "-q", "-m", "initial")
+    monorepo = MonoRepo(Config(root_dir=tmp_path, base_ref="main"))
+
+    # A transitive upgrade reaches core through requests, and api through core
+    lock.write_text(LOCK.format(urllib3="2.2.0", botocore="1.34.0"))
+    assert monorepo.get_affected_packages() == {"core", "api"}
+
+    lock.write_text(LOCK.format(urllib3="2.0.0", botocore="1.34.5"))
+    assert monorepo.get_affected_packages() == {"worker"}
+
+    # Removed entries are traced through the lock they were removed from
+    without_botocore = LOCK.replace('[[package]]\nname = "botocore"\nversion = "{botocore}"\n', "")
+    lock.write_text(without_botocore.format(urllib3="2.0.0"))
+    assert monorepo.get_affected_packages() == {"worker"}
+
+
+def test_unknown_ref_affects_everything(tmp_path: Path) -> None:
+    """Test a failing git diff falls back to all packages, in CI too."""
+    write_package(tmp_path / "packages", "core")
+    git(tmp_path, "init", "-q")
+
+    monorepo = MonoRepo(Config(root_dir=tmp_path))
+
+    assert monorepo.get_affected_packages("does-not-exist") == {"core"}
+    assert CIManager(monorepo).get_dependent_packages("does-not-exist") == {"core"}
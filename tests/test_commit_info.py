@@ -0,0 +1,67 @@
+"""Tests for CommitInfo.parse."""
+
+from poetflow.types.versioning import CommitInfo
+
+
+def test_parses_header_without_touching_message() -> None:
+    """Test "!" marks breaking changes only before the colon."""
+    commit = CommitInfo.parse("feat(api)!: drop v1")
+    assert (commit.type, commit.scope, commit.message, commit.breaking) == (
+        "feat",
+        "api",
+        "drop v1",
+        True,
+    )
+
+    commit = CommitInfo.parse("fix: handle a!b names")
+    assert commit.message == "handle a!b names"
+    assert not commit.breaking
+
+
+def test_parses_body_and_footers() -> None:
+    """Test multi-line bodies and trailers are separated, with footer continuations."""
+    commit = CommitInfo.parse(
+        "refactor: rename helpers\n\n"
+        "First paragraph.\n\nSecond paragraph.\n\n"
+        "Refs #12\n"
+        "BREAKING CHANGE: helpers moved\n"
+        "  to another module\n"
+        "Signed-off-by: Jane <jane@example.com>\n"
+    )
+
+    assert commit.body == "First paragraph.\n\nSecond paragraph."
+    assert commit.footers == (
+        ("Refs", "12"),
+        ("BREAKING CHANGE", "helpers moved\n  to another module"),
+        ("Signed-off-by", "Jane <jane@example.com>"),
+    )
+    assert commit.breaking
+
+
+def test_parses_reverts() -> None:
+    """Test both git's default and the conventional revert formats."""
+    git_revert = CommitInfo.parse('Revert "feat: add x"\n\nThis reverts commit abc123.')
+    conventional = CommitInfo.parse("revert: feat: add x")
+
+    for commit in (git_revert, conventional):
+        assert commit.type == "revert"
+        assert commit.reverts == "feat: add x"
+    assert git_revert.body == "This reverts commit abc123."
+
+
+def test_non_conventional_messages() -> None:
+    """Test other messages keep their subject and can still be breaking through footers."""
+    commit = CommitInfo.parse("Update README\n\nBREAKING-CHANGE: docs moved")
+
+    assert (commit.type, commit.message, commit.breaking) == ("other", "Update README", True)
+
+
+def test_memoizes_by_commit_hash() -> None:
+    """Test commits parsed with a hash record it and are reused."""
+    first = CommitInfo.parse("feat: add cache", commit_hash="abc123")
+    assert first.hash == "abc123"
+
+    assert CommitInfo.parse("feat: add cache", commit_hash="abc123") is first
+    unhashed = CommitInfo.parse("feat: add cache")
+    assert unhashed is not first
+    assert unhashed.hash is None
@@ -0,0 +1,48 @@
+"""Tests for conventional commit classification."""
+
+from pathlib import Path
+
+from poetflow.core import changelog, versioning
+from poetflow.core.commits import DEFAULT_SECTIONS, PERFORMANCE, REFACTORING, classify_commits
+from poetflow.types.versioning import CommitInfo
+
+COMMITS = [
+    CommitInfo.parse("feat(api): add endpoint"),
+    CommitInfo.parse("fix: handle timeouts"),
+    CommitInfo(type="feat", scope=None, message="drop v1", breaking=True),
+    CommitInfo.parse("perf: cache lookups"),
+    CommitInfo.parse("chore: tidy up"),
+]
+
+
+def test_classifies_commits_into_sections() -> None:
+    """Test commits land in their section, breaking ones only under breaking changes."""
+    buckets = classify_commits(COMMITS)
+
+    assert [(title, [c.message for c in commits]) for title, commits in buckets] == [
+        ("Breaking Changes", ["drop v1"]),
+        ("Features", ["add endpoint"]),
+        ("Bug Fixes", ["handle timeouts"]),
+    ]
+    assert buckets.bump == "major"
+
+
+def test_custom_sections_drive_the_bump() -> None:
+    """Test extra sections are reported and can cause a version bump on their own."""
+    sections = (*DEFAULT_SECTIONS, PERFORMANCE, REFACTORING)
+
+    assert [title for title, _ in classify_commits(COMMITS, sections)][-1] == (
+        "Performance Improvements"
+    )
+    assert classify_commits(COMMITS[3:], sections).bump == "patch"
+    assert classify_commits(COMMITS[3:]).bump is None
+    assert classify_commits(COMMITS[:2]).bump == "minor"
+
+
+def test_changelog_generators_agree() -> None:
+    """Test both changelog generators render the same sections."""
+    project = changelog.ChangelogGenerator(Path(".")).generate_markdown("1.0.0", COMMITS)
+    monorepo = versioning.ChangelogGenerator().generate_markdown("1.0.0", COMMITS)
+
+    assert project.split("\n")[2:] == monorepo.split("\n")[4:]
+    assert project.count("drop v1") == 1
@@ -0,0 +1,89 @@
+"""Tests for DependencyManager."""
+
+from typing import Any, Dict, List, Mapping, Optional
+
+from poetflow.core.dependencies import DependencyManager
+
+
+class FakeMonoRepo:
+    """In-memory monorepo built from a dependency mapping."""
+
+    def __init__(self, graph: Dict[str, List[str]]) -> None:
+        self.graph = graph
+        self.versions: Dict[str, str] = {}
+
+    @property
+    def root(self) -> str:
+        return "."
+
+    @property
+    def packages(self) -> List[str]:
+        return list(self.graph)
+
+    def get_all_packages(self) -> List[str]:
+        return self.packages
+
+    def get_package_info(self, name: str) -> Optional[Dict[str, Any]]:
+        if name not in self.graph:
+            return None
+        return {
+            "name": name,
+            "version": self.versions.get(name, "0.1.0"),
+            "path": name,
+            "dependencies": self.graph[name],
+        }
+
+    def set_package_versions(self, versions: Mapping[str, str]) -> None:
+        self.versions.update(versions)
+
+
+def test_ignores_third_party_dependencies() -> None:
+    """Test only monorepo packages become graph edges."""
+    manager = DependencyManager(FakeMonoRepo({"core": ["requests"], "api": ["Core", "httpx"]}))
+
+    assert manager.get_dependencies("api") == {"core"}
+    assert manager.get_dependencies("core") == set()
+    assert manager.get_build_order() == ["core", "api"]
+
+
+def test_get_all_dependents_on_diamond() -> None:
+    """Test transitive dependents on a diamond shaped graph."""
+    manager = DependencyManager(
+        FakeMonoRepo({"base": [], "left": ["base"], "right": ["base"], "top": ["left", "right"]})
+    )
+
+    assert manager.get_direct_dependents("base") == {"left", "right"}
+    assert manager.get_all_dependents("base") == {"left", "right", "top"}
+    assert manager.get_all_dependents("left") == {"top"}
+    assert manager.get_all_dependents("top") == set()
+
+
+def test_get_all_dependents_terminates_on_cycles() -> None:
+    """Test dependency cycles do not recurse forever."""
+    manager = DependencyManager(FakeMonoRepo({"a": ["c"], "b": ["a"], "c": ["b"], "d": ["c"]}))
+
+    assert manager.get_all_dependents("a") == {"a", "b", "c", "d"}
+    assert manager.get_all_dependents("d") == set()
+
+
+def test_get_dependents_of_batch() -> None:
+    """Test the batch query returns the union of transitive dependents."""
+    manager = DependencyManager(
+        FakeMonoRepo({"a": [], "b": ["a"], "c": ["b"], "x": [], "y": ["x"], "z": []})
+    )
+
+    assert manager.get_dependents_of(["a", "x"]) == {"b", "c", "y"}
+    assert manager.get_dependents_of(["a", "b"]) == {"b", "c"}
+    assert manager.get_dependents_of([]) == set()
+
+
+def test_get_all_dependents_scales_on_stacked_diamonds() -> None:
+    """Test stacked diamonds, which took exponential time before, resolve quickly."""
+    graph: Dict[str, List[str]] = {"n0": []}
+    for level in range(1, 200):
+        graph[f"l{level}"] = [f"n{level - 1}"]
+        graph[f"r{level}"] = [f"n{level - 1}"]
+        graph[f"n{level}"] = [f"l{level}", f"r{level}"]
+    manager = DependencyManager(FakeMonoRepo(graph))
+
+    assert len(manager.get_all_dependents("n0")) == len(graph) - 1
@@ -0,0 +1,110 @@
+"""Tests for package discovery."""
+
+import os
+from dataclasses import FrozenInstanceError
+from pathlib import Path
+from unittest.mock import patch
+
+import pytest
+
+from poetflow.core import discovery
+from poetflow.core.config import Config
+from poetflow.core.discovery import PackageDiscovery
+from poetflow.core.monorepo import MonoRepo
+
+
+def write_package(root: Path, name: str, deps: tuple[str, ...] = ()) -> Path:
+    """Write a minimal Poetry package below root."""
+    pkg_dir = root / name
+    pkg_dir.mkdir(parents=True, exist_ok=True)
+    dep_lines = "".join(f'{dep} = {{path = "../{dep}", develop = true}}\n' for dep in deps)
+    (pkg_dir / "pyproject.toml").write_text(
+        "[tool.poetry]\n"
+        f'name = "{name}"\n'
+        'version = "0.1.0"\n\n'
+        "[tool.poetry.dependencies]\n"
+        'python = "^3.10"\n'
+        'requests = "^2.31"\n'
+        f"{dep_lines}"
+        "\n[tool.poetry.group.dev.dependencies]\n"
+        'pytest = "^8.0"\n'
+    )
+    return pkg_dir
+
+
+def test_discovers_packages(tmp_path: Path) -> None:
+    """Test discovery finds nested packages and their dependencies."""
+    packages_dir = tmp_path / "packages"
+    write_package(packages_dir, "core")
+    write_package(packages_dir / "services", "api", deps=("core",))
+    # Hidden directories are skipped
+    write_package(packages_dir / ".hidden", "ghost")
+
+    packages = PackageDiscovery(packages_dir).discover()
+
+    assert set(packages) == {"core", "api"}
+    assert packages["api"].path == packages_dir / "services" / "api"
+    assert packages["api"].version == "0.1.0"
+    assert packages["api"].dependencies == {"requests", "core", "pytest"}
+
+
+def test_index_only_reparses_changed_files(tmp_path: Path) -> None:
+    """Test a warm discovery only parses files whose mtime or size changed."""
+    packages_dir = tmp_path / "packages"
+    index_path = tmp_path / ".poetflow" / "discovery.json"
+    write_package(packages_dir, "core")
+    api_dir = write_package(packages_dir, "api", deps=("core",))
+
+    PackageDiscovery(packages_dir, index_path=index_path).discover()
+    assert index_path.exists()
+
+    with patch.object(discovery, "parse_pyproject", wraps=discovery.parse_pyproject) as parser:
+        packages = PackageDiscovery(packages_dir, index_path=index_path).discover()
+        assert parser.call_count == 0
+        assert set(packages) == {"core", "api"}
+
+        pyproject = api_dir / "pyproject.toml"
+        pyproject.write_text(pyproject.read_text().replace("0.1.0", "0.2.0"))
+        stat = pyproject.stat()
+        os.utime(pyproject, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+
+        packages = PackageDiscovery(packages_dir, index_path=index_path).discover()
+        parser.assert_called_once_with(pyproject)
+        assert packages["api"].version == "0.2.0"
+
+
+def test_monorepo_loads_packages(tmp_path: Path) -> None:
+    """Test MonoRepo populates its packages through discovery."""
+    write_package(tmp_path / "packages", "core")
+    write_package(tmp_path / "packages", "api", deps=("core",))
+
+    monorepo = MonoRepo(Config(root_dir=tmp_path))
+
+    assert sorted(monorepo.packages) == ["api", "core"]
+    info = monorepo.get_package_info("api")
+    assert info is not None
+    assert "core" in info["dependencies"]
+
+
+def test_package_info_is_a_shared_read_only_view(tmp_path: Path) -> None:
+    """Test get_package_info returns the same immutable view instead of copies."""
+    write_package(tmp_path / "packages", "core")
+    write_package(tmp_path / "packages", "api", deps=("core",))
+    monorepo = MonoRepo(Config(root_dir=tmp_path))
+
+    info = monorepo.get_package_info("api")
+    assert info is monorepo.get_package_info("api")
+    assert dict(info or {}) == {
+        "name": "api",
+        "version": "0.1.0",
+        "path": str(tmp_path / "packages" / "api"),
+        "dependencies": frozenset({"core", "requests", "pytest"}),
+        "fingerprint": (info or {})["fingerprint"],
+    }
+    with pytest.raises(TypeError):
+        info["version"] = "1.0.0"  # type: ignore[index]
+
+    core = monorepo._packages["core"]
+    with pytest.raises(FrozenInstanceError):
+        core.version = "1.0.0"  # type: ignore[misc]
+    assert next(iter(monorepo._packages["api"].dependencies & {"core"})) is core.name
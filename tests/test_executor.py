@@ -0,0 +1,65 @@
+"""Tests for ParallelExecutor."""
+
+import asyncio
+import sys
+from pathlib import Path
+from typing import List, Tuple
+
+from poetflow.core.config import Config
+from poetflow.core.monorepo import MonoRepo
+from poetflow.utils.executor import ParallelExecutor
+from tests.test_discovery import write_package
+
+PRINT_LINES = "import sys\nfor i in range(500): print(f'line {i}')\nprint('oops', file=sys.stderr)"
+
+
+def make_monorepo(tmp_path: Path) -> MonoRepo:
+    """Create a monorepo with two packages."""
+    write_package(tmp_path / "packages", "core")
+    write_package(tmp_path / "packages", "api", deps=("core",))
+    return MonoRepo(Config(root_dir=tmp_path))
+
+
+def test_streams_output_lines(tmp_path: Path) -> None:
+    """Test every line is reported while small outputs are kept in full."""
+    lines: List[Tuple[str, str, str]] = []
+    executor = ParallelExecutor(make_monorepo(tmp_path), on_output=lambda *line: lines.append(line))
+
+    results = asyncio.run(executor.run_command([sys.executable, "-c", PRINT_LINES], ["core"]))
+
+    assert results[0].success
+    assert results[0].log_file is None
+    assert results[0].output.splitlines()[0] == "line 0"
+    assert results[0].error == "oops"
+    assert len(lines) == 501
+    assert ("core", "stderr", "oops") in lines
+
+
+def test_spills_large_output_to_log_file(tmp_path: Path) -> None:
+    """Test output past the buffer size goes to a log file and only a tail is kept."""
+    executor = ParallelExecutor(
+        make_monorepo(tmp_path), buffer_size=1024, tail_lines=10, log_dir=tmp_path / "logs"
+    )
+
+    results = asyncio.run(executor.run_command([sys.executable, "-c", PRINT_LINES], ["api"]))
+
+    result = results[0]
+    assert result.success
+    assert result.log_file == tmp_path / "logs" / "api.log"
+    assert result.output.splitlines() == [f"line {i}" for i in range(490, 500)]
+    log = result.log_file.read_text().splitlines()
+    assert len(log) == 501
+    assert log[0] == "line 0"
+
+
+def test_reports_failures(tmp_path: Path) -> None:
+    """Test a failing command produces a failed result."""
+    executor = ParallelExecutor(make_monorepo(tmp_path))
+
+    report = asyncio.run(
+        executor.run_in_dependency_order([sys.executable, "-c", "raise SystemExit(3)"])
+    )
+
+    assert not report.success
+    assert list(report.results) == ["core"]
+    assert report.skipped == ["api"]
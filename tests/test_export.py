@@ -0,0 +1,179 @@
+"""Tests for requirements export."""
+
+from pathlib import Path
+
+import pytest
+
+from poetflow.core.config import Config
+from poetflow.core.exceptions import PackageError
+from poetflow.core.export import RequirementsExporter
+from poetflow.core.lock import LockIndex, clear_index_cache
+from poetflow.core.monorepo import MonoRepo
+
+LOCK = """
+[[package]]
+name = "requests"
+version = "2.31.0"
+files = [
+    {file = "requests-2.31.0.tar.gz", hash = "sha256:bbbb"},
+    {file = "requests-2.31.0-py3-none-any.whl", hash = "sha256:aaaa"},
+]
+
+[package.dependencies]
+urllib3 = ">=1.21.1"
+PySocks = {version = ">=1.5.6", optional = true}
+
+[package.extras]
+socks = ["PySocks (>=1.5.6,!=1.5.7)"]
+
+[[package]]
+name = "urllib3"
+version = "2.0.0"
+files = [{file = "urllib3-2.0.0.tar.gz", hash = "sha256:cccc"}]
+
+[[package]]
+name = "pysocks"
+version = "1.7.1"
+files = []
+
+[[package]]
+name = "colorama"
+version = "0.4.6"
+files = []
+
+[[package]]
+name = "click"
+version = "8.1.7"
+files = []
+
+[package.dependencies]
+colorama = {version = "*", markers = "platform_system == \\"Windows\\""}
+
+[[package]]
+name = "pytest"
+version = "8.0.0"
+files = []
+
+[[package]]
+name = "core"
+version = "0.1.0"
+files = []
+
+[package.source]
+type = "directory"
+url = "packages/core"
+"""
+
+
+def write_project(root: Path, name: str, dependencies: str, dev: str = "") -> None:
+    """Write a package with the given dependency tables."""
+    pkg_dir = root / "packages" / name
+    pkg_dir.mkdir(parents=True)
+    (pkg_dir / "pyproject.toml").write_text(
+        "[tool.poetry]\n"
+        f'name = "{name}"\n'
+        'version = "0.1.0"\n\n'
+        "[tool.poetry.dependencies]\n"
+        'python = "^3.10"\n'
+        f"{dependencies}"
+        "\n[tool.poetry.group.dev.dependencies]\n"
+        f"{dev}"
+    )
+
+
+@pytest.fixture
+def exporter(tmp_path: Path) -> RequirementsExporter:
+    """Create an exporter over a monorepo with a shared lock file."""
+    write_project(
+        tmp_path,
+        "core",
+        'requests = {version = "^2.31", extras = ["socks"]}\n',
+        dev='pytest = "^8.0"\n',
+    )
+    write_project(
+        tmp_path,
+        "api",
+        'core = {path = "../core", develop = true}\n'
+        'click = "^8.1"\n'
+        'unused = {version = "^1.0", optional = true}\n',
+    )
+    write_project(tmp_path, "docs", 'click = "^8.1"\n')
+    (tmp_path / "poetry.lock").write_text(LOCK)
+    monorepo = MonoRepo(Config(root_dir=tmp_path))
+    return RequirementsExporter(monorepo, monorepo.dependency_manager)
+
+
+def test_requirements_follow_local_and_locked_dependencies(
+    exporter: RequirementsExporter,
+) -> None:
+    """Test the export covers monorepo dependencies, extras and markers, but not dev groups."""
+    assert exporter.requirements("api") == [
+        "click==8.1.7",
+        'colorama==0.4.6 ; platform_system == "Windows"',
+        "pysocks==1.7.1",
+        "requests==2.31.0 \\\n    --hash=sha256:aaaa \\\n    --hash=sha256:bbbb",
+        "urllib3==2.0.0 \\\n    --hash=sha256:cccc",
+    ]
+    assert exporter.requirements("docs") == [
+        "click==8.1.7",
+        'colorama==0.4.6 ; platform_system == "Windows"',
+    ]
+
+    exporter.with_hashes = False
+    assert "requests==2.31.0" in exporter.requirements("core")
+    with pytest.raises(PackageError, match="not found"):
+        exporter.requirements("missing")
+
+
+def test_export_all_parses_the_lock_once(
+    exporter: RequirementsExporter, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """Test exporting every package writes one file each from a single lock parse."""
+    clear_index_cache()
+    parse = LockIndex.parse
+    parses = []
+
+    def counting_parse(content: bytes) -> LockIndex:
+        parses.append(content)
+        return parse(content)
+
+    monkeypatch.setattr(LockIndex, "parse", counting_parse)
+
+    written = exporter.export_all(tmp_path / "requirements")
+
+    assert sorted(written) == ["api", "core", "docs"]
+    assert written["docs"].read_text().startswith("click==8.1.7\n")
+    assert len(parses) == 1
+
+
+def test_unlocked_requirement_is_reported(tmp_path: Path) -> None:
+    """Test a dependency missing from the lock file fails the export."""
+    write_project(tmp_path, "api", 'httpx = "^0.27"\n')
+    (tmp_path / "poetry.lock").write_text(LOCK)
+    monorepo = MonoRepo(Config(root_dir=tmp_path))
+
+    with pytest.raises(PackageError, match="httpx is required by api but not locked"):
+        RequirementsExporter(monorepo, monorepo.dependency_manager).requirements("api")
+
+
+def test_markers_are_propagated_to_transitive_requirements(tmp_path: Path) -> None:
+    """Test markers are joined with "and" along a path and with "or" across paths."""
+    write_project(
+        tmp_path,
+        "cli",
+        'click = {version = "^8.1", markers = "python_version >= \\"3.11\\""}\n'
+        'colorama = {version = "*", markers = "sys_platform == \\"win32\\""}\n'
+        'requests = {version = "^2.31", markers = "sys_platform == \\"linux\\""}\n'
+        'urllib3 = "^2.0"\n',
+    )
+    (tmp_path / "poetry.lock").write_text(LOCK)
+    monorepo = MonoRepo(Config(root_dir=tmp_path))
+    exporter = RequirementsExporter(monorepo, monorepo.dependency_manager, with_hashes=False)
+
+    assert exporter.requirements("cli") == [
+        'click==8.1.7 ; python_version >= "3.11"',
+        'colorama==0.4.6 ; ((platform_system == "Windows") and (python_version >= "3.11"))'
+        ' or (sys_platform == "win32")',
+        'requests==2.31.0 ; sys_platform == "linux"',
+        "urllib3==2.0.0",
+    ]
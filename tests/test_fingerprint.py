@@ -0,0 +1,76 @@
+"""Tests for package fingerprints."""
+
+from pathlib import Path
+
+from poetflow.core.config import Config
+from poetflow.core.fingerprint import PackageFingerprinter
+from poetflow.core.monorepo import MonoRepo
+from tests.test_discovery import write_package
+
+LOCK = """
+[[package]]
+name = "requests"
+version = "{requests}"
+
+[package.dependencies]
+urllib3 = ">=1.21.1"
+
+[[package]]
+name = "urllib3"
+version = "{urllib3}"
+
+[[package]]
+name = "pytest"
+version = "8.0.0"
+
+[[package]]
+name = "unrelated"
+version = "{unrelated}"
+"""
+
+
+def write_lock(root: Path, urllib3: str = "2.0.0", unrelated: str = "1.0") -> None:
+    """Write a small poetry.lock."""
+    (root / "poetry.lock").write_text(
+        LOCK.format(requests="2.31.0", urllib3=urllib3, unrelated=unrelated)
+    )
+
+
+def fingerprints(root: Path) -> dict[str, str]:
+    """Compute fresh fingerprints for every package."""
+    monorepo = MonoRepo(Config(root_dir=root))
+    fingerprinter = PackageFingerprinter(monorepo, monorepo.dependency_manager)
+    return {package: fingerprinter.fingerprint(package) for package in monorepo.packages}
+
+
+def test_fingerprints_follow_sources_and_dependencies(tmp_path: Path) -> None:
+    """Test a source change propagates to dependents but not to dependencies."""
+    core = write_package(tmp_path / "packages", "core")
+    write_package(tmp_path / "packages", "api", deps=("core",))
+    docs = write_package(tmp_path / "packages", "docs")
+    write_lock(tmp_path)
+    before = fingerprints(tmp_path)
+
+    (core / "module.py").write_text("VALUE = 1\n")
+    after = fingerprints(tmp_path)
+    assert after["core"] != before["core"]
+    assert after["api"] != before["api"]
+    assert after["docs"] == before["docs"]
+
+    # Caches are not part of the fingerprint
+    (docs / "__pycache__").mkdir()
+    (docs / "__pycache__" / "mod.pyc").write_bytes(b"\0")
+    assert fingerprints(tmp_path)["docs"] == before["docs"]
+
+
+def test_fingerprints_follow_used_lock_entries(tmp_path: Path) -> None:
+    """Test transitive third-party upgrades change the fingerprint of their users."""
+    write_package(tmp_path / "packages", "core")
+    write_lock(tmp_path)
+    before = fingerprints(tmp_path)
+
+    write_lock(tmp_path, unrelated="2.0")
+    assert fingerprints(tmp_path)["core"] == before["core"]
+
+    write_lock(tmp_path, urllib3="2.1.0")
+    assert fingerprints(tmp_path)["core"] != before["core"]
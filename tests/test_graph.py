@@ -0,0 +1,74 @@
+"""Tests for the dependency graph snapshot."""
+
+from pathlib import Path
+from unittest.mock import patch
+
+from poetflow.core import dependencies
+from poetflow.core.dependencies import DependencyManager
+from poetflow.core.graph import GraphSnapshot, dependency_fingerprint
+from tests.test_dependencies import FakeMonoRepo
+
+
+def test_snapshot_round_trip() -> None:
+    """Test a snapshot survives serialization."""
+    graph = {"core": set(), "api": {"core"}, "cli": {"api", "core"}}
+    fingerprints = {name: dependency_fingerprint(deps) for name, deps in graph.items()}
+
+    snapshot = GraphSnapshot.from_bytes(GraphSnapshot.from_graph(graph, fingerprints).to_bytes())
+
+    assert snapshot.names == ["core", "api", "cli"]
+    assert snapshot.dependencies("cli") == {"api", "core"}
+    assert snapshot.dependencies("missing") is None
+    assert snapshot.fingerprints[1] == fingerprints["api"]
+    assert dependency_fingerprint(["b", "a"]) == dependency_fingerprint(["a", "b"])
+
+
+def test_invalid_snapshots_are_ignored(tmp_path: Path) -> None:
+    """Test missing, foreign or truncated snapshot files are ignored."""
+    path = tmp_path / "graph.bin"
+    assert GraphSnapshot.load(path) is None
+
+    path.write_bytes(b"garbage")
+    assert GraphSnapshot.load(path) is None
+
+    data = GraphSnapshot.from_graph({"a": set()}, {"a": 1}).to_bytes()
+    path.write_bytes(data[:-1])
+    assert GraphSnapshot.load(path) is None
+
+
+def test_only_changed_packages_are_resolved(tmp_path: Path) -> None:
+    """Test a snapshot is reused for packages whose dependencies did not change."""
+    path = tmp_path / "graph.bin"
+    graph = {"core": ["requests"], "api": ["core"], "cli": ["api"]}
+    DependencyManager(FakeMonoRepo(graph), snapshot_path=path)
+    written = path.stat().st_mtime_ns
+
+    with patch.object(
+        dependencies, "canonicalize_name", wraps=dependencies.canonicalize_name
+    ) as canonicalize:
+        manager = DependencyManager(FakeMonoRepo(graph), snapshot_path=path)
+        assert canonicalize.call_count == 0
+        assert manager.get_all_dependents("core") == {"api", "cli"}
+        assert path.stat().st_mtime_ns == written
+
+        graph["cli"] = ["core"]
+        manager = DependencyManager(FakeMonoRepo(graph), snapshot_path=path)
+        assert canonicalize.call_count > 0
+        assert manager.get_dependencies("cli") == {"core"}
+        assert manager.get_direct_dependents("api") == set()
+
+
+def test_added_and_removed_packages(tmp_path: Path) -> None:
+    """Test the snapshot follows packages appearing and disappearing."""
+    path = tmp_path / "graph.bin"
+    DependencyManager(FakeMonoRepo({"api": ["core", "utils"], "core": []}), snapshot_path=path)
+
+    # A new package may satisfy a dependency that used to be third-party
+    manager = DependencyManager(
+        FakeMonoRepo({"api": ["core", "utils"], "core": [], "utils": []}), snapshot_path=path
+    )
+    assert manager.get_dependencies("api") == {"core", "utils"}
+
+    manager = DependencyManager(FakeMonoRepo({"api": ["core", "utils"], "utils": []}), path)
+    assert manager.get_dependencies("api") == {"utils"}
+    assert manager.get_direct_dependents("utils") == {"api"}
@@ -1,5 +1,8 @@
 """Copyright (C) 2024 felipepimentel plc"""
 
+import subprocess
+import sys
+
 
 def test_import() -> None:
     """Test that poetflow can be imported."""
@@ -9,3 +12,47 @@ def test_import() -> None:
         assert True  # If we get here, import succeeded
     except ImportError as e:
         raise AssertionError("Failed to import poetflow") from e
+
+
+def test_plugins_do_not_import_poetry_internals() -> None:
+    """Test creating the plugins leaves Poetry's heavy modules for the commands using them."""
+    code = (
+        "import sys; from pathlib import Path; import poetflow; "
+        "config = poetflow.MonorangerConfig(enabled=True, monorepo_root=Path('..')); "
+        "[plugin(config) for plugin in (poetflow.LockModifier, poetflow.VenvModifier, "
+        "poetflow.PathRewriter, poetflow.MonorepoAdderRemover)]; "
+        "print(' '.join(sorted(m for m in sys.modules if m.startswith('poetry.'))))"
+    )
+    result = subprocess.run(
+        [sys.executable, "-c", code], capture_output=True, text=True, check=True
+    )
+
+    assert result.stdout.split() == []
+
+
+def test_core_does_not_import_commands() -> None:
+    """Test the core modules can be used without loading the commands built on them."""
+    code = (
+        "import sys; import poetflow.core.changelog, poetflow.core.history; "
+        "print(' '.join(sorted(m for m in sys.modules if m.startswith('poetflow.commands'))))"
+    )
+    result = subprocess.run(
+        [sys.executable, "-c", code], capture_output=True, text=True, check=True
+    )
+
+    assert result.stdout.split() == []
+
+
+def test_commands_do_not_import_the_watch_service() -> None:
+    """Test only the watch command loads the watch service and its socket and ctypes modules."""
+    code = (
+        "import sys; import poetflow.commands.build, poetflow.commands.discover, "
+        "poetflow.commands.export, poetflow.commands.test; "
+        "print(' '.join(m for m in ('poetflow.core.watch', 'ctypes', 'socketserver') "
+        "if m in sys.modules))"
+    )
+    result = subprocess.run(
+        [sys.executable, "-c", code], capture_output=True, text=True, check=True
+    )
+
+    assert result.stdout.split() == []
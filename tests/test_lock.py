@@ -0,0 +1,80 @@
+"""Tests for the lock file reader."""
+
+from pathlib import Path
+
+from poetflow.core.lock import LockReader, clear_index_cache
+
+LOCK = """
+[[package]]
+name = "Requests"
+version = "2.31.0"
+
+[package.dependencies]
+urllib3 = ">=1.21.1"
+charset_normalizer = ">=2,<4"
+
+[[package]]
+name = "urllib3"
+version = "2.0.0"
+
+[[package]]
+name = "charset-normalizer"
+version = "3.3.2"
+
+[[package]]
+name = "botocore"
+version = "1.34.0"
+
+[package.dependencies]
+urllib3 = ">=1.25.4"
+
+[[package]]
+name = "boto3"
+version = "1.34.0"
+
+[package.dependencies]
+botocore = ">=1.34.0"
+"""
+
+
+def test_indexes(tmp_path: Path) -> None:
+    """Test lookups by name and by reverse dependency use canonical names."""
+    path = tmp_path / "poetry.lock"
+    path.write_text(LOCK)
+    reader = LockReader(path)
+
+    assert reader.get("requests") == reader.entries["requests"]
+    assert reader.get("REQUESTS") is not None and reader.get("httpx") is None
+    assert reader.dependencies_of("requests") == {"urllib3", "charset-normalizer"}
+    assert reader.dependents_of("urllib3") == {"requests", "botocore"}
+    assert reader.closure(["Requests"]) == {"requests", "urllib3", "charset-normalizer"}
+    assert reader.reverse_closure(["urllib3"]) == {"urllib3", "requests", "botocore", "boto3"}
+
+
+def test_requirers(tmp_path: Path) -> None:
+    """Test finding the projects that pull in a locked package."""
+    path = tmp_path / "poetry.lock"
+    path.write_text(LOCK)
+    requirements = {"api": ["requests"], "worker": ["boto3"], "docs": ["charset_normalizer"]}
+
+    reader = LockReader(path)
+    assert reader.requirers(["urllib3"], requirements) == {"api", "worker"}
+    assert reader.requirers(["charset-normalizer"], requirements) == {"api", "docs"}
+
+
+def test_parsed_locks_are_shared_by_content(tmp_path: Path) -> None:
+    """Test readers of identical content share one parse, and changed content is parsed."""
+    clear_index_cache()
+    first, second = tmp_path / "a.lock", tmp_path / "b.lock"
+    first.write_text(LOCK)
+    second.write_text(LOCK)
+
+    assert LockReader(first).index is LockReader(second).index
+    assert LockReader.from_content(LOCK.encode()).index is LockReader(first).index
+
+    second.write_text(LOCK.replace("2.0.0", "2.2.0"))
+    changed = LockReader(second)
+    assert changed.index is not LockReader(first).index
+    assert changed.entries["urllib3"]["version"] == "2.2.0"
+
+    assert LockReader(tmp_path / "missing.lock").entries == {}
@@ -0,0 +1,119 @@
+"""Tests for the recorded lock inputs."""
+
+import os
+from pathlib import Path
+from typing import cast
+from unittest.mock import MagicMock, patch
+
+from cleo.events.console_command_event import ConsoleCommandEvent
+from cleo.events.console_terminate_event import ConsoleTerminateEvent
+from poetry.console.commands.lock import LockCommand
+from poetry.factory import Factory
+
+from poetflow.core.lockstate import LockState
+from poetflow.plugins.installer import DummyInstaller
+from poetflow.plugins.lock import LockModifier
+from poetflow.types.config import MonorangerConfig
+from tests.test_discovery import write_package
+from tests.types import EventGenerator
+
+
+def make_monorepo(root: Path) -> None:
+    """Create a locked monorepo whose root depends on two packages by path."""
+    packages_dir = root / "packages"
+    write_package(packages_dir, "core")
+    write_package(packages_dir, "api", deps=("core",))
+    (root / "pyproject.toml").write_text(
+        "[tool.poetry]\n"
+        'name = "monorepo"\n'
+        'version = "0.1.0"\n\n'
+        "[tool.poetry.dependencies]\n"
+        'python = "^3.10"\n'
+        'api = {path = "packages/api", develop = true}\n'
+    )
+    (root / "poetry.lock").write_text("# locked\n")
+
+
+def touch(path: Path, text: str) -> None:
+    """Rewrite a file, making sure its mtime changes."""
+    mtime = path.stat().st_mtime_ns
+    path.write_text(text)
+    os.utime(path, ns=(mtime + 1_000_000, mtime + 1_000_000))
+
+
+def test_fresh_until_dependency_tables_change(tmp_path: Path) -> None:
+    """Test formatting changes keep the lock fresh, dependency changes do not."""
+    make_monorepo(tmp_path)
+    state = LockState(tmp_path)
+    assert not state.is_fresh()
+
+    state.record()
+    assert state.is_fresh()
+
+    # The root depends on core only transitively, through api
+    core = tmp_path / "packages" / "core" / "pyproject.toml"
+    text = core.read_text()
+    touch(core, "# a comment\n" + text.replace('version = "0.1.0"', 'version = "0.2.0"'))
+    assert state.is_fresh()
+
+    touch(core, text.replace('pytest = "^8.0"', 'pytest = "^8.1"'))
+    assert not state.is_fresh()
+
+    state.record()
+    touch(tmp_path / "poetry.lock", "# locked again\n")
+    assert not state.is_fresh()
+
+
+def test_parses_only_changed_projects(tmp_path: Path) -> None:
+    """Test checking an unchanged monorepo does not parse any pyproject.toml."""
+    make_monorepo(tmp_path)
+    LockState(tmp_path).record()
+
+    with patch("poetflow.core.lockstate._read_inputs") as read_inputs:
+        assert LockState(tmp_path).is_fresh()
+    read_inputs.assert_not_called()
+
+
+def test_projects_outside_the_fingerprint_are_not_covered(tmp_path: Path) -> None:
+    """Test the state is only fresh for projects the root lock file resolves."""
+    make_monorepo(tmp_path)
+    outside = write_package(tmp_path / "tools", "linter") / "pyproject.toml"
+    state = LockState(tmp_path)
+    state.record()
+
+    assert state.is_fresh(covering=[tmp_path / "packages" / "core" / "pyproject.toml"])
+    assert not state.is_fresh(covering=[outside])
+
+
+def test_lock_command_skips_resolution_only_without_update(
+    tmp_path: Path, mock_event_gen: EventGenerator[LockCommand], mock_root_poetry: MagicMock
+) -> None:
+    """Test a no-op `lock --no-update` keeps the lock, while a plain lock still upgrades."""
+    make_monorepo(tmp_path)
+    mock_root_poetry.config = MagicMock()
+    mock_root_poetry.config.installer_max_workers = 4
+    plugin = LockModifier(MonorangerConfig(enabled=True, monorepo_root=Path("../..")))
+
+    def run_lock(*options: str) -> MagicMock:
+        event = mock_event_gen(LockCommand, True)
+        command = cast(MagicMock, event.command)
+        command.poetry.pyproject_path = tmp_path / "packages" / "api" / "pyproject.toml"
+        command.poetry.disable_cache = False
+        command.io.input.has_option.side_effect = lambda name: name in options
+        command.option.side_effect = lambda name: name in options
+        with patch.object(Factory, "create_poetry", return_value=mock_root_poetry):
+            plugin.execute(cast(ConsoleCommandEvent, event))
+            terminate = MagicMock(command=command, exit_code=0)
+            plugin.post_execute(cast(ConsoleTerminateEvent, terminate))
+        return command
+
+    run_lock().set_poetry.assert_called_once_with(mock_root_poetry)
+    assert LockState(tmp_path).is_fresh()
+
+    # A plain lock asks for the newest allowed versions, so it resolves again
+    run_lock().set_poetry.assert_called_once_with(mock_root_poetry)
+
+    command = run_lock("no-update")
+    command.set_poetry.assert_not_called()
+    (installer,), _ = command.set_installer.call_args
+    assert isinstance(installer, DummyInstaller)
@@ -0,0 +1,81 @@
+"""Tests for plugin profiling."""
+
+import json
+from pathlib import Path
+from unittest.mock import MagicMock, patch
+
+import pytest
+from poetry.factory import Factory
+
+from poetflow.plugins.lock import LockModifier
+from poetflow.plugins.profiling import PROFILE_ENV, Profiler, instrument, profile_output
+from poetflow.types.config import MonorangerConfig
+
+
+def make_config(profile: str = "") -> MonorangerConfig:
+    """Create a plugin configuration."""
+    return MonorangerConfig(enabled=True, monorepo_root=Path("../"), profile=profile)
+
+
+def test_profile_output(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Test the environment variable takes precedence over the config key."""
+    monkeypatch.delenv(PROFILE_ENV, raising=False)
+    assert profile_output(make_config()) is None
+    assert profile_output(make_config("table")) == "table"
+
+    monkeypatch.setenv(PROFILE_ENV, "0")
+    assert profile_output(make_config("table")) is None
+    monkeypatch.setenv(PROFILE_ENV, "trace.json")
+    assert profile_output(make_config()) == "trace.json"
+
+
+def test_disabled_profiling_leaves_plugins_untouched(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Test plugins keep their own methods when profiling is off."""
+    monkeypatch.delenv(PROFILE_ENV, raising=False)
+    plugin = LockModifier(make_config())
+
+    assert "execute" not in vars(plugin)
+
+
+def test_records_phases(tmp_path: Path) -> None:
+    """Test phases record create_poetry calls, nest, and export a Chrome trace."""
+    trace = tmp_path / "trace.json"
+
+    with patch.object(Factory, "create_poetry", return_value=MagicMock()):
+        profiler = Profiler(str(trace))
+        try:
+            with profiler.phase("outer"):
+                with profiler.phase("inner"):
+                    Factory().create_poetry()
+                    data = bytearray(4 * 2**20)
+                del data
+                Factory().create_poetry()
+        finally:
+            profiler.close()
+        assert isinstance(Factory.create_poetry, MagicMock)
+
+    inner, outer = profiler.spans
+    assert (inner.name, inner.create_poetry_calls) == ("inner", 1)
+    assert (outer.name, outer.create_poetry_calls) == ("outer", 2)
+    assert outer.peak_memory >= inner.peak_memory >= 4 * 2**20
+    assert outer.duration >= inner.duration
+
+    profiler.report()
+    events = json.loads(trace.read_text())["traceEvents"]
+    assert [event["name"] for event in events] == ["inner", "outer"]
+    assert "inner" in profiler.summary()
+
+
+def test_instrument_wraps_plugin_methods(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Test enabled profiling records plugin execute calls."""
+    monkeypatch.setenv(PROFILE_ENV, "table")
+    profiler = Profiler("table")
+    plugin = MagicMock(spec=["execute"])
+    try:
+        with patch("poetflow.plugins.profiling.get_profiler", return_value=profiler):
+            instrument(plugin, make_config())
+        plugin.execute("event")
+    finally:
+        profiler.close()
+
+    assert [span.name for span in profiler.spans] == ["MagicMock.execute"]
@@ -0,0 +1,41 @@
+"""Tests for the shared root Poetry instance."""
+
+from pathlib import Path
+from unittest.mock import MagicMock, patch
+
+from poetry.factory import Factory
+
+from poetflow.plugins.root_poetry import clear_root_poetry_cache, get_root_poetry
+
+
+def test_loads_root_poetry_once(tmp_path: Path) -> None:
+    """Test the root project is loaded once until its pyproject.toml changes."""
+    clear_root_poetry_cache()
+    pyproject = tmp_path / "pyproject.toml"
+    pyproject.write_text('[tool.poetry]\nname = "root"\n')
+
+    with patch.object(Factory, "create_poetry", side_effect=lambda **_: MagicMock()) as create:
+        first = get_root_poetry(tmp_path / "packages" / "..")
+        assert get_root_poetry(tmp_path) is first
+        assert create.call_count == 1
+
+        pyproject.write_text('[tool.poetry]\nname = "root"\nversion = "1.0.0"\n')
+        assert get_root_poetry(tmp_path) is not first
+        assert create.call_count == 2
+
+        # The instance depends on whether the repository cache is disabled
+        get_root_poetry(tmp_path, disable_cache=True)
+        assert create.call_count == 3
+
+    clear_root_poetry_cache()
+
+
+def test_does_not_memoize_missing_projects(tmp_path: Path) -> None:
+    """Test a root without pyproject.toml is handed to Poetry every time."""
+    clear_root_poetry_cache()
+
+    with patch.object(Factory, "create_poetry", side_effect=lambda **_: MagicMock()) as create:
+        get_root_poetry(tmp_path)
+        get_root_poetry(tmp_path)
+
+    assert create.call_count == 2
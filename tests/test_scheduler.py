@@ -0,0 +1,89 @@
+"""Tests for DAGScheduler."""
+
+import asyncio
+from dataclasses import dataclass
+from typing import AbstractSet, Dict, List, Optional, Set
+
+import pytest
+
+from poetflow.core.exceptions import MonoRepoError
+from poetflow.utils.scheduler import DAGScheduler, ScheduleReport
+
+GRAPH: Dict[str, Set[str]] = {
+    "core": set(),
+    "utils": set(),
+    "api": {"core"},
+    "worker": {"core", "utils"},
+    "app": {"api", "worker"},
+}
+
+
+@dataclass
+class Result:
+    """Fake task result."""
+
+    success: bool
+
+
+def run(
+    scheduler: DAGScheduler[Result],
+    packages: List[str],
+    failing: AbstractSet[str] = frozenset(),
+    events: Optional[List[str]] = None,
+) -> ScheduleReport[Result]:
+    """Run fake tasks that record their start and end."""
+    log = events if events is not None else []
+    active: List[str] = []
+    peak: List[int] = [0]
+
+    async def task(pkg: str) -> Result:
+        active.append(pkg)
+        peak[0] = max(peak[0], len(active))
+        log.append(f"start:{pkg}")
+        await asyncio.sleep(0.01)
+        log.append(f"end:{pkg}")
+        active.remove(pkg)
+        return Result(success=pkg not in failing)
+
+    report = asyncio.run(scheduler.run(packages, task))
+    assert peak[0] <= scheduler.max_workers
+    return report
+
+
+def test_runs_packages_after_their_dependencies() -> None:
+    """Test no package starts before its dependencies have finished."""
+    events: List[str] = []
+    report = run(DAGScheduler(GRAPH, max_workers=2), list(GRAPH), events=events)
+
+    assert report.success
+    for pkg, deps in GRAPH.items():
+        for dep in deps:
+            assert events.index(f"end:{dep}") < events.index(f"start:{pkg}")
+    assert report.critical_path[-1] == "app"
+    assert report.critical_path_duration > 0
+
+
+def test_fail_fast_stops_scheduling() -> None:
+    """Test a failure with fail_fast skips every package not started yet."""
+    report = run(DAGScheduler(GRAPH, max_workers=1), list(GRAPH), failing={"core"})
+
+    assert not report.success
+    assert list(report.results) == ["core"]
+    assert set(report.skipped) == {"utils", "api", "worker", "app"}
+
+
+def test_continue_on_error_skips_only_dependents() -> None:
+    """Test a failure without fail_fast only skips packages depending on it."""
+    scheduler: DAGScheduler[Result] = DAGScheduler(GRAPH, max_workers=4, fail_fast=False)
+    report = run(scheduler, list(GRAPH), failing={"api"})
+
+    assert set(report.results) == {"core", "utils", "api", "worker"}
+    assert report.skipped == ["app"]
+
+
+def test_rejects_dependency_cycles() -> None:
+    """Test cycles between the selected packages are reported."""
+    scheduler: DAGScheduler[Result] = DAGScheduler({"a": {"b"}, "b": {"a"}, "c": set()})
+
+    with pytest.raises(MonoRepoError, match="a, b"):
+        run(scheduler, ["a", "b", "c"])
@@ -0,0 +1,85 @@
+"""Tests for TestExecutor."""
+
+import asyncio
+import sys
+from pathlib import Path
+
+from poetflow.commands.test import TestExecutor
+from poetflow.core.config import Config
+from poetflow.core.fingerprint import PackageFingerprinter
+from poetflow.core.monorepo import MonoRepo
+from tests.test_discovery import write_package
+
+
+def make_executor(tmp_path: Path, max_workers: int = 2, xdist: bool = False) -> TestExecutor:
+    """Create a test executor over a monorepo with three packages."""
+    for name in ("core", "api", "cli"):
+        write_package(tmp_path / "packages", name)
+    return TestExecutor(MonoRepo(Config(root_dir=tmp_path)), max_workers=max_workers, xdist=xdist)
+
+
+def test_plan_starts_longest_packages_first(tmp_path: Path) -> None:
+    """Test packages are ordered by recorded duration, unknown ones by the average."""
+    executor = make_executor(tmp_path)
+
+    plan = executor.plan(["core", "api", "cli"], {"core": 1.0, "api": 9.0})
+
+    assert plan == [("api", 1), ("cli", 1), ("core", 1)]
+
+
+def test_plan_shards_slow_packages_with_xdist(tmp_path: Path) -> None:
+    """Test packages above an even share of the total time get several xdist workers."""
+    executor = make_executor(tmp_path, max_workers=4, xdist=True)
+
+    plan = executor.plan(["core", "api", "cli"], {"core": 1.0, "api": 10.0, "cli": 1.0})
+
+    assert plan == [("api", 4), ("cli", 1), ("core", 1)]
+
+
+def test_records_durations(tmp_path: Path) -> None:
+    """Test successful runs record their duration and pytest's 'no tests' exit is a pass."""
+    executor = make_executor(tmp_path)
+    script = "import os, sys; sys.exit(5 if os.path.basename(os.getcwd()) == 'cli' else 0)"
+
+    results = asyncio.run(executor.run_command([sys.executable, "-c", script], ["core", "cli"]))
+
+    assert {result.package for result in results} == {"core", "cli"}
+    assert all(result.success for result in results)
+    assert set(executor.load_durations()) == {"core", "cli"}
+
+
+def test_failed_packages_are_reported(tmp_path: Path) -> None:
+    """Test failing test runs produce failed results without recording durations."""
+    executor = make_executor(tmp_path)
+
+    results = asyncio.run(
+        executor.run_command([sys.executable, "-c", "raise SystemExit(1)"], ["core"])
+    )
+
+    assert not results[0].success
+    assert executor.load_durations() == {}
+
+
+def test_skips_packages_with_cached_results(tmp_path: Path) -> None:
+    """Test unchanged packages reuse their cached passing result."""
+    core = write_package(tmp_path / "packages", "core")
+    write_package(tmp_path / "packages", "api", deps=("core",))
+    write_package(tmp_path / "packages", "docs")
+    cmd = [sys.executable, "-c", "print('ran')"]
+
+    def run() -> dict[str, bool]:
+        monorepo = MonoRepo(Config(root_dir=tmp_path))
+        executor = TestExecutor(
+            monorepo,
+            cache=monorepo.cache,
+            fingerprinter=PackageFingerprinter(monorepo, monorepo.dependency_manager),
+        )
+        results = asyncio.run(executor.run_command(cmd, ["core", "api", "docs"]))
+        assert all(result.success for result in results)
+        return {result.package: result.cached for result in results}
+
+    assert run() == {"core": False, "api": False, "docs": False}
+    assert run() == {"core": True, "api": True, "docs": True}
+
+    (core / "module.py").write_text("VALUE = 1\n")
+    assert run() == {"core": False, "api": False, "docs": True}
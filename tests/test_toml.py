@@ -0,0 +1,58 @@
+"""Tests for the fast TOML reader."""
+
+import os
+from pathlib import Path
+
+import pytest
+
+from poetflow.utils import toml
+
+DOCUMENT = """
+[tool.poetry]
+name = "core"  # comment
+
+[tool.poetry.dependencies]
+requests = {version = "^2.31", extras = ["socks"]}
+"""
+
+
+def test_load_returns_plain_values(tmp_path: Path) -> None:
+    """Test parsed documents hold plain dicts, lists and strings."""
+    path = tmp_path / "pyproject.toml"
+    path.write_text(DOCUMENT)
+
+    data = toml.load(path)
+
+    assert data == {
+        "tool": {
+            "poetry": {
+                "name": "core",
+                "dependencies": {"requests": {"version": "^2.31", "extras": ["socks"]}},
+            }
+        }
+    }
+    assert type(data["tool"]["poetry"]["name"]) is str
+
+
+def test_load_is_cached_until_the_file_changes(tmp_path: Path) -> None:
+    """Test unchanged files are parsed once, and edits are picked up."""
+    toml.clear_cache()
+    path = tmp_path / "pyproject.toml"
+    path.write_text(DOCUMENT)
+
+    assert toml.load(path) is toml.load(path)
+
+    mtime = path.stat().st_mtime_ns
+    path.write_text(DOCUMENT.replace("core", "api"))
+    os.utime(path, ns=(mtime + 1_000_000, mtime + 1_000_000))
+    assert toml.load(path)["tool"]["poetry"]["name"] == "api"
+
+
+def test_falls_back_to_tomlkit(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Test documents parse the same without a standard library parser, e.g. on Python 3.10."""
+    expected = toml.loads(DOCUMENT)
+    monkeypatch.setattr(toml, "tomllib", None)
+
+    assert toml.loads(DOCUMENT) == expected
+    with pytest.raises(ValueError):
+        toml.loads("name = ")
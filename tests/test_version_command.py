@@ -0,0 +1,96 @@
+"""Tests for SemanticVersionManager git log parsing."""
+
+import os
+from pathlib import Path
+
+import pytest
+
+from poetflow.commands.version import SemanticVersionManager
+from poetflow.core.exceptions import MonoRepoError
+from poetflow.types.versioning import CommitInfo
+from tests.test_changes import git
+
+
+def commit(root: Path, path: str, message: str) -> None:
+    """Commit a change to a file."""
+    file = root / path
+    file.parent.mkdir(parents=True, exist_ok=True)
+    file.write_text(f"{file.read_text() if file.exists() else ''}{message}\n")
+    git(root, "add", ".")
+    git(root, "commit", "-q", "-m", message)
+
+
+@pytest.fixture
+def repo(tmp_path: Path) -> Path:
+    """Create a repository with a tagged release followed by conventional commits."""
+    git(tmp_path, "init", "-q", "-b", "main")
+    commit(tmp_path, "packages/core/a.py", "feat(core): before the release")
+    git(tmp_path, "tag", "v0.1.0")
+    commit(tmp_path, "packages/core/a.py", "fix(core): handle empty input")
+    commit(tmp_path, "README.md", "update readme")
+    commit(tmp_path, "packages/api/b.py", "feat(api)!: drop the v1 endpoints")
+    (tmp_path / "packages/core/c.py").write_text("")
+    (tmp_path / "packages/api/c.py").write_text("")
+    git(tmp_path, "add", ".")
+    git(tmp_path, "commit", "-q", "-m", "refactor: share helpers\n\nBREAKING CHANGE: renamed")
+    return tmp_path
+
+
+def test_parse_commits_stops_at_tag(repo: Path) -> None:
+    """Test only conventional commits after the tag are returned, newest first."""
+    commits = SemanticVersionManager(repo).parse_commits("v0.1.0")
+
+    assert [(c.type, c.scope, c.message, c.breaking) for c in commits] == [
+        ("refactor", None, "share helpers", True),
+        ("feat", "api", "drop the v1 endpoints", True),
+        ("fix", "core", "handle empty input", False),
+    ]
+    assert len(SemanticVersionManager(repo).parse_commits()) == 4
+
+
+def test_parse_commits_by_package(repo: Path) -> None:
+    """Test commits are attributed to every package whose files they touched."""
+    manager = SemanticVersionManager(repo)
+
+    commits = manager.parse_commits_by_package(
+        {"core": repo / "packages/core", "api": repo / "packages/api", "docs": repo / "docs"},
+        since_tag="v0.1.0",
+    )
+
+    assert [c.message for c in commits["core"]] == ["share helpers", "handle empty input"]
+    assert [c.message for c in commits["api"]] == ["share helpers", "drop the v1 endpoints"]
+    assert commits["docs"] == []
+
+
+def test_parse_commits_unknown_tag(repo: Path) -> None:
+    """Test a missing tag is reported as an error."""
+    with pytest.raises(MonoRepoError):
+        SemanticVersionManager(repo).parse_commits("v9.9.9")
+
+
+def test_parse_commits_uses_the_shared_parser(repo: Path) -> None:
+    """Test history is parsed like any other commit message, footers and reverts included."""
+    git(repo, "revert", "--no-edit", "HEAD~1")
+
+    commits = SemanticVersionManager(repo).parse_commits("v0.1.0")
+
+    assert all(isinstance(c, CommitInfo) for c in commits)
+    assert (commits[0].type, commits[0].reverts) == ("revert", "feat(api)!: drop the v1 endpoints")
+    assert commits[1].footers == (("BREAKING CHANGE", "renamed"),)
+
+
+def test_parse_commits_with_verbose_git(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    """Test git writing more to stderr than a pipe holds does not block reading the log."""
+    fake_git = tmp_path / "bin" / "git"
+    fake_git.parent.mkdir()
+    fake_git.write_text(
+        "#!/bin/sh\n"
+        "head -c 1048576 /dev/zero >&2\n"
+        "printf '\\036abc\\000feat: add x\\n\\000a.py\\n'\n"
+    )
+    fake_git.chmod(0o755)
+    monkeypatch.setenv("PATH", f"{fake_git.parent}{os.pathsep}{os.environ['PATH']}")
+
+    commits = SemanticVersionManager(tmp_path).parse_commits()
+
+    assert [c.message for c in commits] == ["add x"]
@@ -0,0 +1,107 @@
+"""Tests for VersionManager."""
+
+from pathlib import Path
+
+import pytest
+
+from poetflow.core.config import Config
+from poetflow.core.exceptions import PackageError
+from poetflow.core.monorepo import MonoRepo
+from poetflow.types.versioning import CommitInfo
+from tests.test_discovery import write_package
+
+
+def make_monorepo(tmp_path: Path) -> MonoRepo:
+    """Create a monorepo whose packages refer to each other in several ways."""
+    packages_dir = tmp_path / "packages"
+    write_package(packages_dir, "core")
+    write_package(packages_dir, "utils")
+    api = packages_dir / "api"
+    api.mkdir()
+    (api / "pyproject.toml").write_text(
+        "[tool.poetry]\n"
+        'name = "api"\n'
+        'version = "1.0.0"\n\n'
+        "[tool.poetry.dependencies]\n"
+        'python = "^3.10"\n'
+        'core = "^0.1.0"  # keep me\n'
+        'utils = {version = ">=0.1.0", optional = true}\n\n'
+        "[tool.poetry.group.dev.dependencies]\n"
+        'core-testing = {path = "../core-testing", develop = true}\n'
+        'requests = ">=2,<3"\n'
+    )
+    return MonoRepo(Config(root_dir=tmp_path))
+
+
+def test_update_versions_rewrites_versions_and_constraints(tmp_path: Path) -> None:
+    """Test a batch bump updates versions and the constraints pointing at them."""
+    monorepo = make_monorepo(tmp_path)
+
+    written = monorepo.version_manager.update_versions({"core": "0.2.0", "utils": "1.0.0"})
+
+    packages_dir = tmp_path / "packages"
+    assert sorted(written) == sorted(
+        packages_dir / name / "pyproject.toml" for name in ("api", "core", "utils")
+    )
+    assert 'version = "0.2.0"' in (packages_dir / "core" / "pyproject.toml").read_text()
+    api = (packages_dir / "api" / "pyproject.toml").read_text()
+    assert 'version = "1.0.0"' in api
+    assert 'core = "^0.2.0"  # keep me' in api
+    assert 'utils = {version = ">=1.0.0", optional = true}' in api
+    assert 'core-testing = {path = "../core-testing", develop = true}' in api
+    assert 'requests = ">=2,<3"' in api
+    assert monorepo.get_package_info("core")["version"] == "0.2.0"  # type: ignore[index]
+
+
+def test_update_version_only_touches_affected_files(tmp_path: Path) -> None:
+    """Test bumping a package without dependents writes only its own pyproject."""
+    monorepo = make_monorepo(tmp_path)
+
+    assert monorepo.version_manager.update_versions({"api": "2.0.0"}) == [
+        tmp_path / "packages" / "api" / "pyproject.toml"
+    ]
+    with pytest.raises(PackageError):
+        monorepo.version_manager.update_version("missing", "1.0.0")
+
+
+def test_update_version_leaves_constraints_alone(tmp_path: Path) -> None:
+    """Test the single package update writes only that package, and refreshes its info."""
+    monorepo = make_monorepo(tmp_path)
+    api = (tmp_path / "packages" / "api" / "pyproject.toml").read_text()
+
+    monorepo.version_manager.update_version("core", "0.2.0")
+
+    assert 'version = "0.2.0"' in (tmp_path / "packages" / "core" / "pyproject.toml").read_text()
+    assert (tmp_path / "packages" / "api" / "pyproject.toml").read_text() == api
+    assert monorepo.get_package_info("core")["version"] == "0.2.0"  # type: ignore[index]
+    assert monorepo.version_manager.get_next_versions(
+        {"core": [CommitInfo.parse("fix: patch it")]}
+    ) == {"core": "0.2.1"}
+
+
+def test_get_next_versions_skips_unchanged_packages(tmp_path: Path) -> None:
+    """Test only packages with relevant commits get a new version."""
+    monorepo = make_monorepo(tmp_path)
+
+    bumps = monorepo.version_manager.get_next_versions(
+        {
+            "core": [CommitInfo.parse("feat: add thing")],
+            "utils": [CommitInfo.parse("docs: explain thing")],
+        }
+    )
+
+    assert bumps == {"core": "0.2.0"}
+
+
+def test_update_versions_keeps_file_permissions(tmp_path: Path) -> None:
+    """Test rewritten pyproject files keep their permissions."""
+    monorepo = make_monorepo(tmp_path)
+    core = tmp_path / "packages" / "core" / "pyproject.toml"
+    api = tmp_path / "packages" / "api" / "pyproject.toml"
+    core.chmod(0o644)
+    api.chmod(0o664)
+
+    monorepo.version_manager.update_versions({"core": "0.2.0"})
+
+    assert core.stat().st_mode & 0o777 == 0o644
+    assert api.stat().st_mode & 0o777 == 0o664
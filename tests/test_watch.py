@@ -0,0 +1,182 @@
+"""Tests for the watch service."""
+
+import threading
+import time
+from pathlib import Path
+from typing import Callable, Iterator
+
+import pytest
+from cleo.io.inputs.string_input import StringInput
+from cleo.io.outputs.buffered_output import BufferedOutput
+
+from poetflow.application import Application
+from poetflow.core.config import Config
+from poetflow.core.exceptions import MonoRepoError
+from poetflow.core.monorepo import MonoRepo
+from poetflow.core.watch import (
+    InotifyWatcher,
+    PollingWatcher,
+    WatchClient,
+    WatchedMonoRepo,
+    WatchService,
+    running_service,
+)
+from tests.test_discovery import write_package
+
+
+def wait_until(condition: Callable[[], bool], timeout: float = 5.0) -> bool:
+    """Poll a condition until it holds or the timeout expires."""
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if condition():
+            return True
+        time.sleep(0.02)
+    return False
+
+
+@pytest.fixture
+def service(tmp_path: Path) -> Iterator[WatchService]:
+    """Run a polling watch service over a two-package monorepo."""
+    packages_dir = tmp_path / "packages"
+    write_package(packages_dir, "core")
+    write_package(packages_dir, "api", deps=("core",))
+    monorepo = MonoRepo(Config(root_dir=tmp_path))
+    service = WatchService(
+        monorepo, watcher=PollingWatcher(tmp_path, packages_dir), poll_interval=0.02
+    )
+    thread = threading.Thread(target=service.serve_forever, daemon=True)
+    thread.start()
+    assert wait_until(lambda: running_service(service.socket_path) is not None)
+    yield service
+    service.shutdown()
+    thread.join(5)
+    assert not thread.is_alive()
+
+
+def test_polling_watcher_detects_package_changes(tmp_path: Path) -> None:
+    """Test the polling watcher reports new, changed and removed package files only."""
+    packages_dir = tmp_path / "packages"
+    core = write_package(packages_dir, "core")
+    watcher = PollingWatcher(tmp_path, packages_dir)
+
+    assert not watcher.wait(0)
+    (core / "README.md").write_text("ignored")
+    assert not watcher.wait(0)
+
+    write_package(packages_dir, "api")
+    assert watcher.wait(0)
+    (core / "pyproject.toml").unlink()
+    assert watcher.wait(0)
+    assert not watcher.wait(0)
+
+
+def test_inotify_watcher_follows_new_directories(tmp_path: Path) -> None:
+    """Test inotify reports changes in directories created after the watch started."""
+    packages_dir = tmp_path / "packages"
+    packages_dir.mkdir()
+    try:
+        watcher = InotifyWatcher(tmp_path, packages_dir)
+    except OSError:
+        pytest.skip("inotify is not available")
+    try:
+        (tmp_path / "notes.txt").write_text("ignored")
+        assert not watcher.wait(0.05)
+
+        pkg_dir = packages_dir / "core"
+        pkg_dir.mkdir()
+        assert watcher.wait(1)
+        (pkg_dir / "pyproject.toml").write_text("")
+        assert watcher.wait(1)
+    finally:
+        watcher.close()
+
+
+def test_service_answers_queries(service: WatchService) -> None:
+    """Test the service answers queries from the model it keeps in memory."""
+    client = WatchClient(service.socket_path)
+
+    assert client.request("ping") == "pong"
+    assert client.request("build-order") == ["core", "api"]
+    assert client.request("dependents", package="core") == ["api"]
+    assert [package["name"] for package in client.request("packages")] == ["api", "core"]
+    with pytest.raises(MonoRepoError, match="Unknown watch command"):
+        client.request("explode")
+
+
+def test_service_refreshes_on_changes(service: WatchService, tmp_path: Path) -> None:
+    """Test new packages are visible to queries once the watcher saw them."""
+    client = WatchClient(service.socket_path)
+
+    write_package(tmp_path / "packages", "cli", deps=("api",))
+
+    assert wait_until(lambda: "cli" in client.request("build-order"))
+    assert client.request("dependents", package="core") == ["api", "cli"]
+    assert client.request("status")["generation"] >= 1
+
+
+def test_second_service_is_refused(service: WatchService, tmp_path: Path) -> None:
+    """Test a live socket is not taken over, while a stale one would be."""
+    other = WatchService(service.monorepo, watcher=PollingWatcher(tmp_path, tmp_path / "packages"))
+    other.socket_path = service.socket_path
+
+    with pytest.raises(MonoRepoError, match="already running"):
+        other.serve_forever()
+    assert running_service(service.socket_path) is not None
+
+
+def test_watched_monorepo_answers_from_the_service(service: WatchService) -> None:
+    """Test a running service answers without building the monorepo in-process."""
+    watched = WatchedMonoRepo.connect(service.monorepo.config)
+
+    assert watched.client is not None
+    assert watched.get_build_order() == ["core", "api"]
+    assert watched.get_dependencies("api") == {"core"}
+    assert sorted(watched.get_all_packages()) == ["api", "core"]
+    assert watched.get_package_path("core") == service.monorepo.get_package_path("core")
+    assert watched._local is None
+
+
+def test_watched_monorepo_falls_back_in_process(service: WatchService) -> None:
+    """Test queries are answered in-process without a service, or once it stops."""
+    config = service.monorepo.config
+    watched = WatchedMonoRepo.connect(config)
+    service.shutdown()
+    assert wait_until(lambda: not service.socket_path.exists())
+
+    assert watched.get_build_order() == ["core", "api"]
+    assert watched.client is None
+    assert watched._local is not None
+
+    offline = WatchedMonoRepo.connect(config)
+    assert offline.client is None
+    assert offline.get_dependencies("api") == {"core"}
+
+
+def test_application_commands_are_answered_by_the_service(
+    service: WatchService, tmp_path: Path
+) -> None:
+    """Test commands run through the application without building the monorepo themselves."""
+    (tmp_path / "poetry.lock").write_text(
+        '[[package]]\nname = "requests"\nversion = "2.31.0"\nfiles = []\n'
+    )
+    app = Application(service.monorepo.config)
+    app.auto_exits(False)
+
+    def run(command: str) -> str:
+        output = BufferedOutput()
+        code = app.run(StringInput(f"{command} --no-plugins"), output, output)
+        assert code == 0, output.fetch()
+        return output.fetch()
+
+    assert run("monorepo-discover").splitlines() == [
+        f"api 0.1.0 {tmp_path / 'packages' / 'api'}",
+        f"core 0.1.0 {tmp_path / 'packages' / 'core'}",
+    ]
+    run(f"monorepo-export --all --output {tmp_path / 'requirements'}")
+
+    assert app.monorepo.client is not None
+    assert app.monorepo._local is None
+    assert sorted(path.name for path in (tmp_path / "requirements").iterdir()) == [
+        "api.requirements.txt",
+        "core.requirements.txt",
+    ]